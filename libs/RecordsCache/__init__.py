@@ -6,6 +6,14 @@ import os
 import time
 
 class RecordsCache:
+    """
+    Expiring, optionally persisted cache of DNS record lookups.
+
+    Record entries are keyed by `(fqdn, record type)` (see `RecordsCache.key`), so the A and
+    AAAA records of a dual-stack name keep their own record IDs. Secondary indexes by `zone_id`
+    and `domain_type` are maintained on every write, so `select` and `invalidate` touch only the
+    affected entries instead of scanning the cache.
+    """
     def __init__(self) -> None:
         """
         Initializes a RecordsCache instance with a specified cache directory.
@@ -23,7 +31,7 @@ class RecordsCache:
         ```
         """
         
-    def build(self, cache_name: str = 'records', pre_data: Optional[Any] = None, timeout: int = 86400, cache_directory: str = '.cache') -> Self:
+    def build(self, cache_name: str = 'records', pre_data: Optional[Any] = None, timeout: int = 86400, cache_directory: str = '.cache', negative_timeout: int = 3600) -> Self:
         """
         Builds a new cache instance with optional preloaded data and a timeout.
 
@@ -35,6 +43,8 @@ class RecordsCache:
             pre_data (dict, optional): A dictionary of preloaded data to populate the cache. Defaults to None.
             timeout (int, optional): The timeout duration for cache entries in seconds. Defaults to 86400 (1 day).
             cache_directory (str, optional): The directory to store the cache data. Defaults to 'cache'.
+            negative_timeout (int, optional): The timeout for negative entries (known-missing keys) in seconds,
+                -1 for no expiry and 0 to store none. Defaults to 3600 (1 hour).
         Returns:
             Self: The current instance of the `RecordsCache` with the cache built.
 
@@ -50,12 +60,115 @@ class RecordsCache:
         self.cache_record_path = os.path.join(cache_directory, f'{cache_name}.cache')
         
         self.timeout: int | float = timeout if timeout > 0 else math.inf
+        # -1 keeps negative entries until the cache is cleared, 0 disables negative caching
+        self.negative_timeout: int | float = math.inf if negative_timeout < 0 else negative_timeout
         current_time = time.time()
         if pre_data:
             pre_data["expiry_time"] = math.inf if math.isinf(self.timeout) else current_time + self.timeout
         
         self.cache_data = pre_data if pre_data else {}
         return self
+
+    @staticmethod
+    def key(fqdn: str, domain_type: str) -> str:
+        """
+        Composite key of the entry for the `domain_type` record of `fqdn`.
+
+        Example Usage:
+        --------------
+        ```
+        RecordsCache.key("WWW.example.com", "AAAA")
+        # => "AAAA:www.example.com"
+        ```
+        """
+        return f"{domain_type}:{fqdn.lower()}"
+
+    @property
+    def cache_data(self) -> dict:
+        """The entries by key. Assigning it replaces every entry and rebuilds the indexes."""
+        return self._cache_data
+
+    @cache_data.setter
+    def cache_data(self, data: dict) -> None:
+        self._cache_data: dict = {}
+        self.by_zone: dict[str, set[str]] = {}
+        self.by_type: dict[str, set[str]] = {}
+        for k, v in (data or {}).items():
+            # Entries written before composite keys were keyed by the bare FQDN
+            if isinstance(v, dict) and ':' not in k and v.get("domain_type"):
+                k = self.key(k, v["domain_type"])
+            self.__put__(k, v)
+
+    def __link__(self, key: str, value: Any) -> None:
+        if not isinstance(value, dict):
+            return
+        if value.get("zone_id"):
+            self.by_zone.setdefault(value["zone_id"], set()).add(key)
+        if value.get("domain_type"):
+            self.by_type.setdefault(value["domain_type"], set()).add(key)
+
+    def __unlink__(self, key: str) -> None:
+        value = self._cache_data.get(key)
+        if not isinstance(value, dict):
+            return
+        for index, field in ((self.by_zone, "zone_id"), (self.by_type, "domain_type")):
+            keys = index.get(value.get(field))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[value[field]]
+
+    def __put__(self, key: str, value: Any) -> None:
+        self.__unlink__(key)
+        self._cache_data[key] = value
+        self.__link__(key, value)
+
+    def __drop__(self, key: str) -> None:
+        self.__unlink__(key)
+        self._cache_data.pop(key, None)
+
+    def select(self, zone_id: Optional[str] = None, domain_type: Optional[str] = None) -> set[str]:
+        """
+        Keys of the entries in `zone_id` and/or of `domain_type`, read from the secondary indexes.
+
+        Args:
+            zone_id (str, optional): Only entries of this zone.
+            domain_type (str, optional): Only entries of this record type.
+
+        Returns:
+            set[str]: The matching keys; every key when neither filter is given.
+
+        Example Usage:
+        --------------
+        ```
+        cache.select(zone_id="023e105f4ecef8ad9ca31a8372d0c353", domain_type="AAAA")
+        # => {"AAAA:www.example.com", "AAAA:example.com"}
+        ```
+        """
+        if zone_id is None and domain_type is None:
+            return set(self._cache_data)
+        if zone_id is None:
+            return set(self.by_type.get(domain_type, ()))
+        keys = self.by_zone.get(zone_id, set())
+        return set(keys) if domain_type is None else keys & self.by_type.get(domain_type, set())
+
+    def invalidate(self, zone_id: Optional[str] = None, domain_type: Optional[str] = None) -> int:
+        """
+        Drop every entry in `zone_id` and/or of `domain_type`, in time proportional to the entries dropped.
+
+        Args:
+            zone_id (str, optional): Only entries of this zone.
+            domain_type (str, optional): Only entries of this record type.
+
+        Returns:
+            int: Number of entries dropped.
+        """
+        if zone_id is None and domain_type is None:
+            return 0
+        keys = self.select(zone_id, domain_type)
+        for k in keys:
+            self.__drop__(k)
+        return len(keys)
     
     def update(self, update_data: dict, key: Optional[str] = None) -> None:
         """
@@ -87,7 +200,7 @@ class RecordsCache:
         if not key:
             self.cache_data = update_data
         else:
-            self.cache_data[key] = update_data
+            self.__put__(key, update_data)
         
     def get(self, key: Optional[str] = None) -> dict | None:
         """
@@ -124,12 +237,12 @@ class RecordsCache:
                 raise KeyError(f"Key '{key}' does not exist in the cache.")
             
             if self.cache_data[key]["expiry_time"] <= current_time:
-                del self.cache_data[key]
+                self.__drop__(key)
             return None if key not in self.cache_data else self.cache_data[key]
         else:
             for k, v in list(self.cache_data.items()):
                 if v["expiry_time"] <= current_time:
-                    del self.cache_data[k]
+                    self.__drop__(k)
             return self.cache_data
 
     def inject(self, key: str, update_data: dict) -> None:
@@ -159,9 +272,9 @@ class RecordsCache:
         
         current_time = time.time()
         if self.cache_data[key]["expiry_time"] > current_time:
-            self.cache_data[key].update(update_data)
+            self.__put__(key, {**self.cache_data[key], **update_data})
         else:
-            del self.cache_data[key]
+            self.__drop__(key)
             raise ValueError(f"Cannot inject data into an expired key '{key}'.")
 
     def append(self, key: str, append_data: dict) -> None:
@@ -199,7 +312,57 @@ class RecordsCache:
         current_time = time.time()
         append_data["expiry_time"] = math.inf if math.isinf(self.timeout) else current_time + self.timeout
 
-        self.cache_data[key] = append_data
+        self.__put__(key, append_data)
+
+    def negate(self, key: str, reason: str = "") -> None:
+        """
+        Stores a negative entry, recording that `key` is known to be missing.
+
+        Negative entries expire after `negative_timeout` (usually much shorter than `timeout`),
+        replace any existing entry under the same key, and are persisted like any other entry.
+        Nothing is stored when `negative_timeout` is 0.
+
+        Args:
+            key (str): The key known to be missing.
+            reason (str, optional): Why the key is missing, for logging. Defaults to "".
+
+        Example Usage:
+        --------------
+        ```
+        cache = RecordsCache().build(negative_timeout=600)
+        cache.negate("missing.example.com", "No DNS record found")
+        print(cache.is_negative("missing.example.com"))
+        # => True (for the next 600 seconds)
+        ```
+        """
+        if not self.negative_timeout:
+            return
+        current_time = time.time()
+        self.__put__(key, {
+            "negative": True,
+            "reason": reason,
+            "expiry_time": math.inf if math.isinf(self.negative_timeout) else current_time + self.negative_timeout
+        })
+
+    def is_negative(self, key: str) -> bool:
+        """
+        Check if `key` holds a negative entry that has not expired yet.
+
+        Return True if the key is known to be missing, False otherwise.
+
+        Example Usage:
+        --------------
+        ```
+        cache = RecordsCache().build()
+        print(cache.is_negative("missing.example.com"))
+        # => False
+        cache.negate("missing.example.com")
+        print(cache.is_negative("missing.example.com"))
+        # => True
+        ```
+        """
+        entry = self.cache_data.get(key)
+        return isinstance(entry, dict) and entry.get("negative", False) and entry["expiry_time"] > time.time()
 
     def delete(self, key: str) -> None:
         """
@@ -228,7 +391,7 @@ class RecordsCache:
         if key not in self.cache_data:
             raise KeyError(f"Key '{key}' does not exist in the cache.")
         
-        del self.cache_data[key]
+        self.__drop__(key)
 
         
     def commit(self) -> None:
@@ -252,8 +415,10 @@ class RecordsCache:
         if not self.cache_data:
             raise AttributeError("Cache data is empty or not initialized. Nothing to commit.")
 
-        with open(self.cache_record_path, "w") as f:
+        # Written aside and renamed into place, so a reader never sees a half-written file
+        with open(f"{self.cache_record_path}.tmp", "w") as f:
             json.dump(self.cache_data, f, indent=4)
+        os.replace(f"{self.cache_record_path}.tmp", self.cache_record_path)
 
     def pull(self) -> None:
         """
@@ -472,4 +637,4 @@ class RecordsCache:
         keys_to_delete = [k for k, v in self.cache_data.items() if isinstance(v, dict) and "expiry_time" in v and v["expiry_time"] <= current_time]
         
         for k in keys_to_delete:
-            del self.cache_data[k]
\ No newline at end of file
+            self.__drop__(k)
\ No newline at end of file
@@ -1,40 +1,40 @@
-import json
-import os
 import requests
-from datetime import datetime
 from typing import Any, Union, Optional
+from libs import deadline
+from libs.ringstore import RingStore
+
+# Longest single lookup, in seconds; a hung connection must not stall the sync loop.
+TIMEOUT = 10
 
 # This module provides a simple interface to fetch public IP address and other network information from ifconfig.me ----- ifconfig.me
 class ifconfig:
-    def __init__(self, path: str = 'all.json') -> None:
+    def __init__(self, path: str = 'all.json', session: Optional[requests.Session] = None, dumps: Optional[RingStore] = None) -> None:
         self.api_uri = f'https://ifconfig.me/{path}'
-        self.dumps = ".dumps/"
+        self.http = session or requests
+        self.dumps = dumps
     def get(self, format: Optional[str] = None) -> Union[dict, str]:
         """Fetch data from ifconfig.me"""
         if self.api_uri.endswith('.json') and format is None: format = 'json'
         else: format = 'text'
 
         __address__ = f"{self.api_uri}?format={format}" if format else self.api_uri
-        res = requests.get(__address__)
+        res = self.http.get(__address__, timeout=deadline.timeout(TIMEOUT))
         res.raise_for_status()
         if not res.ok:
             raise ConnectionError(f"Response error: {res.status_code} - {res.reason}")
         
-        # --- Save Response to response.json (Beautified) ---
+        # --- Keep the JSON response in the bounded dump store (written in the background) ---
         ifinfo = res.json() if format in ('json', 'jsonp') else res.text
-        if format in ('json', 'jsonp'):
-            os.makedirs(self.dumps, exist_ok=True)  # Ensure directory exists
-            with open(f"{self.dumps}ifconfig@{datetime.now().strftime('%d-%m-%Y:%H-%M-%S')}.jsonc", "w") as f:
-                json.dump(ifinfo, f, indent=4)
-
-            print("✅ Dumped response to 'ifconfig.jsonc'")
+        if format in ('json', 'jsonp') and self.dumps is not None:
+            self.dumps.append(ifinfo)
 
         return ifinfo
 
 # This module provides a simple interface to fetch public IP address from ipify.org ----- ipify.org
 class ipify:
-    def __init__(self, internet_protocol_verison: int = 4):
+    def __init__(self, internet_protocol_verison: int = 4, session: Optional[requests.Session] = None):
         self.api_uri = f'https://api{internet_protocol_verison}.ipify.org'
+        self.http = session or requests
           
     def get_address(self, format: str = 'json', callback: Optional[str] = None) -> Union[dict, str, Any, requests.Response]:
         __address__ = (
@@ -43,7 +43,7 @@ class ipify:
             f"{'&callback=' + callback if callback else ''}"
         )
 
-        res = requests.get(__address__)
+        res = self.http.get(__address__, timeout=deadline.timeout(TIMEOUT))
         res.raise_for_status()
         if not res.ok:
             raise ConnectionError(f"Response error: {res.status_code} - {res.reason}")
@@ -58,7 +58,7 @@ class ipify:
             f"{'&callback=' + callback if callback else ''}"
         )
 
-        res = requests.get(__address__)
+        res = requests.get(__address__, timeout=deadline.timeout(TIMEOUT))
         res.raise_for_status()
         if not res.ok:
             raise ConnectionError(f"Response error: {res.status_code} - {res.reason}")
@@ -72,7 +72,7 @@ class ipify:
             f"{'&callback=' + callback if callback else ''}"
         )
 
-        res = requests.get(__address__)
+        res = requests.get(__address__, timeout=deadline.timeout(TIMEOUT))
         res.raise_for_status()
         if not res.ok:
             raise ConnectionError(f"Response error: {res.status_code} - {res.reason}")
@@ -86,19 +86,20 @@ class ipify:
             f"{'&callback=' + callback if callback else ''}"
         )
 
-        res = requests.get(__address__)
+        res = requests.get(__address__, timeout=deadline.timeout(TIMEOUT))
         res.raise_for_status()
         if not res.ok:
             raise ConnectionError(f"Response error: {res.status_code} - {res.reason}")
         return res.json if format in ('json' or 'jsonp') else res.text
 
 class icanhazip:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         self.api_uri = f'https://icanhazip.com'
+        self.http = session or requests
     
     def get(self) -> str:
         """Fetch public IP address from icanhazip.com"""
-        res = requests.get(self.api_uri)
+        res = self.http.get(self.api_uri, timeout=deadline.timeout(TIMEOUT))
         res.raise_for_status()
         if not res.ok:
             raise ConnectionError(f"Response error: {res.status_code} - {res.reason}")
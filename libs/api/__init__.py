@@ -0,0 +1,15 @@
+class UpdateSkipped(Exception):
+    """
+    A record deliberately left as it is, e.g. because it is known to be missing.
+
+    The record was not updated, but retrying the cycle would not change that: callers report it
+    as skipped instead of failed, and History records the outcome as 'skipped'.
+    """
+
+class UpdateDeferred(UpdateSkipped):
+    """
+    A record held back for now, e.g. while the provider asked clients to back off.
+
+    Like `UpdateSkipped` it does not fail the cycle, but the provider is not marked as done,
+    so the record is tried again on the next scheduled cycle.
+    """
@@ -1,11 +1,34 @@
 import json
 import math
-from typing import Any, Literal, Optional, Self, TypeAlias, Union
+import threading
+import time
+from typing import Any, Iterator, Literal, NoReturn, Optional, Self, TypeAlias, Union
 import requests
+from libs import deadline
+from libs.api import UpdateSkipped
 from libs.logging import Logger
 from libs.RecordsCache import RecordsCache
+from libs.dns.verifier import AuthoritativeVerifier
+from libs.singleflight import SingleFlight
+from libs.resolver import prewarm
 
 
+class DNSRecord:
+    """One record of a zone listing, holding only the fields FlexiDNS reads."""
+    __slots__ = ('id', 'name', 'type', 'content', 'ttl', 'proxied', 'comment')
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.id: str = data['id']
+        self.name: str = data['name']
+        self.type: str = data['type']
+        self.content: str = data['content']
+        self.ttl: int = data.get('ttl', 1)
+        self.proxied: bool = data.get('proxied', False)
+        self.comment: str = data.get('comment') or ""
+
+    def __repr__(self) -> str:
+        return f"DNSRecord({self.type} {self.name} -> {self.content})"
+
 class CloudFlare:
     """
     A class to interact with Cloudflare's API for managing DNS records.
@@ -13,12 +36,16 @@ class CloudFlare:
     Attributes:
         integrate (str): Integration name for logging purposes.
         headers (dict): Authorization headers for API requests.
+        session (requests.Session): Pooled connections to the API, kept across cycles.
         cache (Optional[RecordsCache]): Cache for storing DNS records.
         cache_persistent (bool): Whether to persist cache data.
+        verifier (Optional[AuthoritativeVerifier]): Checks records against the zone's nameservers before reading the API.
+        flight (SingleFlight): Shares identical concurrent reads (zone and record lookups) between callers.
+        timeout (float): Longest single API request, in seconds, further shortened by the current deadline.
     """
     integrate = 'CloudFlare'
     
-    def __init__(self: Self, email: str, password: str, cache_timeout: int = 86400, cache_persistent: bool = False):
+    def __init__(self: Self, email: str, password: str, cache_timeout: int = 86400, cache_persistent: bool = False, verify_authoritative: bool = False, nameservers: Optional[list[str]] = None, negative_cache_timeout: int = 3600, timeout: float = 10):
         """
         Initialize the CloudFlare API client.
 
@@ -27,6 +54,10 @@ class CloudFlare:
             password (str): API token for authentication.
             cache_timeout (int): Cache timeout in seconds. Use -1 for infinite timeout, 0 to disable caching.
             cache_persistent (bool): Whether to persist cache data to disk.
+            verify_authoritative (bool): Whether to query the authoritative nameservers before reading records through the API.
+            nameservers (list[str], optional): Nameservers to verify against. Defaults to the ones Cloudflare assigned to each zone.
+            negative_cache_timeout (int): Seconds a missing zone or record is skipped before it is looked up again.
+            timeout (float): Longest single API request, in seconds, further shortened by the current deadline.
         """
         logger.verbose("Initializing CloudFlare API authorization...")
         
@@ -35,10 +66,37 @@ class CloudFlare:
             "X-Auth-Email": email,
             "Authorization": f"Bearer {password}"
         }
+        # Kept across cycles, so API calls reuse pooled connections instead of opening a cold one each
+        self.session = requests.Session()
         
         _ct = int(1e18) if cache_timeout <= -1 else int(cache_timeout)
-        self.cache: Optional[RecordsCache] = RecordsCache().build('cloudflare_records', timeout=_ct) if _ct != 0 else None
+        self.cache: Optional[RecordsCache] = RecordsCache().build('cloudflare_records', timeout=_ct, negative_timeout=negative_cache_timeout) if _ct != 0 else None
         self.cache_persistent = cache_persistent
+        # Records are updated from several threads at once; pulling and committing the persistent
+        # cache file must not interleave
+        self.cache_lock = threading.RLock()
+
+        self.verifier: Optional[AuthoritativeVerifier] = AuthoritativeVerifier() if verify_authoritative else None
+        self.nameservers: list[str] = list(nameservers or [])
+        self.zone_nameservers: dict[str, list[str]] = {}
+        self.flight = SingleFlight()
+        self.timeout = timeout
+
+    def __fetch__(self: Self, url: str, params: Optional[dict[str, Any]] = None) -> tuple[bool, int, str, Any]:
+        """
+        GET `url` through the singleflight layer, keyed by (url, params).
+
+        Args:
+            url (str): The API endpoint.
+            params (dict[str, Any], optional): Query parameters.
+
+        Returns:
+            tuple[bool, int, str, Any]: `response.ok`, status code, raw text and decoded JSON, shared between concurrent callers.
+        """
+        def __request__() -> tuple[bool, int, str, Any]:
+            response = self.session.get(url, headers=self.headers, params=params, timeout=deadline.timeout(self.timeout))
+            return response.ok, response.status_code, response.text, response.json()
+        return self.flight.do((url, tuple(sorted((params or {}).items()))), __request__)
     
     def get_zone_id(self: Self, domain: str) -> str:
         """
@@ -53,26 +111,29 @@ class CloudFlare:
         url = "https://api.cloudflare.com/client/v4/zones"
         logger.verbose(f"Fetching zone id for domain: {domain}")
 
-        response = requests.get(url, headers=self.headers, params={"name": domain})
-        data = response.json()
+        ok, status_code, text, data = self.__fetch__(url, {"name": domain})
 
-        if not response.ok:
-            raise ConnectionError(f"Error fetching zone id for domain '{domain}'. Response Code: {response.status_code}, Error: {response.text}")
+        if not ok:
+            raise ConnectionError(f"Error fetching zone id for domain '{domain}'. Response Code: {status_code}, Error: {text}")
 
         if data['success'] and data['result']:
             zone_id = data['result'][0]['id']
+            self.zone_nameservers[domain] = data['result'][0].get('name_servers', [])
             logger.verbose(f"Zone ID retrieved for domain '{domain}': {zone_id}")
             return zone_id
+        elif data['success']:
+            raise KeyError(f"Zone '{domain}' not found.")
         else:
             raise ConnectionRefusedError(f"DNS record not found or API call unsuccessful.\n*** Success: {data['success']} | Result: {data['result']}")
 
-    def get_record_id(self: Self, zone_id: str, record_name: str) -> str:
+    def get_record_id(self: Self, zone_id: str, record_name: str, record_type: Optional[str] = None) -> str:
         """
         Retrieve the DNS record ID for a given record name in a specific zone.
 
         Args:
             zone_id (str): The Zone ID where the record is located.
             record_name (str): The name of the DNS record.
+            record_type (str, optional): Only match records of this type, so a dual-stack name resolves to the right record.
 
         Returns:
             str: The DNS record ID.
@@ -80,20 +141,63 @@ class CloudFlare:
         url = f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records"
         logger.verbose(f"Fetching DNS record ID for record: {record_name} in zoneId: {zone_id}")
 
-        response = requests.get(url, headers=self.headers, params={"name": record_name})
-        data = response.json()
+        ok, status_code, text, data = self.__fetch__(url, {"name": record_name, **({"type": record_type} if record_type else {})})
 
-        if not response.ok:
-            raise ConnectionError(f"Error fetching DNS record ID for '{record_name}'. Response Code: {response.status_code}, Error: {response.text}")
+        if not ok:
+            raise ConnectionError(f"Error fetching DNS record ID for '{record_name}'. Response Code: {status_code}, Error: {text}")
 
         if data['success'] and data['result']:
             record_id = data['result'][0]['id']
             logger.verbose(f"DNS record ID retrieved for record '{record_name}': {record_id}")
             return record_id
+        elif data['success']:
+            raise KeyError(f"DNS record '{record_name}' not found.")
         else:
             raise ConnectionRefusedError("DNS record not found or API call unsuccessful.")
 
-    def get_dns_records(self: Self, zone_id: str, filter: Optional[dict[str, Any]] = None) -> list[dict[str, Any]]:
+    def __page__(self: Self, url: str, params: dict[str, Any]) -> tuple[list[DNSRecord], int]:
+        """GET one page of a record listing, keeping only compact `DNSRecord`s and the page count."""
+        response = self.session.get(url, headers=self.headers, params=params, timeout=deadline.timeout(self.timeout))
+        if not response.ok:
+            raise ConnectionError(f"Error fetching DNS records. Response Code: {response.status_code}, Error: {response.text}")
+        data = response.json()
+        return [DNSRecord(record) for record in data['result']], data.get('result_info', {}).get('total_pages', 1)
+
+    def iter_dns_records(self: Self, zone_id: str, filter: Optional[dict[str, Any]] = None, per_page: int = 100) -> Iterator[DNSRecord]:
+        """
+        Yield the DNS records of a zone page by page.
+
+        Each page is decoded and reduced to `DNSRecord`s before the next one is requested, so
+        memory stays flat however large the zone is. Filtered lookups go through the singleflight
+        layer; full listings do not, since it would keep every page alive.
+
+        Args:
+            zone_id (str): The Zone ID to list records from.
+            filter (dict[str, Any], optional): Filters to apply, e.g. `{"name": fqdn, "type": "A"}`.
+            per_page (int): Records per page. Defaults to 100.
+
+        Example Usage:
+        --------------
+        ```
+        for record in cloudflare.iter_dns_records(zone_id, {"type": "AAAA"}):
+            print(record.name, record.content)
+        ```
+        """
+        url = f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records"
+        logger.verbose(f"Fetching DNS records for zoneId: {zone_id} with filter: {filter}")
+        page, pages, count = 1, 1, 0
+        while page <= pages:
+            params = {**(filter or {}), "page": page, "per_page": per_page}
+            if filter:
+                records, pages = self.flight.do((url, tuple(sorted(params.items()))), lambda: self.__page__(url, params))
+            else:
+                records, pages = self.__page__(url, params)
+            count += len(records)
+            yield from records
+            page += 1
+        logger.verbose(f"{count} DNS records retrieved in {pages} page(s).")
+
+    def get_dns_records(self: Self, zone_id: str, filter: Optional[dict[str, Any]] = None) -> list[DNSRecord]:
         """
         Fetch DNS records for a specific zone with optional filters.
 
@@ -102,26 +206,19 @@ class CloudFlare:
             filter (dict[str, any], optional): Filters to apply when fetching records.
 
         Returns:
-            dict: The DNS records matching the filter.
+            list[DNSRecord]: The DNS records matching the filter, see `iter_dns_records` for large listings.
         """
-        url = f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records"
-        logger.verbose(f"Fetching DNS records for zoneId: {zone_id} with filter: {filter}")
-
-        response = requests.get(url, headers=self.headers, params=filter)
-        response.raise_for_status()
-        data = response.json()
-
-        if not response.ok:
-            logger.exception(ConnectionError(f"Error fetching DNS records. Response Code: {response.status_code}, Error: {response.text}"))
-
-        logger.verbose(f"DNS records retrieved: {data['result']}")
-        return data['result']
+        return list(self.iter_dns_records(zone_id, filter))
 
     def __poke_cache__(self) -> None:
         """
         Verify and refresh the cache if necessary.
         """
         logger.log("Verifying cache validity...")
+        with self.cache_lock:
+            self.__refresh_cache__()
+
+    def __refresh_cache__(self) -> None:
         if self.cache_persistent:
             try:
                 logger.verbose("Attempting to pull data from persistent cache...")
@@ -154,7 +251,7 @@ class CloudFlare:
             "SDN": ".".join(parts[:-2]) if len(parts) > 2 else None
         }
         
-    def __cmit(self: Self, domain_type: str, zone_id: str, fqdn: str, dns_record_id: str) -> None:
+    def __cmit(self: Self, domain_type: str, zone_id: str, fqdn: str, dns_record_id: str, content: Optional[str] = None) -> None:
         """
         Commit Zone ID and DNS record ID to the cache.
 
@@ -163,21 +260,32 @@ class CloudFlare:
             zone_id (str): The Zone ID.
             fqdn (str): The fully qualified domain name.
             dns_record_id (str): The DNS record ID.
+            content (str, optional): The content the record is known to hold, trusted by the fast path.
         """
         # Cache the retrieved ZoneID and DNSRecordID if caching is enabled
         if not self.cache: return
-        
+        with self.cache_lock:
+            self.__store__(domain_type, zone_id, fqdn, dns_record_id, content)
+
+    def __store__(self: Self, domain_type: str, zone_id: str, fqdn: str, dns_record_id: str, content: Optional[str]) -> None:
+        fqdn_split = self.__part_components__(fqdn)
         data = {
             "domain_type": domain_type,
-            "zone_id": zone_id, "dns_record_id": dns_record_id
+            "zone_id": zone_id, "dns_record_id": dns_record_id,
+            "name_servers": self.zone_nameservers.get(f"{fqdn_split['DN']}.{fqdn_split['TLD']}", [])
         }
         
-        if not self.cache.is_exist(fqdn):
-            self.cache.append(fqdn, data)
+        key = RecordsCache.key(fqdn, domain_type)
+        if not self.cache.is_exist(key):
+            self.cache.append(key, data)
             logger.verbose(f"Appended cache with {data}.")
-        elif self.cache.is_exist(fqdn) and not self.cache.is_valid(fqdn):
-            self.cache.inject(fqdn, data)
+        elif self.cache.is_exist(key) and not self.cache.is_valid(key):
+            self.cache.delete(key)
+            self.cache.append(key, data)
             logger.verbose(f"Updated cache with {data}.")
+
+        if content is not None:
+            self.cache.inject(key, {"domain_type": domain_type, "content": content})
         
         if self.cache_persistent:
             try:
@@ -191,41 +299,111 @@ class CloudFlare:
                 self.cache.commit()
                 logger.verbose("Committed cache to Persistent Cache.")
     
-    def A(self: Self, fqdn: str, content: str, ttl: Optional[int] = None, proxied: Optional[bool] = None, comment: Optional[str] = None) -> None:
+    async def unverified(self: Self, fqdns: list[str], domain_type: str, content: str) -> list[str]:
         """
-        Update an A record in Cloudflare's DNS.
+        Drop the records whose authoritative answer already equals `content`.
+
+        Records without known nameservers, and records that mismatch or time out, are kept
+        so the caller falls back to the API. Proxied records always mismatch, since their
+        public answer is a Cloudflare edge address.
 
         Args:
-            fqdn (str): The fully qualified domain name.
-            content (str): The IPv4 address for the A record.
-            ttl (int, optional): Time-to-live for the record in seconds.
-            proxied (bool, optional): Whether the record is proxied through Cloudflare.
-            comment (str, optional): A comment for the record.
+            fqdns (list[str]): The fully qualified domain names.
+            domain_type (str): 'A' or 'AAAA'.
+            content (str): The desired address.
+
+        Returns:
+            list[str]: The FQDNs that still need to go through the API.
+        """
+        if not self.verifier: return fqdns
+
+        records, pending = [], []
+        for fqdn in fqdns:
+            fqdn_split = self.__part_components__(fqdn)
+            cache = self.__cached__(RecordsCache.key(fqdn, domain_type))
+            nameservers = (
+                self.nameservers
+                or (cache or {}).get("name_servers")
+                or self.zone_nameservers.get(f"{fqdn_split['DN']}.{fqdn_split['TLD']}", [])
+            )
+            if nameservers:
+                records.append((fqdn, domain_type, content, nameservers))
+            else:
+                pending.append(fqdn)
+
+        verified = await self.verifier.verify_many(records) if records else {}
+        for (fqdn, _), ok in verified.items():
+            if ok:
+                logger.log(f"No changes needed for '{fqdn}', verified against authoritative nameservers.")
+            else:
+                pending.append(fqdn)
+        return [fqdn for fqdn in fqdns if fqdn in pending]
+
+    def __cached__(self: Self, key: str) -> Optional[dict]:
+        """The live cache entry under `key`, None when absent or expired, looked up under `cache_lock`."""
+        if not self.cache:
+            return None
+        with self.cache_lock:
+            return self.cache.get(key) if self.cache.is_exist(key) else None
+
+    def __negative_key__(self: Self, kind: str, name: str) -> str:
+        """Cache key of a negative entry, kept apart from the FQDN keys of positive entries."""
+        return f"negative:{kind}:{name}"
+
+    def __update_record__(self: Self, domain_type: str, fqdn: str, content: str, ttl: Optional[int] = None, proxied: Optional[bool] = None, comment: Optional[str] = None) -> None:
+        """
+        Update a record of `domain_type` in Cloudflare's DNS, shared by `A` and `AAAA`.
+
+        Zones and records that do not exist are stored as negative cache entries: they are
+        reported once as a warning and then skipped without API traffic until the entry expires.
         """
-        domain_type = "A"
         if self.cache: self.__poke_cache__()
 
         # Split FQDN into components
-        logger.verbose(f"Processing A record update for FQDN: {fqdn}, Content: {content}")
+        logger.verbose(f"Processing {domain_type} record update for FQDN: {fqdn}, Content: {content}")
         fqdn_split = self.__part_components__(fqdn)
         logger.verbose(f"FQDN split into TLD: {fqdn_split['TLD']}, DN: {fqdn_split['DN']}, SDN: {fqdn_split['SDN']}")
 
         domain = f"{fqdn_split['DN']}.{fqdn_split['TLD']}"
         logger.verbose(f"Determined domain: {domain}")
-        
-        cache = None if not (self.cache and self.cache.is_exist(fqdn)) else self.cache.get(fqdn)
 
-        zone_id = self.get_zone_id(domain) if not cache else cache["zone_id"]
-        dns_record_id = self.get_record_id(zone_id, fqdn) if not cache else cache["dns_record_id"]
-        old_record: list[dict[str, Any]] = self.get_dns_records(zone_id, {"name": fqdn})
-        if not old_record:
-            raise KeyError(f"No domain name '{fqdn}' found in your DNS records. Please create it first.")
+        # Skip names already known to be missing
+        zone_key, record_key = self.__negative_key__("zone", domain), self.__negative_key__(domain_type, fqdn)
+        reason = None
+        if self.cache:
+            # Checked and read in one step: another record's thread may expire the entry in between
+            with self.cache_lock:
+                negative = next((_ for _ in (zone_key, record_key) if self.cache.is_negative(_)), None)
+                reason = self.cache.cache_data[negative]['reason'] if negative else None
+        if reason is not None:
+            logger.verbose(f"Skipping '{fqdn}' ({domain_type}), known to be missing: {reason}")
+            raise UpdateSkipped(f"Known to be missing: {reason}")
+        
+        key = RecordsCache.key(fqdn, domain_type)
+        cache = self.__cached__(key)
+
+        # Fast path: trust the cache when it already holds the desired content for this record type
+        if cache and cache.get("domain_type") == domain_type and cache.get("content") == content:
+            return logger.log(f"No changes needed for '{fqdn}', cached content is already up-to-date.")
+
+        try:
+            zone_id = self.get_zone_id(domain) if not cache else cache["zone_id"]
+        except KeyError as e:
+            self.__negate__(zone_key, f"Zone '{domain}' not found in your Cloudflare account.", e)
+        try:
+            dns_record_id = self.get_record_id(zone_id, fqdn, domain_type) if not cache else cache["dns_record_id"]
+            old_record: list[DNSRecord] = self.get_dns_records(zone_id, {"name": fqdn, "type": domain_type})
+            if not old_record:
+                raise KeyError(f"No domain name '{fqdn}' found in your DNS records. Please create it first.")
+        except KeyError as e:
+            self.__negate__(record_key, f"No {domain_type} record '{fqdn}' found in your DNS records. Please create it first.", e)
 
         # Cache the retrieved ZoneID and DNSRecordID if caching is enabled
         self.__cmit(domain_type, zone_id, fqdn, dns_record_id)           
         
         # Check if the content is already up-to-date
-        if content == old_record[0]['content']:
+        if content == old_record[0].content:
+            self.__cmit(domain_type, zone_id, fqdn, dns_record_id, content)
             return logger.log(f"No changes needed for '{fqdn}', content is already up-to-date.")
 
         # Prepare data for the DNS record update
@@ -234,16 +412,19 @@ class CloudFlare:
             "type": domain_type,
             "name": fqdn,
             "content": content,
-            "ttl": ttl if ttl is not None else old_record[0]['ttl'],
-            "proxied": proxied if proxied is not None else old_record[0]['proxied'],
-            "comment": comment if comment is not None else old_record[0].get('comment', "")
+            "ttl": ttl if ttl is not None else old_record[0].ttl,
+            "proxied": proxied if proxied is not None else old_record[0].proxied,
+            "comment": comment if comment is not None else old_record[0].comment
         }
 
         # Send the update request
         logger.verbose(f"Updating DNS record with data: {data}")
-        response = requests.put(url, headers=self.headers, json=data)
+        response = self.session.put(url, headers=self.headers, json=data, timeout=deadline.timeout(self.timeout))
         result = response.json()
 
+        # Reads of this zone cached by the singleflight layer are now stale
+        self.flight.forget(lambda key: key[0].startswith(f"https://api.cloudflare.com/client/v4/zones/{zone_id}/"))
+
         # Handle response errors
         if not response.ok:
             raise ConnectionError(f"Error updating DNS record. Response Code: {response.status_code}, Error: {response.text}")
@@ -251,67 +432,177 @@ class CloudFlare:
         if not result.get("success", False):
             raise ConnectionRefusedError(f"Failed to update content of '{fqdn}' to '{content}'. Errors: {result['errors']}")
 
+        self.__cmit(domain_type, zone_id, fqdn, dns_record_id, content)
         logger.log(f"Successfully updated DNS record for '{fqdn}' with new content: {content}")
 
-    def AAAA(self: Self, fqdn: str, content: str, ttl: Optional[int] = None, proxied: Optional[bool] = None, comment: Optional[str] = None) -> None:
+    def audit(self: Self, expected: dict[tuple[str, str], str]) -> list[dict[str, Any]]:
         """
-        Update an AAAA record in Cloudflare's DNS.
+        Page through every zone holding an expected record and find drift made outside this program.
+
+        This is the slow tier of reconciliation: the regular sync trusts the cache and makes no
+        remote reads when nothing changed, while this audit runs on its own cadence, reads each
+        zone's full record listing, and compares it with what was published. Drifted records lose
+        their cached content, so the next update of them goes to the API; repairing them is left to
+        the caller, through the same path as any other update.
 
         Args:
-            fqdn (str): The fully qualified domain name.
-            content (str): The IPv6 address for the AAAA record.
-            ttl (int, optional): Time-to-live for the record in seconds.
-            proxied (bool, optional): Whether the record is proxied through Cloudflare.
-            comment (str, optional): A comment for the record.
+            expected (dict[tuple[str, str], str]): `(fqdn, record type)` mapped to the content it should hold.
+
+        Returns:
+            list[dict[str, Any]]: One entry per drifted or missing record, with `name`, `type`, `expected` and `found` (None when missing).
         """
-        domain_type = "AAAA"
-        if self.cache_persistent: self.__poke_cache__()
-        
-        # Split FQDN into components
-        logger.verbose(f"Processing A record update for FQDN: {fqdn}, Content: {content}")
-        fqdn_split = self.__part_components__(fqdn)
-        logger.verbose(f"FQDN split into TLD: {fqdn_split['TLD']}, DN: {fqdn_split['DN']}, SDN: {fqdn_split['SDN']}")
+        zones: dict[str, dict[tuple[str, str], str]] = {}
+        for (fqdn, domain_type), content in expected.items():
+            fqdn_split = self.__part_components__(fqdn)
+            zones.setdefault(f"{fqdn_split['DN']}.{fqdn_split['TLD']}", {})[(fqdn.lower(), domain_type)] = content
+
+        drift: list[dict[str, Any]] = []
+        for domain, records in zones.items():
+            if self.cache and self.cache.is_negative(self.__negative_key__("zone", domain)):
+                continue
+            try:
+                zone_id = self.get_zone_id(domain)
+            except KeyError:
+                zone_id = None
+            # A deleted or re-created zone leaves record IDs behind that would only fail later
+            if self.cache:
+                with self.cache_lock:
+                    entries = [self.cache.cache_data.get(RecordsCache.key(*key)) for key in records]
+                    for stale in {entry.get("zone_id") for entry in entries if isinstance(entry, dict)} - {zone_id, None}:
+                        logger.log(f"Zone '{domain}' changed, dropped {self.cache.invalidate(zone_id=stale)} cached record(s) of its old zone ID.", 30)
+            if zone_id is None:
+                continue
+
+            seen: set[tuple[str, str]] = set()
+            for record in self.iter_dns_records(zone_id):
+                key = (record.name.lower(), record.type)
+                if key not in records: continue
+                seen.add(key)
+                if record.content != records[key]:
+                    drift.append({"name": key[0], "type": key[1], "expected": records[key], "found": record.content})
+            drift.extend({"name": k[0], "type": k[1], "expected": v, "found": None} for k, v in records.items() if k not in seen)
+
+        for entry in drift:
+            if entry["found"] is None:
+                logger.log(f"Audit: {entry['type']} record '{entry['name']}' no longer exists.", 30)
+                continue
+            logger.log(f"Audit: {entry['type']} record '{entry['name']}' holds '{entry['found']}', expected '{entry['expected']}'.", 30)
+            # The fast path must not trust the cached content any more
+            key = RecordsCache.key(entry["name"], entry["type"])
+            if self.cache:
+                with self.cache_lock:
+                    if self.cache.is_exist(key) and self.cache.is_valid(key):
+                        self.cache.inject(key, {"content": None})
+        return drift
+
+    def __negate__(self: Self, key: str, reason: str, error: KeyError) -> NoReturn:
+        """
+        Warn once about a missing zone or record and remember it, or re-raise when negative caching is disabled.
 
-        domain = f"{fqdn_split['DN']}.{fqdn_split['TLD']}"
-        logger.verbose(f"Determined domain: {domain}")
-        
-        cache = None if not (self.cache and self.cache.is_exist(fqdn)) else self.cache.get(fqdn)
+        Raises:
+            UpdateSkipped: Once the negative entry is stored, so the record is reported as skipped.
+        """
+        if not self.cache or not self.cache.negative_timeout:
+            raise error
+        logger.log(f"{reason} Skipping it for {self.cache.negative_timeout} seconds.", 30)
+        with self.cache_lock:
+            self.cache.negate(key, reason)
+            if self.cache_persistent:
+                self.cache.commit()
+        raise UpdateSkipped(f"Known to be missing: {reason}") from error
 
-        zone_id = self.get_zone_id(domain) if not cache else cache["zone_id"]
-        dns_record_id = self.get_record_id(zone_id, fqdn) if not cache else cache["dns_record_id"]
-        old_record: list[dict[str, Any]] = self.get_dns_records(zone_id, {"name": fqdn})
-        if not old_record:
-            raise KeyError(f"No domain name '{fqdn}' found in your DNS records. Please create it first.")
+    def __offline_cache__(self: Self) -> None:
+        """Load the persistent cache without any API traffic, for offline inspection."""
+        if self.cache is not None and self.cache_persistent and self.cache.is_empty():
+            try:
+                self.cache.pull()
+            except FileNotFoundError:
+                pass
 
-        self.__cmit(domain_type, zone_id, fqdn, dns_record_id)
-        
-        # Check if the content is already up-to-date
-        if content == old_record[0]['content']:
-            return logger.log(f"No changes needed for '{fqdn}', content is already up-to-date.")
+    def cache_age(self: Self, fqdn: str, domain_type: str) -> Optional[float]:
+        """
+        Seconds since the cache entry of `fqdn`'s `domain_type` record was stored, without any API traffic.
 
-        # Prepare data for the DNS record update
-        url = f"https://api.cloudflare.com/client/v4/zones/{zone_id}/dns_records/{dns_record_id}"
-        data = {
-            "type": domain_type,
-            "name": fqdn,
-            "content": content,
-            "ttl": ttl if ttl is not None else old_record[0]['ttl'],
-            "proxied": proxied if proxied is not None else old_record[0]['proxied'],
-            "comment": comment if comment is not None else old_record[0].get('comment', "")
+        Returns:
+            float | None: The age, or None when the record is not cached (or cached forever).
+        """
+        self.__offline_cache__()
+        entry = self.cache.cache_data.get(RecordsCache.key(fqdn, domain_type)) if self.cache and not self.cache.is_empty() else None
+        # `cacheTimeout = -1` stores entries for 1e18 seconds, too coarse a float to recover the age from
+        if not isinstance(entry, dict) or entry.get("negative") or self.cache.timeout >= 1e18:
+            return None
+        return time.time() - (entry["expiry_time"] - self.cache.timeout)
+
+    def plan(self: Self, domain_type: str, fqdn: str, content: str) -> Optional[str]:
+        """
+        Predict from the cache alone whether updating `fqdn` would reach the API.
+
+        Mirrors the offline checks of `__update_record__`: names known to be missing and records
+        whose cached content already matches are skipped without any request.
+
+        Returns:
+            str | None: Why the update would be skipped, None when it would call the API.
+        """
+        self.__offline_cache__()
+        if not self.cache or self.cache.is_empty():
+            return None
+        fqdn_split = self.__part_components__(fqdn)
+        domain = f"{fqdn_split['DN']}.{fqdn_split['TLD']}"
+        for key in (self.__negative_key__("zone", domain), self.__negative_key__(domain_type, fqdn)):
+            if self.cache.is_negative(key):
+                return f"known to be missing: {self.cache.cache_data[key]['reason']}"
+        entry = self.cache.cache_data.get(RecordsCache.key(fqdn, domain_type))
+        if isinstance(entry, dict) and entry.get("expiry_time", 0) > time.time() and entry.get("domain_type") == domain_type and entry.get("content") == content:
+            return "cached content is already up-to-date"
+        return None
+
+    def prewarm(self: Self) -> None:
+        """Open a connection to the API host ahead of the next cycle, through its static trace endpoint. Blocking."""
+        prewarm(self.session, "https://api.cloudflare.com/cdn-cgi/trace", self.timeout)
+
+    def export_state(self: Self) -> dict[str, Any]:
+        """Warm state for `libs.warmstate`: cached records (negative entries included) and zone nameservers."""
+        return {
+            "cache": dict(self.cache.cache_data) if self.cache and not self.cache.is_empty() else {},
+            "zone_nameservers": dict(self.zone_nameservers)
         }
 
-        # Send the update request
-        logger.verbose(f"Updating DNS record with data: {data}")
-        response = requests.put(url, headers=self.headers, json=data)
-        result = response.json()
+    def restore_state(self: Self, state: dict[str, Any]) -> None:
+        """
+        Resume from a state produced by `export_state`, so the first cycle needs no zone or record lookups.
 
-        # Handle response errors
-        if not response.ok:
-            raise ConnectionError(f"Error updating DNS record. Response Code: {response.status_code}, Error: {response.text}")
+        Args:
+            state (dict[str, Any]): The exported state.
+        """
+        if self.cache and state.get("cache"):
+            self.cache.cache_data = dict(state["cache"])
+            self.cache.poke()
+        self.zone_nameservers.update(state.get("zone_nameservers", {}))
 
-        if not result.get("success", False):
-            raise ConnectionRefusedError(f"Failed to update content of '{fqdn}' to '{content}'. Errors: {result['errors']}")
+    def A(self: Self, fqdn: str, content: str, ttl: Optional[int] = None, proxied: Optional[bool] = None, comment: Optional[str] = None) -> None:
+        """
+        Update an A record in Cloudflare's DNS.
 
-        logger.log(f"Successfully updated DNS record for '{fqdn}' with new content: {content}")
+        Args:
+            fqdn (str): The fully qualified domain name.
+            content (str): The IPv4 address for the A record.
+            ttl (int, optional): Time-to-live for the record in seconds.
+            proxied (bool, optional): Whether the record is proxied through Cloudflare.
+            comment (str, optional): A comment for the record.
+        """
+        self.__update_record__("A", fqdn, content, ttl, proxied, comment)
+
+    def AAAA(self: Self, fqdn: str, content: str, ttl: Optional[int] = None, proxied: Optional[bool] = None, comment: Optional[str] = None) -> None:
+        """
+        Update an AAAA record in Cloudflare's DNS.
+
+        Args:
+            fqdn (str): The fully qualified domain name.
+            content (str): The IPv6 address for the AAAA record.
+            ttl (int, optional): Time-to-live for the record in seconds.
+            proxied (bool, optional): Whether the record is proxied through Cloudflare.
+            comment (str, optional): A comment for the record.
+        """
+        self.__update_record__("AAAA", fqdn, content, ttl, proxied, comment)
 
 logger = Logger(CloudFlare.integrate)
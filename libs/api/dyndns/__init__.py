@@ -1,13 +1,12 @@
-import json
-from typing import Literal, Self, TypeAlias
-import requests
+from typing import Self
+from libs.api.dyndns2 import DynDNS2
 from libs.logging import Logger
 
-class DynDNS:
+class DynDNS(DynDNS2):
     integrate = 'DynDNS'
-    
-    def __init__(self: Self, username: str, password: str):
-        self.username = username
-        self.password = password
-        
+    update_url = "https://members.dyndns.org/nic/update"
+
+    def __init__(self: Self, username: str, password: str, timeout: float = 10):
+        super().__init__(username, password, timeout)
+
 logger = Logger(DynDNS.integrate)
@@ -0,0 +1,194 @@
+import time
+from urllib.parse import urljoin
+from typing import Any, Optional, Self
+import requests
+from libs import deadline
+from libs.api import UpdateDeferred, UpdateSkipped
+from libs.resolver import prewarm
+from libs.logging import Logger
+
+class DynDNS2:
+    """
+    Shared client for providers speaking the dyndns2 update protocol (NoIP, DynDNS, ...).
+
+    Hostnames that share a credential and an address are sent as one comma-separated
+    `hostname=` list, and the response is parsed into one status per hostname.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        update_url (str): The provider's `/nic/update` endpoint.
+        max_hostnames (int): Largest hostname list the protocol accepts in one request.
+        timeout (float): Longest single request, in seconds, further shortened by the current deadline.
+        backoff_until (float): `time.time()` before which no update is sent (set on `911` and `dnserr`).
+        blocked (dict): Hostnames that need user intervention, mapped to the status that blocked them.
+        rejected (str, optional): The status that rejected the credential, after which nothing is sent until restart.
+    """
+    integrate = 'DynDNS2'
+    update_url = ''
+    user_agent = 'FlexiDNS-UDIP/1.0 dotplai@github'
+    max_hostnames = 20
+
+    # Statuses that succeeded, statuses that block a single host, and statuses that stop the whole credential.
+    SUCCESS = ('good', 'nochg')
+    HOST_ERRORS = ('nohost', 'notfqdn', 'abuse', '!donator', 'numhost')
+    FATAL_ERRORS = ('badauth', 'badagent', '!yours')
+    # Server-side errors, after which the protocol asks clients to wait at least 30 minutes.
+    SERVER_ERRORS = ('911', 'dnserr')
+    SERVER_BACKOFF = 1800
+
+    def __init__(self: Self, username: str, password: str, timeout: float = 10):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.auth = (username, password)
+        self.session.headers.update({"User-Agent": self.user_agent})
+
+        self.backoff_until: float = 0.0
+        self.blocked: dict[str, str] = {}
+        self.rejected: Optional[str] = None
+        self.logger = Logger(self.integrate)
+
+    def __parse__(self: Self, hostnames: list[str], text: str) -> dict[str, str]:
+        """
+        Pair each hostname with its status line. A single line applies to every hostname.
+
+        Args:
+            hostnames (list[str]): Hostnames in the order they were sent.
+            text (str): Raw response body.
+
+        Returns:
+            dict[str, str]: Hostname mapped to its status line, e.g. `good 203.0.113.7`.
+        """
+        lines = [line.strip() for line in text.strip().splitlines() if line.strip()] or ['911']
+        if len(lines) == 1:
+            lines = lines * len(hostnames)
+        return {hostname: lines[i] if i < len(lines) else '911' for i, hostname in enumerate(hostnames)}
+
+    def update(self: Self, fqdns: list[str], content: str) -> dict[str, str]:
+        """
+        Update every hostname to `content`, batching them per request.
+
+        Hostnames blocked by an earlier `abuse`/`nohost`-style answer are skipped, and
+        nothing is sent while a `911`/`dnserr` backoff is in effect. A rejected credential
+        (`badauth`, `badagent`, `!yours`) stops the remaining batches and every later update
+        until restart, since the protocol treats resending it as abuse.
+
+        Args:
+            fqdns (list[str]): The hostnames to update.
+            content (str): The new IPv4 or IPv6 address.
+
+        Returns:
+            dict[str, str]: Hostname mapped to its status line, for the hostnames sent before any stop.
+        """
+        if self.rejected:
+            self.logger.log(f"Credential rejected with '{self.rejected}', skipping update until restart.", 30)
+            return {}
+        if time.time() < self.backoff_until:
+            self.logger.log(f"Server asked to back off, skipping update until {time.ctime(self.backoff_until)}.", 30)
+            return {}
+
+        pending = [fqdn for fqdn in fqdns if fqdn not in self.blocked]
+        results: dict[str, str] = {}
+        for i in range(0, len(pending), self.max_hostnames):
+            batch = pending[i:i + self.max_hostnames]
+            params = {"hostname": ",".join(batch), "myip": content}
+
+            response = self.session.get(self.update_url, params=params, timeout=deadline.timeout(self.timeout))
+            if response.status_code >= 500:
+                results.update({hostname: '911' for hostname in batch})
+            else:
+                results.update(self.__parse__(batch, response.text))
+
+            codes = {status.split()[0] for status in results.values()}
+            if codes & set(self.FATAL_ERRORS):
+                self.rejected = next(code for code in self.FATAL_ERRORS if code in codes)
+                break
+            if codes & set(self.SERVER_ERRORS):
+                self.backoff_until = time.time() + self.SERVER_BACKOFF
+                break
+
+        for hostname, status in results.items():
+            code = status.split()[0]
+            if code in self.SUCCESS:
+                self.logger.log(f"Updated hostname '{hostname}' to IP '{content}' ({code}).")
+            elif code in self.HOST_ERRORS:
+                self.blocked[hostname] = code
+                self.logger.log(f"Hostname '{hostname}' rejected with '{code}', no further updates until restart.", 40)
+            elif code in self.FATAL_ERRORS:
+                self.logger.log(f"Credential rejected with '{code}' for '{hostname}', no further updates until restart.", 40)
+            elif code in self.SERVER_ERRORS:
+                self.logger.log(f"Server error for '{hostname}', backing off for {self.SERVER_BACKOFF} seconds.", 30)
+            else:
+                self.logger.log(f"Unexpected response for '{hostname}': {status}", 30)
+        return results
+
+    def outcome(self: Self, hostname: str, status: Optional[str]) -> Optional[Exception]:
+        """
+        Classify the status `update` returned for `hostname` (None when it returned none).
+
+        Args:
+            hostname (str): The hostname.
+            status (str, optional): Its status line.
+
+        Returns:
+            Exception | None: None when updated, `UpdateSkipped` for a blocked hostname or a rejected
+            credential, `UpdateDeferred` while the server's backoff lasts, and `ConnectionError` otherwise.
+        """
+        code = status.split()[0] if status else None
+        if code in self.SUCCESS:
+            return None
+        if self.rejected:
+            return UpdateSkipped(f"Hostname '{hostname}' not sent, the credential was rejected with '{self.rejected}'; fix the account and restart.")
+        if hostname in self.blocked:
+            return UpdateSkipped(f"Hostname '{hostname}' blocked after '{self.blocked[hostname]}', fix the account and restart.")
+        if code in self.SERVER_ERRORS or time.time() < self.backoff_until:
+            return UpdateDeferred(f"Hostname '{hostname}' held back, the server asked to back off until {time.ctime(self.backoff_until)}.")
+        return ConnectionError(f"Record '{hostname}' not updated: {status or 'no status'}")
+
+    def prewarm(self: Self) -> None:
+        """
+        Open a connection to the host of `update_url` ahead of the next cycle. Blocking.
+
+        The warm-up goes to the host root: any request to the update endpoint itself would count as an update attempt.
+        """
+        if self.update_url:
+            prewarm(self.session, urljoin(self.update_url, '/'), self.timeout)
+
+    def export_state(self: Self) -> dict[str, Any]:
+        """Warm state for `libs.warmstate`: the server's backoff, which must survive a restart."""
+        return {"backoff_until": self.backoff_until}
+
+    def restore_state(self: Self, state: dict[str, Any]) -> None:
+        """
+        Resume from a state produced by `export_state`. Blocked hostnames and a rejected credential
+        are deliberately not restored, since a restart is how the user clears them after fixing the account.
+
+        Args:
+            state (dict[str, Any]): The exported state.
+        """
+        self.backoff_until = max(self.backoff_until, float(state.get("backoff_until", 0.0)))
+
+    def A(self: Self, fqdn: str, content: str) -> dict[str, str]:
+        """
+        Updates a type A record for the given hostname with the specified IPv4 address.
+
+        Args:
+            fqdn (str): The hostname to update.
+            content (str): The new IPv4 address to set.
+
+        Returns:
+            dict[str, str]: Hostname mapped to its status line.
+        """
+        return self.update([fqdn], content)
+
+    def AAAA(self: Self, fqdn: str, content: str) -> dict[str, str]:
+        """
+        Updates a type AAAA record for the given hostname with the specified IPv6 address.
+
+        Args:
+            fqdn (str): The hostname to update.
+            content (str): The new IPv6 address to set.
+
+        Returns:
+            dict[str, str]: Hostname mapped to its status line.
+        """
+        return self.update([fqdn], content)
@@ -0,0 +1,613 @@
+import configparser
+import json
+import os
+import pickle
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from ipaddress import ip_address
+from typing import Any, Optional, Union
+
+from libs.converter import parse_trigger
+from libs.prefix import parse_suffix
+
+# Bump whenever the dataclasses below change shape, so stale snapshots are ignored.
+SNAPSHOT_VERSION = 20
+
+PROVIDERS = ('CloudFlare', 'NoIP', 'DynDNS')
+RECORD_TYPES = ('A', 'AAAA')
+MODES = ('intervalTime', 'interval', 'unixEpoch', 'unix', 'push')
+LOG_LEVELS = ('debug', 'normal', 'error')
+
+class ConfigError(ValueError):
+    """Raised when `config.ini` is missing, malformed, or fails validation."""
+
+def parse(val: str) -> Union[bool, int, float, str]:
+    """Convert a raw INI scalar into bool, int, float or str."""
+    val = val.strip().strip('"\'')
+    val_lower = val.lower()
+    if val_lower == 'true':
+        return True
+    if val_lower == 'false':
+        return False
+    try:
+        return float(val) if '.' in val else int(val)
+    except ValueError:
+        return val
+
+def parse_list(val: str) -> list[Union[bool, int, float, str]]:
+    """Convert a raw INI list such as `[True, 300]` or `[normal, debug]` into a Python list."""
+    val = val.strip().strip('"\',').strip('[] ')
+    return [parse(v) for v in val.split(',') if v.strip()] if val else []
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    query_api: str = 'ipify'
+    # Local address and/or network interface the lookup is sent through.
+    address: str = ''
+    interface: str = ''
+
+@dataclass(frozen=True)
+class General:
+    query_api: str = 'ipify'
+    mode: str = 'intervalTime'
+    sync_time: int = 36000
+    # Cron expressions, `HH:MM[:SS]` times or `@every <seconds>` entries for the `unixEpoch` mode.
+    schedule: tuple[str, ...] = ()
+    # Fleet scheduling: stable node identity, slot alignment, random jitter and startup delay in seconds.
+    node_id: str = ''
+    phase_spread: bool = False
+    jitter: int = 0
+    startup_delay: int = 0
+    # Seconds in-flight updates get to finish on SIGTERM before the warm state is saved.
+    shutdown_grace: int = 10
+    # Length of the delegated IPv6 prefix that AAAA suffix mappings are combined with.
+    prefix_length: int = 64
+    # Byte budget of the compressed `ifconfig` dump store, 0 to keep no dumps.
+    dump_capacity: int = 1048576
+    # Keep the append-only address and update history at `.dumps/history.log`.
+    history: bool = True
+    # Worker processes per-record providers are sharded across by zone (0 or 1 keeps them in-process),
+    # and requests in flight per provider credential across all workers.
+    workers: int = 0
+    shard_concurrency: int = 4
+    # Cache API hostname lookups for their DNS TTL, and seconds before each cycle that provider and
+    # address source connections are opened ahead (0 disables prewarming).
+    dns_cache: bool = True
+    prewarm: int = 5
+    # Named address sources, one per uplink, referenced from FQDN keys such as "A@wan2".
+    sources: dict[str, Source] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class Logging:
+    enabled_file: bool = True
+    console_included: tuple[str, ...] = ('normal',)
+    log_included: tuple[str, ...] = ('normal', 'debug')
+    split_log: bool = True
+
+@dataclass(frozen=True)
+class LearningBehavior:
+    # Seconds added to the retry delay after every failed cycle, `None` when disabled.
+    time_shift: Optional[int] = 300
+    # (minimum, maximum) poll interval in seconds for the `intervalTime` mode, `None` when disabled.
+    adaptive_interval: Optional[tuple[int, int]] = None
+    # (seconds, observations) a changed address must stay the same before providers are called, `None` when disabled.
+    settle_window: Optional[tuple[int, int]] = None
+
+@dataclass(frozen=True)
+class UpdateServer:
+    enabled: bool = False
+    listen: str = '0.0.0.0'
+    port: int = 8245
+    username: str = ''
+    password: str = ''
+
+@dataclass(frozen=True)
+class DNSResponder:
+    enabled: bool = False
+    listen: str = '0.0.0.0'
+    port: int = 53
+    ttl: int = 60
+
+@dataclass(frozen=True)
+class Failover:
+    enabled: bool = False
+    # Hostname mapped to its candidate addresses, preferred first.
+    records: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    probe: str = 'tcp:443'
+    interval: int = 10
+    timeout: int = 2
+    rise: int = 2
+    fall: int = 3
+
+@dataclass(frozen=True)
+class Leadership:
+    enabled: bool = False
+    # Lease file on storage shared by the replicas; the leader's warm state is shared next to it.
+    path: str = ''
+    duration: int = 30
+
+@dataclass(frozen=True)
+class Provider:
+    name: str
+    enabled: bool = False
+    credentials: dict[str, str] = field(default_factory=dict)
+    fqdn: dict[str, list[str]] = field(default_factory=dict)
+    # AAAA hostnames derived from the detected prefix, mapped to their interface identifier.
+    suffixes: dict[str, int] = field(default_factory=dict)
+    # (hostname, record type) whose address comes from a named source instead of the default one.
+    sources: dict[tuple[str, str], str] = field(default_factory=dict)
+    cache_timeout: int = 172800
+    cache_persistent: bool = False
+    negative_cache_timeout: int = 3600
+    audit_interval: int = 0
+    audit_repair: bool = False
+    request_timeout: int = 10
+    deadline: int = 60
+    verify_authoritative: bool = False
+    nameservers: tuple[str, ...] = ()
+    schedule: tuple[str, ...] = ()
+
+    def kwargs(self) -> dict[str, Any]:
+        """Keyword arguments accepted by the provider's API class constructor."""
+        if self.name == 'CloudFlare':
+            return {
+                **self.credentials, "timeout": self.request_timeout,
+                "cache_timeout": self.cache_timeout, "cache_persistent": self.cache_persistent,
+                "negative_cache_timeout": self.negative_cache_timeout,
+                "verify_authoritative": self.verify_authoritative, "nameservers": list(self.nameservers)
+            }
+        return {**self.credentials, "timeout": self.request_timeout}
+
+@dataclass(frozen=True)
+class Config:
+    path: str
+    general: General = field(default_factory=General)
+    logging: Logging = field(default_factory=Logging)
+    learning_behavior: LearningBehavior = field(default_factory=LearningBehavior)
+    update_server: UpdateServer = field(default_factory=UpdateServer)
+    dns_responder: DNSResponder = field(default_factory=DNSResponder)
+    failover: Failover = field(default_factory=Failover)
+    leadership: Leadership = field(default_factory=Leadership)
+    providers: dict[str, Provider] = field(default_factory=dict)
+
+    @property
+    def enabled_providers(self) -> dict[str, Provider]:
+        return {name: provider for name, provider in self.providers.items() if provider.enabled}
+
+class _Reader:
+    """Thin wrapper over `ConfigParser` that reports errors with their section and option."""
+    def __init__(self, parser: configparser.ConfigParser) -> None:
+        self.parser = parser
+
+    def fail(self, section: str, option: str, message: str) -> ConfigError:
+        return ConfigError(f"[{section}] {option}: {message}")
+
+    def raw(self, section: str, option: str, fallback: Optional[str] = None) -> Optional[str]:
+        if section != self.parser.default_section and not self.parser.has_section(section):
+            return fallback
+        return self.parser.get(section, option, fallback=fallback)
+
+    def own(self, section: str, option: str) -> Optional[str]:
+        """Like `raw`, but None when the value is only inherited from the default section ([General])."""
+        val = self.raw(section, option)
+        if section != self.parser.default_section and val == self.parser.defaults().get(self.parser.optionxform(option)):
+            return None
+        return val
+
+    def string(self, section: str, option: str, fallback: str) -> str:
+        val = self.raw(section, option)
+        return fallback if val is None else val.strip().strip('"\',')
+
+    def boolean(self, section: str, option: str, fallback: bool) -> bool:
+        val = self.raw(section, option)
+        if val is None:
+            return fallback
+        parsed = parse(val)
+        if not isinstance(parsed, bool):
+            raise self.fail(section, option, f"expected True or False, got {val!r}")
+        return parsed
+
+    def integer(self, section: str, option: str, fallback: int, minimum: Optional[int] = None) -> int:
+        val = self.raw(section, option)
+        if val is None:
+            return fallback
+        parsed = parse(val)
+        if isinstance(parsed, bool) or not isinstance(parsed, int):
+            raise self.fail(section, option, f"expected an integer, got {val!r}")
+        if minimum is not None and parsed < minimum:
+            raise self.fail(section, option, f"must be >= {minimum}, got {parsed}")
+        return parsed
+
+    def strings(self, section: str, option: str, fallback: tuple[str, ...]) -> tuple[str, ...]:
+        val = self.raw(section, option)
+        return fallback if val is None else tuple(str(v) for v in parse_list(val))
+
+    def schedule(self, section: str, option: str) -> tuple[str, ...]:
+        # A section without its own schedule uses [General]'s through the scheduler, not as a copy
+        val = self.own(section, option)
+        if val is None or not val.strip().strip("',"):
+            return ()
+        try:
+            specs = json.loads(val.strip().strip("',"))
+        except json.JSONDecodeError as e:
+            raise self.fail(section, option, f"invalid JSON ({e.msg} at column {e.colno})") from None
+        if not isinstance(specs, list) or not all(isinstance(spec, str) for spec in specs):
+            raise self.fail(section, option, 'expected a JSON list such as ["0 */6 * * *", "07:30", "@every 900"]')
+        for spec in specs:
+            try:
+                parse_trigger(spec).next_after(datetime.now())
+            except ValueError as e:
+                raise self.fail(section, option, str(e)) from None
+        return tuple(specs)
+
+    def choices(self, section: str, option: str, fallback: tuple[str, ...], allowed: tuple[str, ...]) -> tuple[str, ...]:
+        val = self.raw(section, option)
+        if val is None:
+            return fallback
+        items = tuple(str(v) for v in parse_list(val))
+        unknown = [v for v in items if v not in allowed]
+        if unknown:
+            raise self.fail(section, option, f"unknown value(s) {unknown}, expected any of {list(allowed)}")
+        return items
+
+def _general(reader: _Reader) -> General:
+    section = 'General'
+    query_api = reader.string(section, 'queryAPI', 'ipify')
+    if not _query_api(query_api):
+        raise reader.fail(section, 'queryAPI', f"unsupported API {query_api!r}, expected 'ipify', 'icanhazip' or 'ifconfig[?path]'")
+
+    mode = reader.string(section, 'mode', 'intervalTime')
+    if mode not in MODES:
+        raise reader.fail(section, 'mode', f"unsupported mode {mode!r}, expected any of {list(MODES)}")
+
+    prefix_length = reader.integer(section, 'prefixLength', 64, minimum=0)
+    if prefix_length > 128:
+        raise reader.fail(section, 'prefixLength', f"must be <= 128, got {prefix_length}")
+
+    return General(
+        query_api=query_api,
+        mode=mode,
+        sync_time=reader.integer(section, 'syncTime', 36000, minimum=0),
+        schedule=reader.schedule(section, 'schedule'),
+        node_id=reader.string(section, 'nodeId', ''),
+        phase_spread=reader.boolean(section, 'phaseSpread', False),
+        jitter=reader.integer(section, 'jitter', 0, minimum=0),
+        startup_delay=reader.integer(section, 'startupDelay', 0, minimum=0),
+        shutdown_grace=reader.integer(section, 'shutdownGrace', 10, minimum=0),
+        prefix_length=prefix_length,
+        dump_capacity=reader.integer(section, 'dumpCapacity', 1048576, minimum=0),
+        history=reader.boolean(section, 'history', True),
+        workers=reader.integer(section, 'workers', 0, minimum=0),
+        shard_concurrency=reader.integer(section, 'shardConcurrency', 4, minimum=1),
+        dns_cache=reader.boolean(section, 'dnsCache', True),
+        prewarm=reader.integer(section, 'prewarm', 5, minimum=0),
+        sources=_sources(reader, section)
+    )
+
+def _query_api(query_api: str) -> bool:
+    return query_api in ('ipify', 'icanhazip') or query_api.split('?')[0] == 'ifconfig'
+
+def _sources(reader: _Reader, section: str) -> dict[str, Source]:
+    val = reader.raw(section, 'sources')
+    try:
+        sources = json.loads(val.strip().strip("',")) if val else {}
+    except json.JSONDecodeError as e:
+        raise reader.fail(section, 'sources', f"invalid JSON ({e.msg} at column {e.colno})") from None
+    if not isinstance(sources, dict):
+        raise reader.fail(section, 'sources', 'expected a JSON object such as {"wan2": {"queryAPI": "icanhazip", "address": "192.0.2.10"}}')
+
+    parsed: dict[str, Source] = {}
+    for name, options in sources.items():
+        if not name or not name.isidentifier():
+            raise reader.fail(section, 'sources', f"source name {name!r} must be a plain identifier")
+        if not isinstance(options, dict) or set(options) - {'queryAPI', 'address', 'interface'}:
+            raise reader.fail(section, 'sources', f"source {name!r} accepts only 'queryAPI', 'address' and 'interface'")
+        source = Source(name, str(options.get('queryAPI', 'ipify')), str(options.get('address') or ''), str(options.get('interface') or ''))
+        if not _query_api(source.query_api):
+            raise reader.fail(section, 'sources', f"source {name!r} has unsupported API {source.query_api!r}")
+        if source.address:
+            try:
+                ip_address(source.address)
+            except ValueError as e:
+                raise reader.fail(section, 'sources', f"source {name!r}: {e}") from None
+        parsed[name] = source
+    return parsed
+
+def _logging(reader: _Reader) -> Logging:
+    section = 'Logging'
+    return Logging(
+        enabled_file=reader.boolean(section, 'enabledFile', True),
+        console_included=reader.choices(section, 'consoleIncluded', ('normal',), LOG_LEVELS),
+        log_included=reader.choices(section, 'logIncluded', ('normal', 'debug'), LOG_LEVELS),
+        split_log=reader.boolean(section, 'splitLog', True)
+    )
+
+def _learning_behavior(reader: _Reader) -> LearningBehavior:
+    section = 'LearningBehavior'
+    time_shift: Optional[int] = 300
+    val = reader.raw(section, 'timeShift')
+    if val is not None:
+        items = parse_list(val)
+        if len(items) != 2 or not isinstance(items[0], bool) or isinstance(items[1], bool) or not isinstance(items[1], int):
+            raise reader.fail(section, 'timeShift', f"expected [True|False, seconds], got {val.strip()!r}")
+        time_shift = items[1] if items[0] else None
+
+    adaptive_interval: Optional[tuple[int, int]] = None
+    val = reader.raw(section, 'adaptiveInterval')
+    if val is not None:
+        items = parse_list(val)
+        if len(items) != 3 or not isinstance(items[0], bool) or not all(isinstance(i, int) and not isinstance(i, bool) and i > 0 for i in items[1:]):
+            raise reader.fail(section, 'adaptiveInterval', f"expected [True|False, minimum seconds, maximum seconds], got {val.strip()!r}")
+        if items[1] > items[2]:
+            raise reader.fail(section, 'adaptiveInterval', f"minimum {items[1]} is greater than maximum {items[2]}")
+        adaptive_interval = (items[1], items[2]) if items[0] else None
+
+    settle_window: Optional[tuple[int, int]] = None
+    val = reader.raw(section, 'settleWindow')
+    if val is not None:
+        items = parse_list(val)
+        if len(items) != 3 or not isinstance(items[0], bool) or not all(isinstance(i, int) and not isinstance(i, bool) and i >= 0 for i in items[1:]):
+            raise reader.fail(section, 'settleWindow', f"expected [True|False, seconds, observations], got {val.strip()!r}")
+        settle_window = (items[1], items[2]) if items[0] else None
+    return LearningBehavior(time_shift=time_shift, adaptive_interval=adaptive_interval, settle_window=settle_window)
+
+def _update_server(reader: _Reader) -> UpdateServer:
+    section = 'UpdateServer'
+    if not reader.boolean(section, 'enabled', False):
+        return UpdateServer()
+
+    options = UpdateServer(
+        enabled=True,
+        listen=reader.string(section, 'listen', '0.0.0.0'),
+        port=reader.integer(section, 'port', 8245, minimum=1),
+        username=reader.string(section, 'username', ''),
+        password=reader.string(section, 'password', '')
+    )
+    for option in ('username', 'password'):
+        if not getattr(options, option):
+            raise reader.fail(section, option, "is required when the update server is enabled")
+    return options
+
+def _dns_responder(reader: _Reader) -> DNSResponder:
+    section = 'DNSResponder'
+    if not reader.boolean(section, 'enabled', False):
+        return DNSResponder()
+
+    return DNSResponder(
+        enabled=True,
+        listen=reader.string(section, 'listen', '0.0.0.0'),
+        port=reader.integer(section, 'port', 53, minimum=1),
+        ttl=reader.integer(section, 'ttl', 60, minimum=0)
+    )
+
+def _leadership(reader: _Reader) -> Leadership:
+    section = 'Leadership'
+    if not reader.boolean(section, 'enabled', False):
+        return Leadership()
+
+    path = reader.string(section, 'path', '')
+    if not path:
+        raise reader.fail(section, 'path', 'a lease file on storage shared by the replicas is required')
+    return Leadership(
+        enabled=True,
+        path=path,
+        duration=reader.integer(section, 'duration', 30, minimum=3)
+    )
+
+def _failover(reader: _Reader) -> Failover:
+    section = 'Failover'
+    if not reader.boolean(section, 'enabled', False):
+        return Failover()
+
+    probe = reader.string(section, 'probe', 'tcp:443')
+    if not re.match(r'^(tcp|http):\d{1,5}(/\S*)?$', probe):
+        raise reader.fail(section, 'probe', f"expected 'tcp:<port>' or 'http:<port>[/path]', got {probe!r}")
+
+    val = reader.raw(section, 'records')
+    try:
+        records = json.loads(val.strip().strip("',")) if val else {}
+    except json.JSONDecodeError as e:
+        raise reader.fail(section, 'records', f"invalid JSON ({e.msg} at column {e.colno})") from None
+    if not isinstance(records, dict) or not records:
+        raise reader.fail(section, 'records', 'expected a JSON object such as {"www.example.com": ["203.0.113.1", "198.51.100.7"]}')
+    for name, candidates in records.items():
+        if '.' not in name or not isinstance(candidates, list) or not candidates:
+            raise reader.fail(section, 'records', f"{name!r} must be a fully qualified domain name with a list of candidate addresses")
+        try:
+            versions = {ip_address(candidate).version for candidate in candidates}
+        except ValueError as e:
+            raise reader.fail(section, 'records', f"invalid candidate for {name!r}: {e}") from None
+        if len(versions) > 1:
+            raise reader.fail(section, 'records', f"candidates for {name!r} mix IPv4 and IPv6 addresses")
+
+    return Failover(
+        enabled=True,
+        records={name: tuple(candidates) for name, candidates in records.items()},
+        probe=probe,
+        interval=reader.integer(section, 'interval', 10, minimum=1),
+        timeout=reader.integer(section, 'timeout', 2, minimum=1),
+        rise=reader.integer(section, 'rise', 2, minimum=1),
+        fall=reader.integer(section, 'fall', 3, minimum=1)
+    )
+
+def _fqdn(reader: _Reader, section: str, general: General) -> tuple[dict[str, list[str]], dict[str, int], dict[tuple[str, str], str]]:
+    val = reader.raw(section, 'FQDN')
+    if val is None:
+        raise reader.fail(section, 'FQDN', "is required when the provider is enabled")
+    try:
+        raw = json.loads(val.strip().strip("',"))
+    except json.JSONDecodeError as e:
+        raise reader.fail(section, 'FQDN', f"invalid JSON ({e.msg} at column {e.colno})") from None
+
+    if not isinstance(raw, dict):
+        raise reader.fail(section, 'FQDN', 'expected a JSON object such as {"A": ["example.com"]}')
+    fqdn: dict[str, list[str]] = {}
+    suffixes: dict[str, int] = {}
+    sources: dict[tuple[str, str], str] = {}
+    for key, names in raw.items():
+        # "A@wan2" takes the addresses of the named source instead of the default one
+        record_type, _, source = key.partition('@')
+        if record_type not in RECORD_TYPES:
+            raise reader.fail(section, 'FQDN', f"unsupported record type {record_type!r}, expected any of {list(RECORD_TYPES)}")
+        if source and source not in general.sources:
+            raise reader.fail(section, 'FQDN', f"{key!r} refers to unknown source {source!r}, expected any of {list(general.sources)}")
+        # AAAA may map hostnames to interface identifiers combined with the detected prefix (null keeps the detected address)
+        if record_type == 'AAAA' and isinstance(names, dict):
+            for name, suffix in names.items():
+                if suffix is None: continue
+                try:
+                    suffixes[name] = parse_suffix(suffix, general.prefix_length)
+                except (ValueError, TypeError) as e:
+                    raise reader.fail(section, 'FQDN', f"invalid AAAA suffix for {name!r}: {e}") from None
+            names = list(names)
+        if not isinstance(names, list) or not all(isinstance(n, str) and '.' in n for n in names):
+            raise reader.fail(section, 'FQDN', f"{key} must be a list of fully qualified domain names, or for AAAA an object of names and suffixes")
+        fqdn.setdefault(record_type, []).extend(names)
+        if source:
+            sources.update({(name, record_type): source for name in names})
+    return fqdn, suffixes, sources
+
+def _provider(reader: _Reader, section: str, general: General) -> Provider:
+    enabled = reader.boolean(section, 'enabled', False)
+    if not enabled:
+        return Provider(name=section)
+
+    user_field = 'email' if section == 'CloudFlare' else 'username'
+    credentials = {
+        user_field: reader.string(section, user_field, ''),
+        "password": reader.string(section, 'password', '')
+    }
+    for option, value in credentials.items():
+        if not value:
+            raise reader.fail(section, option, "is required when the provider is enabled")
+
+    fqdn, suffixes, sources = _fqdn(reader, section, general)
+    return Provider(
+        name=section,
+        enabled=enabled,
+        credentials=credentials,
+        fqdn=fqdn,
+        suffixes=suffixes,
+        sources=sources,
+        cache_timeout=reader.integer(section, 'cacheTimeout', 172800, minimum=-1),
+        cache_persistent=reader.boolean(section, 'cachePersistent', False),
+        negative_cache_timeout=reader.integer(section, 'negativeCacheTimeout', 3600, minimum=-1),
+        audit_interval=reader.integer(section, 'auditInterval', 0, minimum=0),
+        audit_repair=reader.boolean(section, 'auditRepair', False),
+        request_timeout=reader.integer(section, 'requestTimeout', 10, minimum=1),
+        deadline=reader.integer(section, 'deadline', 60, minimum=0),
+        verify_authoritative=reader.boolean(section, 'verifyAuthoritative', False),
+        nameservers=reader.strings(section, 'nameservers', ()),
+        schedule=reader.schedule(section, 'schedule')
+    )
+
+def compile_config(path: str) -> Config:
+    """
+    Parse and validate `config.ini` into a `Config` without touching any snapshot.
+
+    Args:
+        path (str): Path of the INI file.
+
+    Returns:
+        Config: The validated configuration.
+
+    Raises:
+        ConfigError: If the file is missing, cannot be parsed, or holds an invalid value.
+    """
+    # [General] is the default section, as it has always been: its options are visible from every section.
+    parser = configparser.ConfigParser(allow_no_value=True, default_section='General')
+    try:
+        with open(path, 'rt') as f:
+            parser.read_file(f)
+    except FileNotFoundError:
+        raise ConfigError(f"Configuration file '{path}' not found. Copy it from 'templates/config.ini' first.") from None
+    except configparser.Error as e:
+        raise ConfigError(f"Configuration file '{path}' is malformed: {e}") from None
+
+    known = ('General', 'Logging', 'LearningBehavior', 'UpdateServer', 'DNSResponder', 'Failover', 'Leadership', *PROVIDERS)
+    unknown = [s for s in parser.sections() if s not in known]
+    if unknown:
+        raise ConfigError(f"Unknown section(s) {unknown} in '{path}', expected any of {list(known)}")
+
+    reader = _Reader(parser)
+    general = _general(reader)
+    return Config(
+        path=path,
+        general=general,
+        logging=_logging(reader),
+        learning_behavior=_learning_behavior(reader),
+        update_server=_update_server(reader),
+        dns_responder=_dns_responder(reader),
+        failover=_failover(reader),
+        leadership=_leadership(reader),
+        providers={name: _provider(reader, name, general) for name in PROVIDERS}
+    )
+
+def snapshot_path(path: str) -> str:
+    """Location of the precompiled snapshot that sits next to `path`."""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, f'.{filename}.snapshot')
+
+def _trusted(stat: os.stat_result) -> bool:
+    """Whether a snapshot with `stat` was written by this user and is private to it (POSIX only)."""
+    return hasattr(os, 'getuid') and stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+def load(path: str = 'config.ini', use_snapshot: bool = True) -> Config:
+    """
+    Load the configuration, reusing the precompiled snapshot when `config.ini` has not changed.
+
+    The snapshot is keyed on the file's modification time and size, so editing `config.ini`
+    always triggers a full parse and validation. Since unpickling can run code, a snapshot is only
+    read when it belongs to the current user and nobody else can read or write it; any other is
+    ignored and rewritten. Failing to write the snapshot is not fatal.
+
+    Args:
+        path (str): Path of the INI file. Defaults to 'config.ini'.
+        use_snapshot (bool): Whether to read and refresh the snapshot. Defaults to True.
+
+    Returns:
+        Config: The validated configuration.
+
+    Raises:
+        ConfigError: If the configuration is invalid.
+
+    Example Usage:
+    --------------
+    ```
+    config = load('config.ini')
+    print(config.general.mode)
+    # => intervalTime
+    ```
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise ConfigError(f"Configuration file '{path}' not found. Copy it from 'templates/config.ini' first.") from None
+
+    key = (SNAPSHOT_VERSION, stat.st_mtime_ns, stat.st_size)
+    cached = snapshot_path(path)
+    if use_snapshot:
+        try:
+            with open(cached, 'rb') as f:
+                if not _trusted(os.fstat(f.fileno())):
+                    raise PermissionError(f"'{cached}' is not owner-only, not loading it")
+                snapshot_key, config = pickle.load(f)
+            if snapshot_key == key and isinstance(config, Config):
+                return config
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError):
+            pass
+
+    config = compile_config(path)
+    if use_snapshot:
+        try:
+            # The snapshot holds API tokens and passwords: owner-only, like config.ini should be
+            fd = os.open(f'{cached}.tmp', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f'{cached}.tmp', cached)
+        except OSError:
+            pass
+    return config
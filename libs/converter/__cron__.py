@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from typing import Protocol, Union
+
+class Trigger(Protocol):
+    def next_after(self, moment: datetime) -> datetime: ...
+
+class CronExpression:
+    """
+    Standard five-field cron expression: `minute hour day-of-month month day-of-week`.
+
+    Fields accept `*`, numbers, ranges (`1-5`), steps (`*/15`, `0-30/10`) and comma lists.
+    Day-of-week runs 0-7 with both 0 and 7 meaning Sunday. When both day fields are
+    restricted, a day matches if either does, as in classic cron.
+    """
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+    MACROS = {
+        '@hourly': '0 * * * *',
+        '@daily': '0 0 * * *',
+        '@midnight': '0 0 * * *',
+        '@weekly': '0 0 * * 0',
+        '@monthly': '0 0 1 * *'
+    }
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        fields = self.MACROS.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields, got {len(fields)}.")
+
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self.__field__(field, low, high) for field, (low, high) in zip(fields, self.FIELDS)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def __field__(self, field: str, low: int, high: int) -> set[int]:
+        values: set[int] = set()
+        for part in field.split(','):
+            span, _, step = part.partition('/')
+            try:
+                if span == '*':
+                    start, end = low, high
+                elif '-' in span:
+                    start, end = (int(v) for v in span.split('-', 1))
+                else:
+                    start = end = int(span)
+                    if step:
+                        end = high
+                stride = int(step) if step else 1
+            except ValueError:
+                raise ValueError(f"Cron field '{field}' is not a number, range or step in '{self.expression}'.") from None
+            if not (low <= start <= end <= high) or stride < 1:
+                raise ValueError(f"Cron field '{field}' out of range {low}-{high} in '{self.expression}'.")
+            values.update(range(start, end + 1, stride))
+        return values
+
+    def __day_matches__(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        The first matching minute strictly after `moment`.
+
+        Args:
+            moment (datetime): Reference time.
+
+        Returns:
+            datetime: The next fire time.
+
+        Raises:
+            ValueError: If nothing matches within five years (e.g. `0 0 31 2 *`).
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+        while candidate <= limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self.__day_matches__(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never fires.")
+
+    def __repr__(self) -> str:
+        return f"cron({self.expression})"
+
+class TimeOfDay:
+    """A fixed wall-clock time, every day."""
+    def __init__(self, hour: int, minute: int = 0, second: int = 0) -> None:
+        if not (0 <= hour < 24 and 0 <= minute < 60 and 0 <= second < 60):
+            raise ValueError(f"Invalid time of day {hour:02d}:{minute:02d}:{second:02d}.")
+        self.hour, self.minute, self.second = hour, minute, second
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(hour=self.hour, minute=self.minute, second=self.second, microsecond=0)
+        return candidate if candidate > moment else candidate + timedelta(days=1)
+
+    def __repr__(self) -> str:
+        return f"{self.hour:02d}:{self.minute:02d}:{self.second:02d}"
+
+class Every:
+    """A fixed interval, in seconds."""
+    def __init__(self, seconds: Union[int, float]) -> None:
+        if seconds <= 0:
+            raise ValueError(f"Interval must be positive, got {seconds}.")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def __repr__(self) -> str:
+        return f"@every {self.seconds}"
+
+def parse_trigger(spec: str) -> Trigger:
+    """
+    Parse a schedule entry.
+
+    Accepted forms:
+    - `HH:MM` or `HH:MM:SS`: every day at that time.
+    - `@every <seconds>`: a fixed interval.
+    - `@hourly`, `@daily`, `@weekly`, `@monthly` or a five-field cron expression.
+
+    Args:
+        spec (str): The schedule entry.
+
+    Returns:
+        Trigger: An object whose `next_after(datetime)` returns the next fire time.
+
+    Raises:
+        ValueError: If the entry cannot be parsed.
+    """
+    spec = spec.strip()
+    if spec.startswith('@every'):
+        try:
+            return Every(float(spec.split(None, 1)[1]))
+        except (IndexError, ValueError):
+            raise ValueError(f"Expected '@every <seconds>', got '{spec}'.") from None
+    if ':' in spec and ' ' not in spec:
+        try:
+            return TimeOfDay(*(int(part) for part in spec.split(':')))
+        except (TypeError, ValueError):
+            raise ValueError(f"Expected 'HH:MM[:SS]', got '{spec}'.") from None
+    return CronExpression(spec)
@@ -1 +1,2 @@
-from libs.converter.__time__ import unixConvert
\ No newline at end of file
+from .__time__ import unixConvert
+from .__cron__ import CronExpression, Every, TimeOfDay, Trigger, parse_trigger
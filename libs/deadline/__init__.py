@@ -0,0 +1,61 @@
+import contextlib
+import contextvars
+import time
+from typing import Iterator, Optional
+
+# Monotonic time by which the current provider sync must be done, None when unbounded.
+# Context variables are copied into `asyncio.to_thread` workers, so the deadline set around
+# a provider task reaches every HTTP call its blocking client makes.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar('deadline', default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """Raised before starting a request once the surrounding deadline has passed."""
+
+@contextlib.contextmanager
+def scope(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Bound everything run inside the block (and threads started from it) to `seconds`.
+
+    A nested scope can only tighten the deadline, never extend it.
+
+    Args:
+        seconds (float, optional): Time budget, None or 0 for no limit.
+
+    Example Usage:
+        with deadline.scope(30):
+            await asyncio.to_thread(instance.A, fqdn, content)
+    """
+    current = _deadline.get()
+    if seconds:
+        moment = time.monotonic() + seconds
+        current = moment if current is None else min(current, moment)
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, None when there is none."""
+    current = _deadline.get()
+    return None if current is None else current - time.monotonic()
+
+def timeout(default: float) -> float:
+    """
+    Timeout for the next blocking request: `default`, shortened to what is left of the deadline.
+
+    Args:
+        default (float): The client's own per-request timeout, in seconds.
+
+    Returns:
+        float: Seconds the request may take.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed.
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded, request not sent.")
+    return min(default, left)
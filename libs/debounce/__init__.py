@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional, Self
+from libs.logging import Logger
+
+class Debounce:
+    """
+    Settle window for a changing value, such as the detected public address.
+
+    A new value is *confirmed* once it has been observed `observations` times in a row,
+    or has stayed the same for `seconds`, whichever comes first. Observing a different
+    value restarts the window and cancels the pending confirmation timer.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        seconds (float): Time a value must stay unchanged, 0 to disable.
+        observations (int): Consecutive observations that confirm a value, 0 to disable.
+        candidate (Any): The value waiting for confirmation, None when nothing is pending.
+    """
+    integrate = 'Debounce'
+
+    def __init__(self: Self, seconds: float = 0, observations: int = 0) -> None:
+        self.seconds = seconds
+        self.observations = observations
+        self.candidate: Any = None
+        self.since: float = 0.0
+        self.count: int = 0
+        self.timer: Optional[asyncio.Task] = None
+
+    def observe(self: Self, value: Any, moment: Optional[float] = None) -> bool:
+        """
+        Record an observation of `value`.
+
+        Args:
+            value (Any): The observed value.
+            moment (float, optional): Monotonic time of the observation. Defaults to now.
+
+        Returns:
+            bool: True when `value` is confirmed and should be acted upon.
+        """
+        now = moment if moment is not None else time.monotonic()
+        if value != self.candidate:
+            if self.candidate is not None:
+                logger.log(f"Pending value {self.candidate} superseded by {value}, restarting settle window.")
+            self.reset()
+            self.candidate, self.since, self.count = value, now, 0
+        self.count += 1
+
+        confirmed = (
+            (self.observations > 0 and self.count >= self.observations)
+            or (self.seconds > 0 and now - self.since >= self.seconds)
+            or (self.observations <= 0 and self.seconds <= 0)
+        )
+        if confirmed:
+            self.reset()
+        return confirmed
+
+    def remaining(self: Self, moment: Optional[float] = None) -> float:
+        """Seconds until the pending value is confirmed by time alone."""
+        now = moment if moment is not None else time.monotonic()
+        return max(0.0, self.since + self.seconds - now)
+
+    def arm(self: Self, callback: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Call `callback` as soon as the time window of the pending value elapses, so the
+        confirmation does not wait for the next regular cycle. Does nothing without a time window.
+
+        Args:
+            callback (Callable): Coroutine function re-checking the value.
+        """
+        if self.seconds <= 0 or self.candidate is None or (self.timer and not self.timer.done()):
+            return
+
+        async def __fire__() -> None:
+            await asyncio.sleep(self.remaining())
+            await callback()
+        self.timer = asyncio.create_task(__fire__())
+
+    def reset(self: Self) -> None:
+        """Forget the pending value and cancel its timer (unless the timer is the caller)."""
+        if self.timer and not self.timer.done() and self.timer is not asyncio.current_task():
+            self.timer.cancel()
+        self.timer = None
+        self.candidate = None
+        self.count = 0
+
+logger = Logger(Debounce.integrate)
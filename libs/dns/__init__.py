@@ -0,0 +1,153 @@
+import struct
+from ipaddress import IPv4Address, IPv6Address, ip_address
+from typing import NamedTuple, Optional, Union
+
+# Record types and classes this program speaks; anything else is passed through as a number.
+TYPES = {'A': 1, 'NS': 2, 'SOA': 6, 'AAAA': 28, 'OPT': 41, 'ANY': 255}
+CLASS_IN = 1
+
+# Header flag bits.
+QR, AA, TC, RD, RA = 0x8000, 0x0400, 0x0200, 0x0100, 0x0080
+RCODE_NOERROR, RCODE_FORMERR, RCODE_SERVFAIL, RCODE_NXDOMAIN, RCODE_NOTIMP, RCODE_REFUSED = 0, 1, 2, 3, 4, 5
+
+# Advertised EDNS UDP payload size, the DNS Flag Day 2020 recommendation.
+EDNS_PAYLOAD = 1232
+
+class Record(NamedTuple):
+    name: str
+    type: int
+    ttl: int
+    rdata: bytes
+
+    @property
+    def address(self) -> Optional[Union[IPv4Address, IPv6Address]]:
+        """The address held by an A/AAAA record, `None` for other types."""
+        if self.type == TYPES['A'] and len(self.rdata) == 4 or self.type == TYPES['AAAA'] and len(self.rdata) == 16:
+            return ip_address(self.rdata)
+        return None
+
+class Message(NamedTuple):
+    id: int
+    flags: int
+    questions: list[tuple[str, int, int]]
+    answers: list[Record]
+
+    @property
+    def rcode(self) -> int:
+        return self.flags & 0x000F
+
+def encode_name(name: str) -> bytes:
+    """
+    Encode a domain name into uncompressed wire format.
+
+    Args:
+        name (str): The domain name, with or without the trailing dot.
+
+    Returns:
+        bytes: Length-prefixed labels terminated by the root label.
+
+    Raises:
+        ValueError: If a label is empty or longer than 63 octets.
+    """
+    wire = bytearray()
+    for label in name.rstrip('.').split('.') if name.rstrip('.') else []:
+        raw = label.encode('idna') if not label.isascii() else label.encode()
+        if not 0 < len(raw) < 64:
+            raise ValueError(f"Invalid label '{label}' in domain name '{name}'.")
+        wire += bytes((len(raw),)) + raw
+    return bytes(wire + b'\x00')
+
+def decode_name(data: bytes, offset: int) -> tuple[str, int]:
+    """
+    Decode a possibly compressed domain name starting at `offset`.
+
+    Args:
+        data (bytes): The whole DNS message.
+        offset (int): Where the name starts.
+
+    Returns:
+        tuple[str, int]: The lower-cased name without trailing dot and the offset just past it.
+
+    Raises:
+        ValueError: If the name runs past the message or loops through compression pointers.
+    """
+    labels: list[str] = []
+    end: Optional[int] = None
+    for _ in range(128):
+        if offset >= len(data):
+            raise ValueError("Domain name runs past the end of the message.")
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(data):
+                raise ValueError("Truncated compression pointer.")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        if length == 0:
+            return ".".join(labels).lower(), end if end is not None else offset + 1
+        labels.append(data[offset + 1:offset + 1 + length].decode('ascii', 'replace'))
+        offset += 1 + length
+    raise ValueError("Too many labels or compression loop in domain name.")
+
+def build_query(qid: int, name: str, qtype: int, recursion: bool = False, edns: bool = True) -> bytes:
+    """
+    Build a single-question query.
+
+    Args:
+        qid (int): The 16-bit message ID.
+        name (str): The name to query.
+        qtype (int): The record type, see `TYPES`.
+        recursion (bool): Whether to set the RD bit. Authoritative queries leave it off. Defaults to False.
+        edns (bool): Whether to add an EDNS OPT record advertising `EDNS_PAYLOAD`. Defaults to True.
+
+    Returns:
+        bytes: The query in wire format.
+    """
+    header = struct.pack('!HHHHHH', qid, RD if recursion else 0, 1, 0, 0, 1 if edns else 0)
+    question = encode_name(name) + struct.pack('!HH', qtype, CLASS_IN)
+    opt = b'\x00' + struct.pack('!HHIH', TYPES['OPT'], EDNS_PAYLOAD, 0, 0) if edns else b''
+    return header + question + opt
+
+def parse_message(data: bytes) -> Message:
+    """
+    Parse the header, questions and answer section of a DNS message.
+
+    Authority and additional sections are not needed by this program and are skipped.
+
+    Args:
+        data (bytes): The message in wire format.
+
+    Returns:
+        Message: The parsed message.
+
+    Raises:
+        ValueError: If the message is truncated or malformed.
+    """
+    if len(data) < 12:
+        raise ValueError("DNS message shorter than its header.")
+    qid, flags, qdcount, ancount, _, _ = struct.unpack_from('!HHHHHH', data)
+
+    offset = 12
+    questions: list[tuple[str, int, int]] = []
+    for _ in range(qdcount):
+        name, offset = decode_name(data, offset)
+        if offset + 4 > len(data):
+            raise ValueError("Truncated question section.")
+        qtype, qclass = struct.unpack_from('!HH', data, offset)
+        questions.append((name, qtype, qclass))
+        offset += 4
+
+    answers: list[Record] = []
+    for _ in range(ancount):
+        name, offset = decode_name(data, offset)
+        if offset + 10 > len(data):
+            raise ValueError("Truncated resource record.")
+        rtype, _, ttl, rdlength = struct.unpack_from('!HHIH', data, offset)
+        offset += 10
+        if offset + rdlength > len(data):
+            raise ValueError("Truncated resource record data.")
+        answers.append(Record(name, rtype, ttl, data[offset:offset + rdlength]))
+        offset += rdlength
+
+    return Message(qid, flags, questions, answers)
@@ -0,0 +1,210 @@
+import asyncio
+import struct
+from ipaddress import ip_address
+from typing import Any, Optional, Self
+from libs.prefix import combine
+from libs.dns import AA, QR, RCODE_FORMERR, RCODE_NOTIMP, RCODE_REFUSED, TYPES, CLASS_IN, encode_name
+from libs.logging import Logger
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, responder: 'DNSResponder') -> None:
+        self.responder = responder
+        self.transport: Optional[asyncio.DatagramTransport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        response = self.responder.answer(data)
+        if response and self.transport:
+            self.transport.sendto(response, addr)
+
+class DNSResponder:
+    """
+    Authoritative responder for the hostnames listed in the FQDN lists, served from memory.
+
+    Every (name, type) answer is precompiled to wire format and only rebuilt when the
+    published address changes, so answering a query is a dictionary lookup plus a few
+    byte concatenations. Names outside the table are refused; known names asked for
+    any type without data (MX, TXT, or an A/AAAA not published) get an empty NOERROR answer.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        names (dict[str, set[str]]): Record type mapped to the hostnames served for it.
+        suffixes (dict[str, int]): AAAA hostnames answered with the published prefix plus their own interface identifier.
+        sources (dict[tuple[str, str], str]): (hostname, record type) answered with the addresses of a named address source.
+        pinned (dict[str, str]): Hostnames answered with a fixed address (e.g. a failover candidate) instead of the published one.
+        ttl (int): TTL of every answer, in seconds.
+    """
+    integrate = 'DNSResponder'
+
+    def __init__(self: Self, names: dict[str, list[str]], ttl: int = 60, host: str = '0.0.0.0', port: int = 53, suffixes: Optional[dict[str, int]] = None, prefix_length: int = 64, sources: Optional[dict[tuple[str, str], str]] = None) -> None:
+        """
+        Initialize the responder.
+
+        Args:
+            names (dict[str, list[str]]): Record type ('A' or 'AAAA') mapped to the hostnames to answer for.
+            ttl (int): TTL of every answer, in seconds. Defaults to 60.
+            host (str): Address to listen on. Defaults to '0.0.0.0'.
+            port (int): UDP and TCP port to listen on. Defaults to 53.
+            suffixes (dict[str, int], optional): AAAA hostnames mapped to the interface identifier combined with the published prefix.
+            prefix_length (int): Length of the delegated IPv6 prefix. Defaults to 64.
+            sources (dict[tuple[str, str], str], optional): (hostname, record type) mapped to the named address source it follows.
+        """
+        self.names = {record_type: {n.rstrip('.').lower() for n in fqdns} for record_type, fqdns in names.items()}
+        self.suffixes = {n.rstrip('.').lower(): suffix for n, suffix in (suffixes or {}).items()}
+        self.prefix_length = prefix_length
+        self.sources = {(n.rstrip('.').lower(), record_type): source for (n, record_type), source in (sources or {}).items()}
+        self.pinned: dict[str, str] = {}
+        self.ttl = ttl
+        self.host = host
+        self.port = port
+
+        self.addresses: dict[str, Optional[str]] = {'A': None, 'AAAA': None}
+        # Named source mapped to its addresses in the same form as `addresses`.
+        self.source_addresses: dict[str, dict[str, Optional[str]]] = {}
+        # (lower-cased wire name, qtype) -> precompiled answer record, `b''` for known names without data.
+        self.table: dict[tuple[bytes, int], bytes] = {}
+        # Lower-cased wire names served, answered NODATA for every type not in `table`.
+        self.known: frozenset[bytes] = frozenset()
+        self.servers: list[asyncio.AbstractServer] = []
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.__compile__()
+
+    def __compile__(self: Self) -> None:
+        table: dict[tuple[bytes, int], bytes] = {}
+        for fqdn in set().union(*self.names.values()) if self.names else ():
+            wire = encode_name(fqdn)
+            for record_type in ('A', 'AAAA'):
+                source = self.sources.get((fqdn, record_type))
+                content = (self.source_addresses.get(source) or {}).get(record_type) if source else self.addresses.get(record_type)
+                pinned = self.pinned.get(fqdn)
+                if pinned and (ip_address(pinned).version == 4) == (record_type == 'A'):
+                    content = pinned
+                elif content and record_type == 'AAAA' and fqdn in self.suffixes:
+                    content = combine(content, self.prefix_length, self.suffixes[fqdn])
+                if content and fqdn in self.names.get(record_type, ()):
+                    rdata = ip_address(content).packed
+                    # Owner name is a compression pointer to the question at offset 12.
+                    table[(wire, TYPES[record_type])] = b'\xc0\x0c' + struct.pack('!HHIH', TYPES[record_type], CLASS_IN, self.ttl, len(rdata)) + rdata
+                else:
+                    table[(wire, TYPES[record_type])] = b''
+        self.table = table
+        self.known = frozenset(wire for wire, _ in table)
+
+    def update(self: Self, inet_address_object: dict[str, Any]) -> bool:
+        """
+        Publish new addresses, recompiling the answers only when something changed.
+
+        Args:
+            inet_address_object (dict[str, Any]): Detected addresses keyed `Iv4` and `Iv6`, plus `sources` for named sources.
+
+        Returns:
+            bool: True if the answers were rebuilt.
+        """
+        addresses = {'A': inet_address_object.get('Iv4'), 'AAAA': inet_address_object.get('Iv6')}
+        source_addresses = {
+            name: {'A': found.get('Iv4'), 'AAAA': found.get('Iv6')}
+            for name, found in (inet_address_object.get('sources') or {}).items()
+        }
+        if addresses == self.addresses and source_addresses == self.source_addresses:
+            return False
+        self.addresses = addresses
+        self.source_addresses = source_addresses
+        self.__compile__()
+        logger.log(f"Serving A {addresses['A'] or '-'} / AAAA {addresses['AAAA'] or '-'} for {len(self.known)} names.")
+        return True
+
+    def pin(self: Self, addresses: dict[str, str]) -> None:
+        """
+        Answer the given hostnames with fixed addresses from now on, recompiling once.
+
+        Args:
+            addresses (dict[str, str]): Hostname mapped to the address to answer with.
+        """
+        if not addresses:
+            return
+        self.pinned.update({fqdn.rstrip('.').lower(): content for fqdn, content in addresses.items()})
+        self.__compile__()
+
+    def addresses_object(self: Self) -> dict[str, Optional[str]]:
+        """The published addresses in `inet_address_object` form, named sources included."""
+        addresses: dict[str, Any] = {"Iv4": self.addresses['A'], "Iv6": self.addresses['AAAA']}
+        if self.source_addresses:
+            addresses["sources"] = {name: {"Iv4": found['A'], "Iv6": found['AAAA']} for name, found in self.source_addresses.items()}
+        return addresses
+
+    def answer(self: Self, query: bytes) -> Optional[bytes]:
+        """
+        Build the response to a single query message.
+
+        Args:
+            query (bytes): The query in wire format.
+
+        Returns:
+            Optional[bytes]: The response, or None when the message must be dropped.
+        """
+        if len(query) < 12:
+            return None
+        qid, flags, qdcount = struct.unpack_from('!HHH', query)
+        if flags & QR:
+            return None
+
+        # Flags echoed back: opcode and RD, with QR and AA set.
+        base = (flags & 0x7900) | QR | AA
+        if qdcount != 1 or flags & 0x7800:
+            return struct.pack('!HHHHHH', qid, base | (RCODE_NOTIMP if flags & 0x7800 else RCODE_FORMERR), 0, 0, 0, 0)
+
+        # Walk the uncompressed question name.
+        offset = 12
+        while offset < len(query) and query[offset]:
+            if query[offset] & 0xC0:
+                return struct.pack('!HHHHHH', qid, base | RCODE_FORMERR, 0, 0, 0, 0)
+            offset += query[offset] + 1
+        end = offset + 5
+        if end > len(query):
+            return struct.pack('!HHHHHH', qid, base | RCODE_FORMERR, 0, 0, 0, 0)
+
+        question = query[12:end]
+        qtype, qclass = struct.unpack_from('!HH', query, offset + 1)
+        name = query[12:offset + 1].lower()
+        record = self.table.get((name, qtype))
+        if record is None and name in self.known:
+            record = b''  # NODATA: the name exists, just not with this type
+
+        if record is None or qclass != CLASS_IN:
+            return struct.pack('!HHHHHH', qid, base | RCODE_REFUSED, 1, 0, 0, 0) + question
+        return struct.pack('!HHHHHH', qid, base, 1, 1 if record else 0, 0, 0) + question + record
+
+    async def __tcp_client__(self: Self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                length = struct.unpack('!H', await asyncio.wait_for(reader.readexactly(2), timeout=10))[0]
+                response = self.answer(await asyncio.wait_for(reader.readexactly(length), timeout=10))
+                if response is None:
+                    break
+                writer.write(struct.pack('!H', len(response)) + response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self: Self) -> None:
+        """Bind the UDP and TCP listeners."""
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(lambda: _UDPProtocol(self), local_addr=(self.host, self.port))
+        self.servers.append(await asyncio.start_server(self.__tcp_client__, self.host, self.port))
+        logger.log(f"Answering DNS queries on {self.host}:{self.port} (UDP/TCP).")
+
+    async def serve(self: Self) -> None:
+        """Bind the listeners and serve until cancelled."""
+        if not self.servers:
+            await self.start()
+        try:
+            await asyncio.gather(*(server.serve_forever() for server in self.servers))
+        finally:
+            if self.transport:
+                self.transport.close()
+
+logger = Logger(DNSResponder.integrate)
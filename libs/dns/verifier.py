@@ -0,0 +1,160 @@
+import asyncio
+import random
+import socket
+from ipaddress import ip_address
+from typing import Iterable, Optional, Self
+from libs.dns import AA, CLASS_IN, QR, TYPES, Message, RCODE_NOERROR, build_query, parse_message
+from libs.logging import Logger
+
+class _Lookup:
+    """One record's query, shared by the servers it was sent to: the first authoritative answer wins."""
+    __slots__ = ('future', 'waiting')
+
+    def __init__(self, future: asyncio.Future, waiting: int = 0) -> None:
+        self.future = future
+        self.waiting = waiting
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    """Datagram endpoint that matches responses to outstanding queries by (server, message ID)."""
+    def __init__(self) -> None:
+        self.pending: dict[tuple[str, int], tuple[_Lookup, str, int]] = {}
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        try:
+            message = parse_message(data)
+        except ValueError:
+            return
+        entry = self.pending.pop((ip_address(addr[0]).compressed, message.id), None)
+        if entry is None or entry[0].future.done():
+            return
+        lookup, name, qtype = entry
+        # Only an authoritative NOERROR response to the question asked may decide; anything
+        # else counts as this server's answer being unusable, and the other servers are awaited.
+        if message.flags & QR and message.flags & AA and message.rcode == RCODE_NOERROR and message.questions[:1] == [(name, qtype, CLASS_IN)]:
+            lookup.future.set_result(message)
+            return
+        logger.verbose(f"Unusable answer for {name} from {addr[0]} (flags {message.flags:#06x}).")
+        lookup.waiting -= 1
+        if lookup.waiting <= 0:
+            lookup.future.set_result(None)
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP errors are not attributable to a single query, the timeout takes care of them.
+        pass
+
+class AuthoritativeVerifier:
+    """
+    Check record contents by asking the zone's authoritative nameservers directly.
+
+    Queries go out as raw UDP datagrams with EDNS and without recursion, all at once over
+    one socket per address family. A record is *verified* only when an authoritative server
+    answers with exactly the desired address; a mismatch, an error or a timeout leaves the
+    decision to the provider's API.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        fanout (int): How many nameserver addresses each record is sent to.
+        timeout (float): Seconds to wait for an answer before giving up on a server.
+        port (int): Port nameservers listen on. Override to test against a local stub server.
+    """
+    integrate = 'AuthoritativeVerifier'
+    fanout = 2
+
+    def __init__(self: Self, timeout: float = 1.0, port: int = 53) -> None:
+        self.timeout = timeout
+        self.port = port
+        self.addresses: dict[str, list[str]] = {}
+
+    async def __addresses__(self: Self, nameservers: Iterable[str]) -> list[str]:
+        """Resolve nameserver hostnames to addresses once; literal addresses pass through."""
+        loop = asyncio.get_running_loop()
+        resolved: list[str] = []
+        for nameserver in nameservers:
+            if nameserver not in self.addresses:
+                try:
+                    self.addresses[nameserver] = [ip_address(nameserver).compressed]
+                except ValueError:
+                    try:
+                        infos = await loop.getaddrinfo(nameserver, self.port, type=socket.SOCK_DGRAM)
+                        self.addresses[nameserver] = list(dict.fromkeys(ip_address(info[4][0]).compressed for info in infos))
+                    except OSError as e:
+                        logger.log(f"Unable to resolve nameserver '{nameserver}': {e}", 30)
+                        continue
+            resolved.extend(self.addresses[nameserver])
+        return resolved
+
+    async def verify_many(self: Self, records: list[tuple[str, str, str, list[str]]]) -> dict[tuple[str, str], bool]:
+        """
+        Verify many records concurrently.
+
+        Every record is sent to up to `fanout` nameserver addresses; the first authoritative
+        (AA) NOERROR answer echoing the question decides. Referrals, REFUSED or SERVFAIL answers
+        and mismatched questions are ignored while the other servers are awaited.
+
+        Args:
+            records (list[tuple[str, str, str, list[str]]]): `(fqdn, record type, desired content, nameservers)` tuples.
+
+        Returns:
+            dict[tuple[str, str], bool]: `(fqdn, record type)` mapped to True when the authoritative
+            answer already equals the desired content.
+        """
+        loop = asyncio.get_running_loop()
+        protocols: dict[int, tuple[asyncio.DatagramTransport, _QueryProtocol]] = {}
+        lookups: list[tuple[tuple[str, str], str, asyncio.Future]] = []
+
+        try:
+            for fqdn, record_type, content, nameservers in records:
+                servers = await self.__addresses__(nameservers)
+                if not servers:
+                    continue
+
+                # Every server shares the record's lookup, so the first authoritative answer wins.
+                future = loop.create_future()
+                lookup = _Lookup(future, len(servers[:self.fanout]))
+                for server in servers[:self.fanout]:
+                    family = socket.AF_INET6 if ip_address(server).version == 6 else socket.AF_INET
+                    if family not in protocols:
+                        protocols[family] = await loop.create_datagram_endpoint(_QueryProtocol, family=family)
+                    transport, protocol = protocols[family]
+
+                    qid = random.getrandbits(16)
+                    while (server, qid) in protocol.pending:
+                        qid = random.getrandbits(16)
+                    protocol.pending[(server, qid)] = (lookup, fqdn.lower().rstrip('.'), TYPES[record_type])
+                    transport.sendto(build_query(qid, fqdn, TYPES[record_type]), (server, self.port))
+                lookups.append(((fqdn, record_type), content, future))
+
+            done, _ = await asyncio.wait([future for _, _, future in lookups], timeout=self.timeout) if lookups else (set(), set())
+
+            results: dict[tuple[str, str], bool] = {(fqdn, record_type): False for fqdn, record_type, _, _ in records}
+            for key, content, future in lookups:
+                if future not in done:
+                    logger.verbose(f"Authoritative query for {key[0]} ({key[1]}) timed out.")
+                    continue
+                message: Optional[Message] = future.result()
+                if message is None:
+                    logger.verbose(f"No authoritative answer for {key[0]} ({key[1]}).")
+                    continue
+                addresses = {record.address for record in message.answers if record.type == TYPES[key[1]]}
+                results[key] = message.rcode == RCODE_NOERROR and addresses == {ip_address(content)}
+            return results
+        finally:
+            for transport, _ in protocols.values():
+                transport.close()
+
+    async def verify(self: Self, fqdn: str, record_type: str, content: str, nameservers: list[str]) -> bool:
+        """
+        Verify a single record, see `verify_many`.
+
+        Args:
+            fqdn (str): The fully qualified domain name.
+            record_type (str): 'A' or 'AAAA'.
+            content (str): The desired address.
+            nameservers (list[str]): Authoritative nameserver hostnames or addresses.
+
+        Returns:
+            bool: True when the authoritative answer already equals `content`.
+        """
+        return (await self.verify_many([(fqdn, record_type, content, nameservers)]))[(fqdn, record_type)]
+
+logger = Logger(AuthoritativeVerifier.integrate)
@@ -0,0 +1,149 @@
+import asyncio
+import re
+import time
+from ipaddress import ip_address
+from typing import Awaitable, Callable, NoReturn, Optional, Self
+from libs.logging import Logger
+
+# `tcp:<port>` opens a connection, `http:<port>[/path]` also expects a 2xx or 3xx status line.
+PROBE_SPEC = re.compile(r'^(tcp|http):(\d{1,5})(/\S*)?$')
+
+class _Health:
+    __slots__ = ('up', 'streak', 'checked')
+
+    def __init__(self, up: bool = False) -> None:
+        self.up = up
+        # Consecutive probe results contradicting `up`; the state flips once this reaches rise/fall.
+        self.streak = 0
+        self.checked = time.monotonic()
+
+class Failover:
+    """
+    Point each record at its best healthy candidate address.
+
+    Candidates are listed in order of preference. Every `interval` seconds the union of all
+    candidates is probed concurrently, so records sharing candidates cost one probe per address.
+    A candidate's state only flips after `rise` consecutive successful probes (down to up) or
+    `fall` consecutive failures (up to down), so a flaky origin does not make records flap.
+    Candidates start down, so at startup too a candidate needs `rise` successes before a record
+    moves to it. When no candidate is up, a record keeps its current address.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        records (dict[str, tuple[str, ...]]): Hostname mapped to its candidate addresses, preferred first.
+        health (dict[str, _Health]): Cached probe state per candidate address.
+        selected (dict[str, str]): Hostname mapped to the address it currently points at.
+    """
+    integrate = 'Failover'
+
+    def __init__(self: Self, records: dict[str, tuple[str, ...]], probe: str = 'tcp:443', interval: float = 10, timeout: float = 2, rise: int = 2, fall: int = 3, concurrency: int = 256) -> None:
+        """
+        Initialize the failover controller.
+
+        Args:
+            records (dict[str, tuple[str, ...]]): Hostname mapped to its candidate addresses, preferred first.
+            probe (str): Health check, `tcp:<port>` or `http:<port>[/path]`. Defaults to 'tcp:443'.
+            interval (float): Seconds between probe rounds. Defaults to 10.
+            timeout (float): Seconds a single probe may take. Defaults to 2.
+            rise (int): Consecutive successes that bring a candidate up. Defaults to 2.
+            fall (int): Consecutive failures that take a candidate down. Defaults to 3.
+            concurrency (int): Largest number of probes in flight at once. Defaults to 256.
+        """
+        match = PROBE_SPEC.match(probe)
+        if not match:
+            raise ValueError(f"Invalid probe {probe!r}, expected 'tcp:<port>' or 'http:<port>[/path]'.")
+        self.scheme, self.port, self.path = match.group(1), int(match.group(2)), match.group(3) or '/'
+
+        self.records = records
+        self.interval = interval
+        self.timeout = timeout
+        self.rise = rise
+        self.fall = fall
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.health: dict[str, _Health] = {}
+        self.selected: dict[str, str] = {}
+
+    async def __probe__(self: Self, address: str) -> bool:
+        """Run one health check against `address`."""
+        async with self.semaphore:
+            writer = None
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(address, self.port), self.timeout)
+                if self.scheme == 'tcp':
+                    return True
+                host = f"[{address}]" if ip_address(address).version == 6 else address
+                writer.write(f"GET {self.path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\nUser-Agent: FlexiDNS-Failover\r\n\r\n".encode())
+                await writer.drain()
+                status = (await asyncio.wait_for(reader.readline(), self.timeout)).split()
+                return len(status) >= 2 and status[1][:1] in (b'2', b'3')
+            except (OSError, asyncio.TimeoutError, ValueError):
+                return False
+            finally:
+                if writer:
+                    writer.close()
+
+    def __record__(self: Self, address: str, ok: bool) -> None:
+        """Fold one probe result into the candidate's state, applying rise/fall hysteresis."""
+        # Unknown candidates start down: one lucky probe of a down origin must not move a record
+        health = self.health.setdefault(address, _Health())
+        health.checked = time.monotonic()
+        if ok == health.up:
+            health.streak = 0
+            return
+        health.streak += 1
+        if health.streak >= (self.rise if ok else self.fall):
+            health.up, health.streak = ok, 0
+            logger.log(f"Candidate {address} is now {'up' if ok else 'down'}.", 20 if ok else 30)
+
+    def choose(self: Self, fqdn: str) -> Optional[str]:
+        """The preferred candidate of `fqdn` that is up, or its current address when none is."""
+        for candidate in self.records[fqdn]:
+            health = self.health.get(candidate)
+            if health and health.up:
+                return candidate
+        return self.selected.get(fqdn)
+
+    async def check(self: Self) -> dict[str, str]:
+        """
+        Probe every distinct candidate once and re-select each record.
+
+        Returns:
+            dict[str, str]: Hostnames whose selected address changed, mapped to the new address.
+        """
+        candidates = {candidate for addresses in self.records.values() for candidate in addresses}
+        ordered = sorted(candidates)
+        for address, ok in zip(ordered, await asyncio.gather(*(self.__probe__(address) for address in ordered))):
+            self.__record__(address, ok)
+
+        changes: dict[str, str] = {}
+        for fqdn in self.records:
+            choice = self.choose(fqdn)
+            if choice is None:
+                logger.log(f"No healthy candidate for '{fqdn}' yet, leaving the record untouched.", 30)
+            elif choice != self.selected.get(fqdn):
+                changes[fqdn] = choice
+        return changes
+
+    async def run(self: Self, callback: Callable[[dict[str, str]], Awaitable[dict[str, bool]]]) -> NoReturn:
+        """
+        Probe forever, calling `callback(changes)` whenever records need to move.
+
+        Args:
+            callback (Callable): Coroutine function publishing the changes, returning which hostnames succeeded.
+                A hostname that failed keeps its previous selection and is retried on the next round.
+        """
+        logger.log(f"Probing {len({c for a in self.records.values() for c in a})} candidates for {len(self.records)} records every {self.interval}s ({self.scheme}:{self.port}).")
+        while True:
+            started = time.monotonic()
+            try:
+                changes = await self.check()
+                if changes:
+                    for fqdn, ok in (await callback(changes)).items():
+                        if ok:
+                            logger.log(f"'{fqdn}' now points at {changes[fqdn]}.")
+                            self.selected[fqdn] = changes[fqdn]
+            except Exception as e:
+                logger.exception(e)
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+logger = Logger(Failover.integrate)
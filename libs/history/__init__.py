@@ -0,0 +1,328 @@
+import atexit
+import bisect
+import ipaddress
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Iterator, NamedTuple, Optional, Self
+from libs.api import UpdateSkipped
+from libs.logging import Logger
+
+# Fixed-size record: epoch timestamp, kind, outcome, source id, hostname id, IPv4, IPv6 (zeroes when absent).
+RECORD = struct.Struct('<dBBHI4s16s4x')
+# Sparse index entry: timestamp of every `stride`-th record and its record number.
+INDEX = struct.Struct('<dQ')
+
+KIND_ADDRESS, KIND_A, KIND_AAAA = 0, 1, 2
+OUTCOMES = ('updated', 'failed', 'timeout', 'skipped')
+NO_HOST = 0xFFFFFFFF
+
+class Entry(NamedTuple):
+    moment: float
+    # 'address' for a detected address, 'A'/'AAAA' for a record update.
+    kind: str
+    source: str
+    host: Optional[str]
+    ipv4: Optional[str]
+    ipv6: Optional[str]
+    outcome: Optional[str]
+
+class History:
+    """
+    Compact append-only history of detected addresses and record update outcomes.
+
+    Every event is one fixed-size binary record, hostnames and source names are interned in a
+    small side file, and a sparse index keeps the timestamp of every `stride`-th record. Range
+    queries bisect the index and read the log through `mmap`, so years of history are answered
+    in milliseconds without loading the log into memory. Timestamps never go backwards in the
+    log (a wall-clock step back is clamped), which keeps the index sorted.
+    `address` and `outcome` only queue the event: a single background thread appends whatever
+    is queued in one batch, opening each file once per batch, so a large fan-out of outcomes
+    costs the event loop no disk I/O. Queries wait briefly for queued events first.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        path (str): The record log; the index and name table sit next to it.
+        count (int): Number of records in the log.
+    """
+    integrate = 'History'
+    stride = 1024
+    # Longest wait of a query for queued events, and of the exit-time flush, in seconds.
+    wait = 1.0
+    exit_timeout = 5.0
+
+    def __init__(self: Self, path: str = '.dumps/history.log') -> None:
+        """
+        Open (or create) the history at `path`, dropping a torn record left by a crash.
+
+        Args:
+            path (str): Location of the record log. Defaults to '.dumps/history.log'.
+        """
+        self.path = path
+        self.index_path = f'{path}.idx'
+        self.names_path = f'{path}.names'
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+        try:
+            with open(self.names_path, 'r') as f:
+                self.names: list[str] = f.read().splitlines()
+        except FileNotFoundError:
+            self.names = []
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        self.count = size // RECORD.size
+        if size % RECORD.size:
+            with open(path, 'r+b') as f:
+                f.truncate(self.count * RECORD.size)
+        self.index = self.__load_index__()
+        self.last = self.__read__(self.count - 1).moment if self.count else 0.0
+
+        self.queue: queue.Queue[tuple[int, int, str, Optional[str], Optional[str], Optional[str], float]] = queue.Queue()
+        self.writer: Optional[threading.Thread] = None
+        self.starting = threading.Lock()
+        atexit.register(self.__close__)
+
+    def __load_index__(self: Self) -> list[tuple[float, int]]:
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        entries = [INDEX.unpack_from(data, i) for i in range(0, len(data) - len(data) % INDEX.size, INDEX.size)]
+        return [(moment, number) for moment, number in entries if number < self.count]
+
+    def __name_id__(self: Self, name: str, added: list[str]) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+            added.append(name)
+        return self.ids[name]
+
+    def __append__(self: Self, kind: int, outcome: int, source: str, host: Optional[str], ipv4: Optional[str], ipv6: Optional[str], moment: Optional[float]) -> None:
+        self.queue.put((kind, outcome, source, host, ipv4, ipv6, moment if moment is not None else time.time()))
+        # Not `lock`, which the writer holds during disk I/O
+        with self.starting:
+            if self.writer is None or not self.writer.is_alive():
+                self.writer = threading.Thread(target=self.__drain__, name=self.integrate, daemon=True)
+                self.writer.start()
+
+    def __drain__(self: Self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.__write__(batch)
+            except Exception as e:
+                logger.log(f"Failed to append {len(batch)} history event(s): {e}", 30)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def __write__(self: Self, batch: list[tuple[int, int, str, Optional[str], Optional[str], Optional[str], float]]) -> None:
+        """Append `batch` to the log, its name table and sparse index, opening each file once."""
+        with self.lock:
+            records, index, added = [], [], []
+            for kind, outcome, source, host, ipv4, ipv6, moment in batch:
+                moment = max(moment, self.last)
+                try:
+                    addresses = (ipaddress.IPv4Address(ipv4).packed if ipv4 else bytes(4), ipaddress.IPv6Address(ipv6).packed if ipv6 else bytes(16))
+                except ValueError as e:
+                    logger.log(f"History event for '{host or source}' dropped: {e}", 30)
+                    continue
+                number = self.count + len(records)
+                records.append(RECORD.pack(
+                    moment, kind, outcome, self.__name_id__(source, added),
+                    NO_HOST if host is None else self.__name_id__(host.lower(), added), *addresses
+                ))
+                if number % self.stride == 0:
+                    index.append((moment, number))
+                self.last = moment
+
+            # Names first and the log last, so a record never refers to a name that is not on disk
+            if added:
+                with open(self.names_path, 'a') as f:
+                    f.write(''.join(f'{name}\n' for name in added))
+            if index:
+                with open(self.index_path, 'ab') as f:
+                    f.write(b''.join(INDEX.pack(*entry) for entry in index))
+                self.index.extend(index)
+            if records:
+                with open(self.path, 'ab') as f:
+                    f.write(b''.join(records))
+                self.count += len(records)
+
+    def flush(self: Self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued event has been written, or until `timeout` seconds have passed.
+
+        Returns:
+            bool: Whether the queue was drained.
+        """
+        with self.queue.all_tasks_done:
+            return self.queue.all_tasks_done.wait_for(lambda: not self.queue.unfinished_tasks, timeout)
+
+    def __close__(self: Self) -> None:
+        if not self.flush(self.exit_timeout):
+            logger.log(f"{self.queue.unfinished_tasks} history event(s) still queued after {self.exit_timeout}s at exit, dropped.", 30)
+
+    def address(self: Self, source: str, ipv4: Optional[str], ipv6: Optional[str], moment: Optional[float] = None) -> None:
+        """
+        Record the addresses detected through `source`.
+
+        Args:
+            source (str): The address source name, '' for the default one.
+            ipv4 (str, optional): The detected IPv4 address.
+            ipv6 (str, optional): The detected IPv6 address.
+            moment (float, optional): Epoch time of the detection. Defaults to now.
+        """
+        self.__append__(KIND_ADDRESS, 0, source, None, ipv4, ipv6, moment)
+
+    def outcome(self: Self, fqdn: str, record: str, content: str, error: Optional[BaseException], source: str = '', moment: Optional[float] = None) -> None:
+        """
+        Record the outcome of updating one record.
+
+        Args:
+            fqdn (str): The hostname.
+            record (str): 'A' or 'AAAA'.
+            content (str): The address the record was updated to.
+            error (BaseException, optional): Why the update failed or was skipped, None when it succeeded.
+            source (str): The provider that published it. Defaults to ''.
+            moment (float, optional): Epoch time of the outcome. Defaults to now.
+        """
+        outcome = 0 if error is None else 2 if isinstance(error, TimeoutError) else 3 if isinstance(error, UpdateSkipped) else 1
+        self.__append__(
+            KIND_A if record == 'A' else KIND_AAAA, outcome, source, fqdn,
+            content if record == 'A' else None, content if record == 'AAAA' else None, moment
+        )
+
+    def __decode__(self: Self, data: bytes, offset: int) -> Entry:
+        moment, kind, outcome, source, host, ipv4, ipv6 = RECORD.unpack_from(data, offset)
+        return Entry(
+            moment,
+            ('address', 'A', 'AAAA')[kind],
+            self.names[source] if source < len(self.names) else '',
+            None if host == NO_HOST or host >= len(self.names) else self.names[host],
+            str(ipaddress.IPv4Address(ipv4)) if any(ipv4) else None,
+            str(ipaddress.IPv6Address(ipv6)) if any(ipv6) else None,
+            None if kind == KIND_ADDRESS else OUTCOMES[outcome]
+        )
+
+    def __read__(self: Self, number: int) -> Entry:
+        with open(self.path, 'rb') as f:
+            f.seek(number * RECORD.size)
+            return self.__decode__(f.read(RECORD.size), 0)
+
+    def __scan__(self: Self, start: int, stop: int, step: int = 1) -> Iterator[Entry]:
+        """Decode records `start`..`stop` (exclusive) through a read-only memory map."""
+        if self.count == 0:
+            return
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for number in range(start, stop, step):
+                yield self.__decode__(data, number * RECORD.size)
+
+    def __first_after__(self: Self, moment: float) -> int:
+        """Number of the first record later than `moment`, found from the sparse index."""
+        block = max(0, bisect.bisect_right(self.index, (moment, float('inf'))) - 1)
+        number = self.index[block][1] if self.index else 0
+        for entry in self.__scan__(number, self.count):
+            if entry.moment > moment:
+                return number
+            number += 1
+        return self.count
+
+    def range(self: Self, since: float = 0.0, until: float = float('inf')) -> Iterator[Entry]:
+        """
+        Every entry with `since <= moment <= until`, oldest first.
+
+        Args:
+            since (float): Epoch start of the range. Defaults to the beginning.
+            until (float): Epoch end of the range. Defaults to now.
+        """
+        self.flush(self.wait)
+        start = self.__first_after__(since - 1e-6) if since > 0 else 0
+        for entry in self.__scan__(start, self.count):
+            if entry.moment > until:
+                break
+            yield entry
+
+    def at(self: Self, moment: float, source: str = '') -> Optional[Entry]:
+        """
+        The address detected through `source` that was current at `moment`.
+
+        Returns:
+            Entry | None: The latest address entry not later than `moment`, None if there is none.
+        """
+        self.flush(self.wait)
+        for entry in self.__scan__(self.__first_after__(moment) - 1, -1, -1):
+            if entry.kind == 'address' and entry.source == source:
+                return entry
+        return None
+
+    def tail(self: Self, limit: int = 10) -> list[Entry]:
+        """The last `limit` entries, newest first."""
+        self.flush(self.wait)
+        return list(self.__scan__(self.count - 1, max(-1, self.count - 1 - limit), -1))
+
+    def latest(self: Self, keys: set[tuple[str, str, str]]) -> dict[tuple[str, str, str], Entry]:
+        """
+        The most recent outcome of each `(fqdn, record type, provider)` in `keys`.
+
+        The log is read backwards and the scan stops as soon as every key has been seen, so
+        recently updated records are found without touching older history.
+
+        Args:
+            keys (set[tuple[str, str, str]]): Lower-cased hostname, 'A' or 'AAAA', and provider name.
+
+        Returns:
+            dict[tuple[str, str, str], Entry]: The keys that have an outcome, mapped to the latest one.
+        """
+        self.flush(self.wait)
+        wanted = {key for key in keys if key[0] in self.ids}
+        found: dict[tuple[str, str, str], Entry] = {}
+        if not wanted:
+            return found
+        for entry in self.__scan__(self.count - 1, -1, -1):
+            key = (entry.host, entry.kind, entry.source)
+            if key in wanted and key not in found:
+                found[key] = entry
+                if len(found) == len(wanted):
+                    break
+        return found
+
+    def changes(self: Self, fqdn: str, limit: int = 1) -> list[Entry]:
+        """
+        The most recent successful updates of `fqdn`, newest first.
+
+        Args:
+            fqdn (str): The hostname.
+            limit (int): Largest number of entries to return. Defaults to 1.
+
+        Example Usage:
+        --------------
+        ```
+        history = History('.dumps/history.log')
+        for entry in history.changes('example.com', 3):
+            print(time.ctime(entry.moment), entry.kind, entry.ipv4 or entry.ipv6, entry.source)
+        ```
+        """
+        self.flush(self.wait)
+        host, found = fqdn.lower(), []
+        if host not in self.ids:
+            return found
+        for entry in self.__scan__(self.count - 1, -1, -1):
+            if entry.host == host and entry.outcome == 'updated':
+                found.append(entry)
+                if len(found) >= limit:
+                    break
+        return found
+
+logger = Logger(History.integrate)
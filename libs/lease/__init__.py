@@ -0,0 +1,156 @@
+import asyncio
+import fcntl
+import json
+import os
+import time
+from typing import Awaitable, Callable, NoReturn, Optional, Self
+from libs.logging import Logger
+
+class Lease:
+    """
+    Leader election between replicas sharing a lease file.
+
+    The lease file records the holder, a fencing token and the wall-clock expiry. A replica takes
+    the lease when it is free or expired, and the token grows by one on every change of holder,
+    so a former leader that was paused past its lease can tell it has been fenced off. The
+    read-modify-write runs under an exclusive `flock` on `path.lock`; replicas on different hosts
+    need storage where `flock` is honoured and clocks that agree to well within `duration`.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        path (str): The lease file on shared storage.
+        holder (str): This replica's identity.
+        duration (float): Seconds a lease lasts unless renewed.
+        token (int): Fencing token of the lease held, 0 while standing by.
+    """
+    integrate = 'Lease'
+
+    def __init__(self: Self, path: str, holder: str, duration: float = 30) -> None:
+        """
+        Initialize the lease.
+
+        Args:
+            path (str): Location of the lease file on shared storage.
+            holder (str): Identity of this replica, unique among the replicas.
+            duration (float): Seconds a lease lasts unless renewed. Defaults to 30.
+        """
+        self.path = path
+        self.holder = holder
+        self.duration = duration
+        self.token = 0
+        # Local monotonic time the held lease is trusted until, a little before it really expires.
+        self.valid_until = 0.0
+
+    def __read__(self: Self) -> dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def __write__(self: Self, lease: dict) -> None:
+        with open(f'{self.path}.{self.holder}.tmp', 'w') as f:
+            json.dump(lease, f)
+        os.replace(f'{self.path}.{self.holder}.tmp', self.path)
+
+    def peek(self: Self) -> dict:
+        """The lease as recorded in the file (`holder`, `token`, `expires`), without contending for it."""
+        return self.__read__()
+
+    @property
+    def leading(self: Self) -> bool:
+        """Whether this replica holds an unexpired lease."""
+        return self.token > 0 and time.monotonic() < self.valid_until
+
+    def remaining(self: Self) -> float:
+        """Seconds the held lease can still be trusted, 0 while standing by."""
+        return max(0.0, self.valid_until - time.monotonic()) if self.token else 0.0
+
+    def acquire(self: Self) -> bool:
+        """
+        Take the lease if it is free or expired, or renew it if it is already ours. Blocking.
+
+        Returns:
+            bool: Whether this replica now leads.
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        started = time.monotonic()
+        with open(f'{self.path}.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                lease, now = self.__read__(), time.time()
+                ours = lease.get('holder') == self.holder and lease.get('token') == self.token and self.token > 0
+                if not ours and lease.get('expires', 0) > now:
+                    self.token, self.valid_until = 0, 0.0
+                    return False
+                token = self.token if ours else int(lease.get('token', 0)) + 1
+                self.__write__({'holder': self.holder, 'token': token, 'expires': now + self.duration})
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        if not ours:
+            logger.log(f"'{self.holder}' took the lease with fencing token {token}.")
+        self.token = token
+        # Trust the lease for a tenth less than its duration, measured from before the write.
+        self.valid_until = started + self.duration * 0.9
+        return True
+
+    def fence(self: Self) -> bool:
+        """
+        Confirm against the lease file that the lease is still ours and renew it, just before a write. Blocking.
+
+        Renewing here gives the write a full lease period even when nothing else renews (one-time sync).
+
+        Returns:
+            bool: False if this replica does not lead or another replica has taken over.
+        """
+        if not self.leading:
+            return False
+        if not self.acquire():
+            lease = self.__read__()
+            logger.log(f"Lease taken over by '{lease.get('holder')}' (token {lease.get('token')}), standing down.", 30)
+            return False
+        return True
+
+    def release(self: Self) -> None:
+        """Give the lease up so a standby takes over on its next attempt rather than after expiry. Blocking."""
+        if not self.token:
+            return
+        with open(f'{self.path}.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                lease = self.__read__()
+                if lease.get('holder') == self.holder and lease.get('token') == self.token:
+                    self.__write__({**lease, 'expires': 0})
+                    logger.log(f"'{self.holder}' released the lease.")
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        self.token, self.valid_until = 0, 0.0
+
+    async def run(self: Self, lead: Callable[[bool], Awaitable[None]], follow: Callable[[], Awaitable[None]]) -> NoReturn:
+        """
+        Renew or contend for the lease three times per `duration`, forever.
+
+        A standby therefore takes over within one lease period of the leader going silent.
+
+        Args:
+            lead (Callable): Coroutine function run after every round this replica leads;
+                its argument is True on the round it took over.
+            follow (Callable): Coroutine function run after every round this replica stands by.
+        """
+        logger.log(f"Contending for the lease at {self.path} as '{self.holder}' ({self.duration}s).")
+        while True:
+            started = time.monotonic()
+            try:
+                was_leading = self.leading
+                if await asyncio.to_thread(self.acquire):
+                    await lead(not was_leading)
+                else:
+                    if was_leading:
+                        logger.log(f"'{self.holder}' lost the lease, standing by.", 30)
+                    await follow()
+            except Exception as e:
+                logger.exception(e)
+            await asyncio.sleep(max(0.0, self.duration / 3 - (time.monotonic() - started)))
+
+logger = Logger(Lease.integrate)
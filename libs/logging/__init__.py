@@ -1,21 +1,10 @@
 import logging
 from logging.handlers import RotatingFileHandler
 import os
-from typing import Self, Union, Any
+from typing import Optional, Self, Union, Any
 import traceback
-from configparser import ConfigParser
 
-def parse(val: str) -> Union[bool, int, float, str]:
-    val = val.strip()
-    val_lower = val.lower()
-    if val_lower == 'true':
-        return True
-    if val_lower == 'false':
-        return False
-    try:
-        return float(val) if '.' in val else int(val)
-    except ValueError:
-        return val
+from libs import config as settings
 
 class Logger:
     def __init__(self, integrate: str):
@@ -37,13 +26,12 @@ def setup_handler(handler, level_includes, level_map):
             break
     return handler
 
-def init_logging():
-    config = ConfigParser(allow_no_value=False, default_section='General')
-    config.read('config.ini')
-    
-    enabled = config.getboolean('Logging', 'enabledFile')
-    log_include = config.get('Logging', 'logIncluded').strip('",[] ').replace(' ', '').split(',')
-    console_include = config.get('Logging', 'consoleIncluded').strip('",[] ').replace(' ', '').split(',')
+def init_logging(options: Optional[settings.Logging] = None):
+    options = options or settings.load().logging
+
+    enabled = options.enabled_file
+    log_include = options.log_included
+    console_include = options.console_included
 
     logger = logging.getLogger("UDIP")
     logger.setLevel(logging.DEBUG)
@@ -69,7 +57,7 @@ def init_logging():
         log_directory = 'logs'
         os.makedirs(log_directory, exist_ok=True)
         
-        if config.getboolean('Logging', 'splitLog', fallback=True):
+        if options.split_log:
             for level_name, level in level_map.items():
                 if level_name in log_include:
                     handler = RotatingFileHandler(
@@ -0,0 +1,64 @@
+from ipaddress import IPv6Address
+from typing import Union
+
+def parse_suffix(suffix: str, prefix_length: int) -> int:
+    """
+    Parse an interface identifier such as `::1a2b` into the integer added to the prefix.
+
+    Args:
+        suffix (str): The host part, written as an IPv6 address.
+        prefix_length (int): Length of the delegated prefix, 0 to 128.
+
+    Returns:
+        int: The suffix as an integer.
+
+    Raises:
+        ValueError: If `suffix` is not an IPv6 address or does not fit below the prefix.
+    """
+    value = int(IPv6Address(suffix))
+    if value >> (128 - prefix_length):
+        raise ValueError(f"suffix {suffix!r} overlaps the /{prefix_length} prefix")
+    return value
+
+def mask(prefix_length: int) -> int:
+    """Integer netmask of a /`prefix_length` IPv6 prefix."""
+    return ((1 << 128) - 1) ^ ((1 << (128 - prefix_length)) - 1)
+
+def combine(address: Union[str, IPv6Address], prefix_length: int, suffix: int) -> str:
+    """
+    Replace the host part of `address` with `suffix`.
+
+    Args:
+        address (str | IPv6Address): Any address inside the delegated prefix, e.g. the detected public one.
+        prefix_length (int): Length of the delegated prefix.
+        suffix (int): Interface identifier, see `parse_suffix`.
+
+    Returns:
+        str: The derived address in compressed form.
+
+    Example Usage:
+    --------------
+    ```
+    combine('2001:db8:1:2::99', 56, parse_suffix('::1a2b', 56))
+    # => '2001:db8:1::1a2b'
+    ```
+    """
+    return str(IPv6Address((int(IPv6Address(address)) & mask(prefix_length)) | suffix))
+
+def expand(address: Union[str, IPv6Address], prefix_length: int, suffixes: dict[str, int]) -> dict[str, list[str]]:
+    """
+    Derive every host's address from one detected prefix, grouped for batched updates.
+
+    Args:
+        address (str | IPv6Address): Any address inside the delegated prefix.
+        prefix_length (int): Length of the delegated prefix.
+        suffixes (dict[str, int]): Hostname mapped to its interface identifier.
+
+    Returns:
+        dict[str, list[str]]: Derived address mapped to the hostnames that receive it.
+    """
+    network = int(IPv6Address(address)) & mask(prefix_length)
+    targets: dict[str, list[str]] = {}
+    for fqdn, suffix in suffixes.items():
+        targets.setdefault(str(IPv6Address(network | suffix)), []).append(fqdn)
+    return targets
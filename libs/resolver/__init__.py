@@ -0,0 +1,161 @@
+import random
+import socket
+import threading
+import time
+from ipaddress import ip_address
+from typing import Any, Optional, Self
+from libs.dns import TYPES, build_query, parse_message
+from libs.logging import Logger
+
+class ResolverCache:
+    """
+    In-process cache for hostname lookups, honouring the DNS TTL of each name.
+
+    Once installed, every `socket.getaddrinfo` call of this process (and so every `requests`
+    connection) is answered from the cache while the name's TTL lasts. The addresses still come
+    from the system resolver, so `/etc/hosts`, address ordering and IPv6 preferences are kept;
+    the TTL is learned with one recursive query to the first nameserver of `/etc/resolv.conf`,
+    clamped to `[minimum, maximum]`, and `fallback` seconds are used when that query fails.
+    When a lookup fails after the TTL ran out, the expired answer is served instead, so a
+    hiccup of the local resolver does not fail a whole cycle.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        nameserver (str, optional): Where TTLs are queried, None when none is configured.
+        minimum (int): Shortest time an answer is kept, in seconds.
+        maximum (int): Longest time an answer is kept, in seconds.
+        fallback (int): Time an answer is kept when its TTL is unknown, in seconds.
+    """
+    integrate = 'ResolverCache'
+
+    def __init__(self: Self, minimum: int = 5, maximum: int = 3600, fallback: int = 60, timeout: float = 1.0, resolv_conf: str = '/etc/resolv.conf') -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            minimum (int): Shortest time an answer is kept, in seconds. Defaults to 5.
+            maximum (int): Longest time an answer is kept, in seconds. Defaults to 3600.
+            fallback (int): Time an answer is kept when its TTL is unknown, in seconds. Defaults to 60.
+            timeout (float): Longest wait for the TTL query, in seconds. Defaults to 1.
+            resolv_conf (str): Resolver configuration the nameserver is read from. Defaults to '/etc/resolv.conf'.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.fallback = fallback
+        self.timeout = timeout
+        self.nameserver = self.__nameserver__(resolv_conf)
+        self.lock = threading.Lock()
+        self.original = socket.getaddrinfo
+        # (host, port, family, type, proto, flags) mapped to (monotonic expiry, getaddrinfo result)
+        self.entries: dict[tuple[Any, ...], tuple[float, list]] = {}
+        # Host mapped to the monotonic time its TTL runs out
+        self.expiry: dict[str, float] = {}
+
+    def __nameserver__(self: Self, resolv_conf: str) -> Optional[str]:
+        try:
+            with open(resolv_conf, 'r') as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 2 and fields[0] == 'nameserver':
+                        ip_address(fields[1])
+                        return fields[1]
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def ttl(self: Self, host: str) -> int:
+        """
+        The TTL of `host` as reported by the nameserver, clamped; `fallback` when it cannot be learned. Blocking.
+
+        The A answer is asked first and the AAAA answer only for names without one; the shortest
+        TTL along the answer (CNAMEs included) applies.
+        """
+        if self.nameserver is None:
+            return self.fallback
+        family = socket.AF_INET6 if ip_address(self.nameserver).version == 6 else socket.AF_INET
+        try:
+            with socket.socket(family, socket.SOCK_DGRAM) as sock:
+                sock.settimeout(self.timeout)
+                for record_type in ('A', 'AAAA'):
+                    qid = random.getrandbits(16)
+                    sock.sendto(build_query(qid, host, TYPES[record_type], recursion=True), (self.nameserver, 53))
+                    while True:
+                        message = parse_message(sock.recv(4096))
+                        if message.id == qid:
+                            break
+                    if message.answers:
+                        return max(self.minimum, min(self.maximum, min(answer.ttl for answer in message.answers)))
+        except (OSError, ValueError) as e:
+            logger.verbose(f"TTL of '{host}' not learned from {self.nameserver}: {e}")
+        return self.fallback
+
+    def getaddrinfo(self: Self, host: Any, port: Any, family: int = 0, type: int = 0, proto: int = 0, flags: int = 0) -> list:
+        """Drop-in `socket.getaddrinfo`, answered from the cache while the TTL of `host` lasts."""
+        if not isinstance(host, str) or not host:
+            return self.original(host, port, family, type, proto, flags)
+        try:
+            ip_address(host.split('%')[0])
+            return self.original(host, port, family, type, proto, flags)
+        except ValueError:
+            pass
+
+        name = host.lower().rstrip('.')
+        key = (name, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self.lock:
+            cached = self.entries.get(key)
+            expires = self.expiry.get(name, 0.0)
+        if cached and cached[0] > now:
+            return list(cached[1])
+
+        try:
+            result = self.original(host, port, family, type, proto, flags)
+        except socket.gaierror as e:
+            if cached:
+                logger.log(f"Lookup of '{host}' failed ({e}), reusing the expired answer.", 30)
+                return list(cached[1])
+            raise
+        if expires <= now:
+            expires = time.monotonic() + self.ttl(name)
+        with self.lock:
+            self.expiry[name] = expires
+            self.entries[key] = (expires, result)
+        return list(result)
+
+    def install(self: Self) -> Self:
+        """Route `socket.getaddrinfo` of this process through the cache."""
+        socket.getaddrinfo = self.getaddrinfo
+        logger.verbose(f"Hostname lookups cached, TTLs learned from {self.nameserver or 'nowhere'} ({self.minimum}-{self.maximum}s).")
+        return self
+
+    def uninstall(self: Self) -> None:
+        """Give `socket.getaddrinfo` back to the system resolver."""
+        if socket.getaddrinfo == self.getaddrinfo:
+            socket.getaddrinfo = self.original
+
+def prewarm(session: Any, url: str, timeout: float = 5.0) -> None:
+    """
+    Leave a warm connection to the host of `url` in `session`'s pool with a `HEAD` request. Blocking.
+
+    The lookup, TCP handshake and TLS handshake happen now, and the first request of the next
+    cycle reuses the idle connection. Point `url` at a path outside the API (the host root or
+    a static endpoint), so the warm-up counts against no rate limit and is never taken for an
+    update; its status is ignored.
+
+    Args:
+        session (requests.Session): The session whose pool receives the connection.
+        url (str): A non-API URL on the host to connect to.
+        timeout (float): Longest request, in seconds. Defaults to 5.
+
+    Example Usage:
+    --------------
+    ```
+    session = requests.Session()
+    prewarm(session, 'https://api.cloudflare.com/cdn-cgi/trace')
+    session.get('https://api.cloudflare.com/client/v4/zones', headers=headers)  # no handshake left to do
+    ```
+    """
+    # The (empty) body is read eagerly, which hands the connection back to the pool still open
+    session.head(url, timeout=timeout, allow_redirects=False)
+
+logger = Logger(ResolverCache.integrate)
@@ -0,0 +1,183 @@
+import atexit
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Iterator, Optional, Self
+from libs.logging import Logger
+
+# Frame header: epoch timestamp and length of the zlib-compressed JSON payload that follows.
+FRAME = struct.Struct('!dI')
+
+class RingStore:
+    """
+    Size-capped, compressed, append-only store for diagnostic dumps.
+
+    Entries are compressed JSON frames appended to `path`. Once the file reaches half of
+    `capacity` it becomes `path.1` (replacing the previous one) and a new file is started, so
+    the store never holds more than `capacity` bytes and always keeps the most recent entries.
+    `append` only queues the entry; a single background thread does the disk writes.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        path (str): The active segment; the previous one is `path.1`.
+        capacity (int): Upper bound of both segments together, in bytes.
+    """
+    integrate = 'RingStore'
+    # Longest wait for queued entries at interpreter exit, so a stuck disk cannot hold up shutdown.
+    exit_timeout = 5.0
+
+    def __init__(self: Self, path: str, capacity: int = 1 << 20) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            path (str): Location of the active segment.
+            capacity (int): Upper bound of the store, in bytes. Defaults to 1 MiB.
+        """
+        self.path = path
+        self.capacity = capacity
+        self.segment = max(FRAME.size, capacity // 2)
+        self.lock = threading.Lock()
+        self.queue: queue.Queue[tuple[float, Any]] = queue.Queue()
+        self.writer: Optional[threading.Thread] = None
+        # A lowered capacity applies to what is already on disk, not only from the next append
+        for segment in (f'{path}.1', path):
+            self.__trim__(segment)
+        atexit.register(self.__close__)
+
+    def __trim__(self: Self, path: str) -> None:
+        """Cut the segment at `path` down to its newest frames that fit in one segment."""
+        try:
+            if os.path.getsize(path) <= self.segment:
+                return
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        offsets, offset = [], 0
+        while offset + FRAME.size <= len(data):
+            length = FRAME.unpack_from(data, offset)[1]
+            if offset + FRAME.size + length > len(data):
+                break  # Torn write at the tail
+            offsets.append(offset)
+            offset += FRAME.size + length
+        start = next((_ for _ in offsets if offset - _ <= self.segment), offset)
+        with open(f'{path}.tmp', 'wb') as f:
+            f.write(data[start:offset])
+        os.replace(f'{path}.tmp', path)
+
+    def append(self: Self, record: Any, moment: Optional[float] = None) -> None:
+        """
+        Queue `record` for writing without blocking on disk I/O.
+
+        Args:
+            record (Any): JSON-serializable entry.
+            moment (float, optional): Epoch time of the entry. Defaults to now.
+        """
+        self.queue.put((moment if moment is not None else time.time(), record))
+        with self.lock:
+            if self.writer is None or not self.writer.is_alive():
+                self.writer = threading.Thread(target=self.__drain__, name=self.integrate, daemon=True)
+                self.writer.start()
+
+    def __drain__(self: Self) -> None:
+        while True:
+            moment, record = self.queue.get()
+            try:
+                self.write(record, moment)
+            except Exception as e:
+                logger.log(f"Failed to store dump: {e}", 30)
+            finally:
+                self.queue.task_done()
+
+    def write(self: Self, record: Any, moment: Optional[float] = None) -> None:
+        """
+        Append `record` synchronously, rotating the segment when it is full.
+
+        Args:
+            record (Any): JSON-serializable entry.
+            moment (float, optional): Epoch time of the entry. Defaults to now.
+        """
+        payload = zlib.compress(json.dumps(record, separators=(',', ':')).encode())
+        frame = FRAME.pack(moment if moment is not None else time.time(), len(payload)) + payload
+        if len(frame) > self.segment:
+            logger.log(f"Dump of {len(frame)} bytes exceeds half the store capacity, dropped.", 30)
+            return
+
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                size = 0
+            if size + len(frame) > self.segment:
+                os.replace(self.path, f'{self.path}.1')
+            with open(self.path, 'ab') as f:
+                f.write(frame)
+
+    def flush(self: Self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every queued entry has been written, or until `timeout` seconds have passed.
+
+        Returns:
+            bool: Whether the queue was drained.
+        """
+        with self.queue.all_tasks_done:
+            return self.queue.all_tasks_done.wait_for(lambda: not self.queue.unfinished_tasks, timeout)
+
+    def __close__(self: Self) -> None:
+        if not self.flush(self.exit_timeout):
+            logger.log(f"{self.queue.unfinished_tasks} dump(s) still queued after {self.exit_timeout}s at exit, dropped.", 30)
+
+    def __frames__(self: Self, path: str) -> Iterator[tuple[float, Any]]:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        offset = 0
+        while offset + FRAME.size <= len(data):
+            moment, length = FRAME.unpack_from(data, offset)
+            payload = data[offset + FRAME.size:offset + FRAME.size + length]
+            if len(payload) < length:
+                break  # Torn write at the tail
+            offset += FRAME.size + length
+            try:
+                yield moment, json.loads(zlib.decompress(payload))
+            except (zlib.error, ValueError):
+                continue
+
+    def read(self: Self, limit: Optional[int] = None, timeout: Optional[float] = 1.0) -> list[tuple[float, Any]]:
+        """
+        Read the stored entries, newest first.
+
+        Entries still queued are waited for up to `timeout` seconds; after that the entries
+        already on disk are returned, so a slow disk never blocks the caller for long.
+
+        Args:
+            limit (int, optional): Largest number of entries to return. Defaults to all.
+            timeout (float, optional): Longest wait for queued entries, in seconds, None to wait for all,
+                0 for whatever is on disk. Defaults to 1.
+
+        Returns:
+            list[tuple[float, Any]]: Epoch timestamp and entry pairs.
+
+        Example Usage:
+        --------------
+        ```
+        store = RingStore('.dumps/ifconfig.ring')
+        for moment, entry in store.read(5):
+            print(time.ctime(moment), entry)
+        ```
+        """
+        self.flush(timeout)
+        with self.lock:
+            entries = [*self.__frames__(f'{self.path}.1'), *self.__frames__(self.path)]
+        entries.reverse()
+        return entries[:limit] if limit is not None else entries
+
+logger = Logger(RingStore.integrate)
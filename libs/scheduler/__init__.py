@@ -0,0 +1,129 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, NoReturn, Optional, Self
+from libs.converter import Every, Trigger
+from libs.scheduler.jitter import jittered
+from libs.logging import Logger
+
+class _Entry:
+    __slots__ = ('trigger', 'providers', 'due')
+
+    def __init__(self, trigger: Trigger, providers: Optional[tuple[str, ...]], due: datetime) -> None:
+        self.trigger = trigger
+        self.providers = providers
+        self.due = due
+
+class Scheduler:
+    """
+    Run a callback on several cron, time-of-day and interval triggers at once.
+
+    Sleeping is measured on the monotonic clock and the next fire time is derived from the
+    schedule, not from when the previous run returned, so slow cycles do not drift. The
+    wall clock is re-read every `resolution` seconds: when it has jumped past one or more
+    fire times (suspend, resume, clock step) the missed runs are caught up with a single run.
+    Triggers that fall due together are coalesced into one call covering all their providers.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        resolution (float): Longest single sleep, in seconds.
+        catch_up (bool): Whether to run once for fire times missed while suspended.
+        jitter (float): Largest random delay added before each run, in seconds.
+    """
+    integrate = 'Scheduler'
+
+    def __init__(self: Self, resolution: float = 30.0, catch_up: bool = True, jitter: float = 0) -> None:
+        self.resolution = resolution
+        self.catch_up = catch_up
+        self.jitter = jitter
+        self.entries: list[_Entry] = []
+
+    def add(self: Self, trigger: Trigger, providers: Optional[tuple[str, ...]] = None) -> Self:
+        """
+        Register a trigger.
+
+        Args:
+            trigger (Trigger): When to fire, see `libs.converter.parse_trigger`.
+            providers (tuple[str, ...], optional): Providers the trigger applies to. Defaults to all.
+
+        Returns:
+            Self: The scheduler, for chaining.
+        """
+        self.entries.append(_Entry(trigger, providers, trigger.next_after(datetime.now())))
+        return self
+
+    def next_due(self: Self) -> Optional[datetime]:
+        """The earliest upcoming fire time, or None when nothing is scheduled."""
+        return min((entry.due for entry in self.entries), default=None)
+
+    def __advance__(self: Self, entry: _Entry, now: datetime) -> int:
+        """Move `entry` past `now`, returning how many fire times were skipped on the way."""
+        missed = 0
+        if isinstance(entry.trigger, Every):
+            # Keep the interval's phase instead of restarting it from `now`.
+            step = timedelta(seconds=entry.trigger.seconds)
+            missed = int((now - entry.due) / step)
+            entry.due += step * (missed + 1)
+            return missed
+        nxt = entry.trigger.next_after(entry.due)
+        while nxt <= now and missed < 1000:
+            missed += 1
+            nxt = entry.trigger.next_after(nxt)
+        entry.due = nxt if nxt > now else entry.trigger.next_after(now)
+        return missed
+
+    async def run(self: Self, callback: Callable[[Optional[list[str]]], Awaitable[Any]], before: Optional[Callable[[], Awaitable[Any]]] = None, lead: float = 0) -> NoReturn:
+        """
+        Run forever, calling `callback(providers)` whenever triggers fall due.
+
+        Args:
+            callback (Callable): Coroutine function receiving the providers to sync, or None for all.
+            before (Callable, optional): Coroutine function awaited `lead` seconds before each run, e.g. to warm connections.
+            lead (float): Seconds ahead of each run that `before` is awaited. Defaults to 0.
+        """
+        if not self.entries:
+            raise ValueError("Scheduler has no triggers.")
+        for entry in self.entries:
+            logger.log(f"Trigger {entry.trigger!r} for {', '.join(entry.providers) if entry.providers else 'all providers'}, next at {entry.due.ctime()}.")
+
+        while True:
+            due = min(entry.due for entry in self.entries)
+            # Sleep on the monotonic clock, waking every `resolution` seconds to notice wall-clock jumps.
+            deadline = time.monotonic() + max(0.0, (due - datetime.now()).total_seconds())
+            early = before is not None and lead > 0
+            while (remaining := deadline - time.monotonic()) > 0 and datetime.now() < due:
+                if early and remaining <= lead:
+                    early = False
+                    try:
+                        await before()
+                    except Exception as e:
+                        logger.exception(e)
+                    continue
+                await asyncio.sleep(min(remaining - lead if early else remaining, self.resolution))
+
+            now = datetime.now()
+            fired = []
+            for entry in self.entries:
+                if entry.due > now: continue
+                late = (now - entry.due).total_seconds() > 2 * self.resolution
+                missed = self.__advance__(entry, now) + late
+                if late and not self.catch_up:
+                    logger.log(f"Trigger {entry.trigger!r} missed {missed} run(s) while suspended, skipping.", 30)
+                    continue
+                if late:
+                    logger.log(f"Trigger {entry.trigger!r} missed {missed} run(s) while suspended, catching up once.", 30)
+                fired.append(entry)
+            if not fired:
+                continue
+
+            providers: Optional[set[str]] = set()
+            for entry in fired:
+                if providers is not None:
+                    providers = None if entry.providers is None else providers | set(entry.providers)
+
+            if self.jitter > 0:
+                await asyncio.sleep(jittered(self.jitter / 2, self.jitter / 2))
+            await callback(sorted(providers) if providers is not None else None)
+            logger.log(f"Cycle completed. Next scheduled run at {self.next_due().ctime()}.")
+
+logger = Logger(Scheduler.integrate)
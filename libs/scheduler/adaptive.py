@@ -0,0 +1,111 @@
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Self
+from libs.logging import Logger
+
+class AdaptiveInterval:
+    """
+    Poll interval learned from when the public address actually changes.
+
+    After a change the interval drops to `minimum` and then grows by `growth` on every
+    stable poll, up to `maximum`. Changes are also binned by local hour of day: hours that
+    saw noticeably more changes than average (the ISP's reassignment window) are polled at
+    `minimum`, and a long interval is cut short so the next poll lands when such an hour begins.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        minimum (float): Shortest interval, in seconds.
+        maximum (float): Longest interval, in seconds.
+        current (float): Interval reached by the growth after the last change.
+        changes (list[float]): Epoch timestamps of observed address changes, newest last.
+    """
+    integrate = 'AdaptiveInterval'
+    history_limit = 512
+    # Only changes this recent are used to find hot hours.
+    window = 90 * 86400
+
+    def __init__(self: Self, minimum: float, maximum: float, initial: Optional[float] = None, growth: float = 2.0, history_path: str = '.dumps/address_changes.json') -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.growth = growth
+        self.history_path = history_path
+        self.current = min(maximum, max(minimum, initial if initial is not None else maximum))
+
+        try:
+            with open(history_path, 'r') as f:
+                self.changes: list[float] = [float(t) for t in json.load(f)][-self.history_limit:]
+        except (FileNotFoundError, json.JSONDecodeError, TypeError, ValueError):
+            self.changes = []
+
+    def observe(self: Self, changed: bool, moment: Optional[float] = None) -> None:
+        """
+        Record the outcome of a poll.
+
+        Args:
+            changed (bool): Whether the poll found a different address than the previous one.
+            moment (float, optional): Epoch time of the poll. Defaults to now.
+        """
+        if not changed:
+            self.current = min(self.maximum, self.current * self.growth)
+            return
+
+        self.current = self.minimum
+        logger.verbose(f"Address change recorded, polling every {self.minimum}s again.")
+        self.changes = (self.changes + [moment if moment is not None else time.time()])[-self.history_limit:]
+        os.makedirs(os.path.dirname(self.history_path) or '.', exist_ok=True)
+        with open(self.history_path, 'w') as f:
+            json.dump(self.changes, f)
+
+    def export_state(self: Self) -> dict[str, float]:
+        """Warm state for `libs.warmstate`: the interval grown since the last change."""
+        return {"current": self.current}
+
+    def restore_state(self: Self, state: dict[str, float]) -> None:
+        """Resume the growth where it stopped, instead of starting over from `initial`."""
+        if "current" in state:
+            self.current = min(self.maximum, max(self.minimum, float(state["current"])))
+
+    def hot_hours(self: Self, moment: Optional[float] = None) -> set[int]:
+        """Local hours of day with at least two recent changes and twice the hourly average."""
+        now = moment if moment is not None else time.time()
+        recent = [t for t in self.changes if now - t <= self.window]
+        if len(recent) < 2:
+            return set()
+
+        counts = [0] * 24
+        for t in recent:
+            counts[datetime.fromtimestamp(t).hour] += 1
+        average = len(recent) / 24
+        return {hour for hour, count in enumerate(counts) if count >= 2 and count >= 2 * average}
+
+    def next_interval(self: Self, moment: Optional[float] = None) -> float:
+        """
+        Seconds to wait before the next poll.
+
+        Args:
+            moment (float, optional): Epoch time the wait starts. Defaults to now.
+
+        Returns:
+            float: The interval, between `minimum` and `maximum`.
+        """
+        now = moment if moment is not None else time.time()
+        interval = self.current
+        hot = self.hot_hours(now)
+
+        if hot:
+            current = datetime.fromtimestamp(now)
+            if current.hour in hot:
+                interval = self.minimum
+            else:
+                top = current.replace(minute=0, second=0, microsecond=0)
+                for ahead in range(1, 25):
+                    start = top + timedelta(hours=ahead)
+                    if start.hour in hot:
+                        interval = min(interval, (start - current).total_seconds())
+                        break
+
+        return min(self.maximum, max(self.minimum, interval))
+
+logger = Logger(AdaptiveInterval.integrate)
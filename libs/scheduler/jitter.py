@@ -0,0 +1,47 @@
+import hashlib
+import math
+import random
+import socket
+import time
+from typing import Optional
+
+def node_fraction(node_id: Optional[str] = None) -> float:
+    """
+    Deterministic position of this node within any period, in [0, 1).
+
+    Hashing the node ID (the hostname by default) spreads a fleet sharing one
+    configuration evenly across the period, and keeps each node in the same slot
+    across restarts.
+
+    Args:
+        node_id (str, optional): Stable identifier of the node. Defaults to the hostname.
+
+    Returns:
+        float: The fraction of the period this node is offset by.
+    """
+    digest = hashlib.sha256((node_id or socket.gethostname()).encode()).digest()
+    return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+def next_slot(period: float, fraction: float, moment: Optional[float] = None) -> float:
+    """
+    Seconds from `moment` until this node's next slot on the `period` grid.
+
+    Slots sit at `k * period + fraction * period` epoch seconds, so nodes with different
+    fractions fire at different points of the same period regardless of when they started.
+
+    Args:
+        period (float): The polling period, in seconds.
+        fraction (float): This node's offset within the period, see `node_fraction`.
+        moment (float, optional): Epoch time to measure from. Defaults to now.
+
+    Returns:
+        float: Seconds to wait, in (0, period].
+    """
+    now = moment if moment is not None else time.time()
+    offset = fraction * period
+    slot = (math.floor((now - offset) / period) + 1) * period + offset
+    return slot - now
+
+def jittered(seconds: float, jitter: float) -> float:
+    """`seconds` moved by a uniform random amount in [-jitter, +jitter], never below zero."""
+    return max(0.0, seconds + random.uniform(-jitter, jitter)) if jitter > 0 else seconds
@@ -0,0 +1,110 @@
+import asyncio
+import base64
+import hmac
+from ipaddress import ip_address
+from typing import Awaitable, Callable, Optional, Self
+from urllib.parse import parse_qs, urlsplit
+from libs.logging import Logger
+
+# Receives the requested hostnames and address, returns one dyndns2 status line per hostname.
+PushHandler = Callable[[list[str], str], Awaitable[dict[str, str]]]
+
+class UpdateServer:
+    """
+    Minimal dyndns2 update server so routers can push their WAN address.
+
+    Accepts `GET /nic/update?hostname=a.example.com,b.example.com&myip=203.0.113.7` with
+    HTTP basic auth and answers with one status line per hostname, as the dyndns2
+    protocol specifies. When `myip` is omitted the address of the caller is used.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        host (str): Address to listen on.
+        port (int): Port to listen on.
+    """
+    integrate = 'UpdateServer'
+    max_request_size = 8192
+
+    def __init__(self: Self, handler: PushHandler, username: str, password: str, host: str = '0.0.0.0', port: int = 8245):
+        """
+        Initialize the update server.
+
+        Args:
+            handler (PushHandler): Coroutine called with the hostnames and address of every authorized push.
+            username (str): Username routers must present.
+            password (str): Password routers must present.
+            host (str): Address to listen on. Defaults to '0.0.0.0'.
+            port (int): Port to listen on. Defaults to 8245.
+        """
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.__authorization = base64.b64encode(f"{username}:{password}".encode()).decode()
+
+    async def start(self: Self) -> asyncio.AbstractServer:
+        """Bind the listener and return the underlying `asyncio` server."""
+        self.server = await asyncio.start_server(self.__client__, self.host, self.port)
+        logger.log(f"Listening for dyndns2 pushes on {self.host}:{self.port}.")
+        return self.server
+
+    async def serve(self: Self) -> None:
+        """Bind the listener and serve until cancelled."""
+        server = self.server or await self.start()
+        async with server:
+            await server.serve_forever()
+
+    def __authorized__(self: Self, headers: dict[str, str]) -> bool:
+        scheme, _, credentials = headers.get('authorization', '').partition(' ')
+        return scheme.lower() == 'basic' and hmac.compare_digest(credentials.strip(), self.__authorization)
+
+    async def __respond__(self: Self, writer: asyncio.StreamWriter, status: str, body: str, extra: str = '') -> None:
+        payload = body.encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: text/plain\r\nContent-Length: {len(payload)}\r\n"
+            f"Connection: close\r\n{extra}\r\n".encode() + payload
+        )
+        await writer.drain()
+
+    async def __client__(self: Self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=10)
+            if len(raw) > self.max_request_size:
+                return await self.__respond__(writer, "413 Payload Too Large", "badagent")
+
+            request_line, *header_lines = raw.decode('latin-1').split("\r\n")
+            method, target, _ = request_line.split(' ', 2)
+            headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(':') for line in header_lines if line)}
+
+            url = urlsplit(target)
+            if method != 'GET' or url.path not in ('/nic/update', '/v3/update'):
+                return await self.__respond__(writer, "404 Not Found", "badagent")
+            if not self.__authorized__(headers):
+                return await self.__respond__(writer, "401 Unauthorized", "badauth", 'WWW-Authenticate: Basic realm="FlexiDNS"\r\n')
+
+            query = parse_qs(url.query)
+            hostnames = [h.strip().lower() for h in ",".join(query.get('hostname', [])).split(',') if h.strip()]
+            if not hostnames:
+                return await self.__respond__(writer, "200 OK", "notfqdn")
+
+            myip = ",".join(query.get('myip', [])).split(',')[0].strip() or writer.get_extra_info('peername')[0]
+            try:
+                myip = str(ip_address(myip))
+            except ValueError:
+                return await self.__respond__(writer, "200 OK", "\n".join("dnserr" for _ in hostnames))
+
+            logger.log(f"Push received for {', '.join(hostnames)} -> {myip}")
+            results = await self.handler(hostnames, myip)
+            await self.__respond__(writer, "200 OK", "\n".join(results.get(h, 'nohost') for h in hostnames))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError):
+            pass
+        except Exception as e:
+            logger.exception(e)
+            try:
+                await self.__respond__(writer, "500 Internal Server Error", "911")
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+logger = Logger(UpdateServer.integrate)
@@ -0,0 +1,192 @@
+import asyncio
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional, Self
+from libs import deadline
+from libs.api import UpdateSkipped
+from libs.logging import Logger
+from libs.resolver import ResolverCache
+
+# Per worker process: provider instances kept across cycles (warm caches and pools), and the
+# semaphores bounding requests per credential across all workers.
+_instances: dict[str, Any] = {}
+_semaphores: dict[str, Any] = {}
+
+def _initialize(semaphores: dict[str, Any], resolve: bool = False) -> None:
+    _semaphores.update(semaphores)
+    if resolve:
+        ResolverCache().install()
+
+def _publish(object_name: str, cls: type, kwargs: dict[str, Any], state: Optional[dict[str, Any]], jobs: list[tuple[str, str, list[str]]], limit: Optional[float]) -> tuple[dict[tuple[str, str], Optional[Exception]], Optional[dict[str, Any]]]:
+    """Worker side: run one shard's `(record type, content, fqdns)` jobs, returning outcomes and the provider's state."""
+    instance = _instances.get(object_name)
+    if instance is None:
+        instance = _instances[object_name] = cls(**kwargs)
+    if state is not None:
+        instance.restore_state(state)
+
+    semaphore = _semaphores.get(object_name)
+    results: dict[tuple[str, str], Optional[Exception]] = {}
+    with deadline.scope(limit):
+        for record, content, fqdns in jobs:
+            pending = fqdns
+            if getattr(instance, 'verifier', None):
+                pending = asyncio.run(instance.unverified(fqdns, record, content))
+                results.update({(fqdn, record): None for fqdn in fqdns if fqdn not in pending})
+            for fqdn in pending:
+                left = deadline.remaining()
+                if (left is not None and left <= 0) or (semaphore and not semaphore.acquire(timeout=left)):
+                    results[(fqdn, record)] = TimeoutError(f"Record '{fqdn}' not updated before the {limit}s deadline.")
+                    continue
+                try:
+                    getattr(instance, record)(fqdn, content)
+                    results[(fqdn, record)] = None
+                except TimeoutError as e:
+                    results[(fqdn, record)] = TimeoutError(str(e))
+                except UpdateSkipped as e:
+                    results[(fqdn, record)] = type(e)(str(e))
+                except Exception as e:
+                    # Re-raised as a plain exception, since provider exceptions do not always pickle
+                    logger.log(f"Failed to update record '{fqdn}': {e}", 40)
+                    results[(fqdn, record)] = ConnectionError(f"{type(e).__name__}: {e}")
+                finally:
+                    if semaphore:
+                        semaphore.release()
+    return results, instance.export_state() if hasattr(instance, 'export_state') else None
+
+def _prewarm() -> None:
+    """Worker side: warm the connection pools of the provider instances this worker holds."""
+    for object_name, instance in _instances.items():
+        try:
+            instance.prewarm()
+        except Exception as e:
+            logger.verbose(f"Prewarming {object_name} failed: {e}")
+
+class ShardPool:
+    """
+    Spread per-record provider work over worker processes, sharded by zone.
+
+    Every zone (the last two labels of a hostname) always goes to the same worker, and each
+    worker keeps its own provider instances between cycles, so its caches and connection
+    pools stay warm for the zones it owns. The first job of a provider seeds each worker with
+    the parent's provider state; afterwards every worker returns its state with its outcomes
+    and the parent merges back the entries of the zones it owns, keeping warm state, audits
+    and `status` whole. Requests per
+    credential are bounded by one semaphore shared by all workers, so adding workers adds CPU,
+    not API pressure.
+
+    Workers are started with `spawn`, so they never inherit the parent's threads or event loop.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        workers (int): Number of worker processes.
+    """
+    integrate = 'ShardPool'
+
+    def __init__(self: Self, workers: int, providers: list[str], concurrency: int = 4, resolve: bool = False) -> None:
+        """
+        Initialize the pool; worker processes start on first use.
+
+        Args:
+            workers (int): Number of worker processes.
+            providers (list[str]): Provider names that may be sharded.
+            concurrency (int): Requests in flight per provider credential across all workers. Defaults to 4.
+            resolve (bool): Whether workers cache hostname lookups through `ResolverCache`. Defaults to False.
+        """
+        self.workers = workers
+        self.resolve = resolve
+        self.context = multiprocessing.get_context('spawn')
+        self.semaphores = {_: self.context.BoundedSemaphore(concurrency) for _ in providers}
+        self.pools: list[Optional[ProcessPoolExecutor]] = [None] * workers
+        # (worker, provider) pairs whose worker already holds the provider's state
+        self.seeded: set[tuple[int, str]] = set()
+
+    def __pool__(self: Self, index: int) -> ProcessPoolExecutor:
+        # One single-process executor per shard, so a zone always lands on the same worker.
+        if self.pools[index] is None:
+            self.pools[index] = ProcessPoolExecutor(1, mp_context=self.context, initializer=_initialize, initargs=(self.semaphores, self.resolve))
+        return self.pools[index]
+
+    def shard(self: Self, fqdn: str) -> int:
+        """The worker owning the zone of `fqdn` (or of a `negative:<kind>:<name>` cache key), stable across restarts."""
+        zone = '.'.join(fqdn.lower().rstrip('.').rsplit(':', 1)[-1].split('.')[-2:])
+        return zlib.crc32(zone.encode()) % self.workers
+
+    async def publish(self: Self, object_name: str, instance: Any, kwargs: dict[str, Any], jobs: list[tuple[str, str, list[str]]], limit: Optional[float]) -> dict[tuple[str, str], Optional[Exception]]:
+        """
+        Run `(record type, content, fqdns)` jobs for one provider across the workers.
+
+        Args:
+            object_name (str): The provider section name.
+            instance (Any): The parent's provider instance; it receives the merged state.
+            kwargs (dict[str, Any]): Constructor arguments of the provider class.
+            jobs (list[tuple[str, str, list[str]]]): The jobs, as built by `main.publish`.
+            limit (float, optional): Seconds the workers may spend, None for no limit.
+
+        Returns:
+            dict[tuple[str, str], Optional[Exception]]: One outcome per `(fqdn, record type)`, None when updated.
+        """
+        split: list[list[tuple[str, str, list[str]]]] = [[] for _ in range(self.workers)]
+        for record, content, fqdns in jobs:
+            groups: dict[int, list[str]] = {}
+            for fqdn in fqdns:
+                groups.setdefault(self.shard(fqdn), []).append(fqdn)
+            for index, names in groups.items():
+                split[index].append((record, content, names))
+
+        # Only the parent persists the cache: workers hold a part of it each.
+        kwargs = {**kwargs, 'cache_persistent': False} if 'cache_persistent' in kwargs else kwargs
+        state = instance.export_state() if hasattr(instance, 'export_state') else None
+        loop = asyncio.get_running_loop()
+        shards = [index for index, shard_jobs in enumerate(split) if shard_jobs]
+        futures = []
+        for index in shards:
+            seed = state if (index, object_name) not in self.seeded else None
+            self.seeded.add((index, object_name))
+            futures.append(loop.run_in_executor(self.__pool__(index), _publish, object_name, type(instance), kwargs, seed, split[index], limit))
+
+        results: dict[tuple[str, str], Optional[Exception]] = {}
+        for index, outcome in zip(shards, await asyncio.gather(*futures, return_exceptions=True)):
+            if isinstance(outcome, BaseException):
+                logger.log(f"Shard {index} of {object_name} failed: {outcome!r}", 40)
+                self.seeded.discard((index, object_name))
+                if isinstance(outcome, BrokenProcessPool):
+                    self.pools[index] = None
+                for record, _, fqdns in split[index]:
+                    results.update({(fqdn, record): ConnectionError(f"Shard {index} failed: {outcome!r}") for fqdn in fqdns})
+                continue
+            shard_results, shard_state = outcome
+            results.update(shard_results)
+            if state is not None and shard_state:
+                for key, value in shard_state.items():
+                    if isinstance(value, dict) and isinstance(state.get(key), dict):
+                        # A worker's copies of other shards' entries date from its seed, only its own are current
+                        state[key].update({name: entry for name, entry in value.items() if self.shard(str(name)) == index})
+                    else:
+                        state[key] = value
+
+        if state is not None:
+            instance.restore_state(state)
+            cache = getattr(instance, 'cache', None)
+            if getattr(instance, 'cache_persistent', False) and cache and not cache.is_empty():
+                cache.commit()
+        return results
+
+    async def prewarm(self: Self) -> None:
+        """Warm the connection pools held by every running worker; workers not started yet are skipped."""
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(pool, _prewarm) for pool in self.pools if pool is not None]
+        for outcome in await asyncio.gather(*futures, return_exceptions=True):
+            if isinstance(outcome, BaseException):
+                logger.verbose(f"Prewarming a shard failed: {outcome!r}")
+
+    def shutdown(self: Self) -> None:
+        """Stop every worker process."""
+        for pool in self.pools:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self.pools = [None] * self.workers
+
+logger = Logger(ShardPool.integrate)
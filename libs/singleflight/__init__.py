@@ -0,0 +1,94 @@
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional, Self, TypeVar
+from libs.logging import Logger
+
+T = TypeVar('T')
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'finished')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.finished: float = 0.0
+
+class SingleFlight:
+    """
+    Deduplicate identical concurrent requests.
+
+    The first caller for a key runs the request; callers arriving while it is in flight
+    wait and share its result (or exception). A successful result stays fresh for
+    `freshness` seconds so repeated reads within one cycle cost a single request.
+    Failures are never kept. Thread-safe, so it also covers work offloaded to threads.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        freshness (float): Seconds a completed result is reused, 0 to share only in-flight calls.
+        shared (int): How many calls were answered without issuing a request.
+    """
+    integrate = 'SingleFlight'
+
+    def __init__(self: Self, freshness: float = 5.0) -> None:
+        self.freshness = freshness
+        self.lock = threading.Lock()
+        self.calls: dict[Hashable, _Call] = {}
+        self.shared = 0
+
+    def do(self: Self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run `fn` once for all concurrent callers of `key`.
+
+        Args:
+            key (Hashable): Identity of the request, e.g. `(url, params)`.
+            fn (Callable[[], T]): Performs the request.
+
+        Returns:
+            T: The shared result.
+
+        Raises:
+            BaseException: Whatever `fn` raised, re-raised in every waiting caller.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            if call and call.done.is_set() and (call.error or time.monotonic() - call.finished > self.freshness):
+                call = None
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.finished = time.monotonic()
+            call.done.set()
+            if call.error or self.freshness <= 0:
+                with self.lock:
+                    if self.calls.get(key) is call:
+                        del self.calls[key]
+
+    def forget(self: Self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Drop completed results whose key matches, e.g. after a write made them stale.
+
+        Args:
+            predicate (Callable[[Hashable], bool]): Returns True for keys to drop.
+        """
+        with self.lock:
+            for key in [k for k, call in self.calls.items() if call.done.is_set() and predicate(k)]:
+                del self.calls[key]
+
+logger = Logger(SingleFlight.integrate)
@@ -0,0 +1,156 @@
+import asyncio
+import socket
+from ipaddress import ip_address
+from typing import Any, Optional, Self
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from libs.api.FetchAPI import icanhazip, ipify, ifconfig
+from libs.ringstore import RingStore
+from libs.resolver import prewarm
+from libs.logging import Logger
+
+# Host each lookup API is reached at, for warming the session's pool before a cycle.
+ENDPOINTS = {'ipify': 'https://api64.ipify.org', 'icanhazip': 'https://icanhazip.com', 'ifconfig': 'https://ifconfig.me'}
+
+class _BoundAdapter(HTTPAdapter):
+    """Connection pool whose sockets leave through a given local address and/or network interface."""
+
+    def __init__(self, address: Optional[str] = None, interface: Optional[str] = None) -> None:
+        self.address = address
+        self.interface = interface
+        super().__init__()
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        if self.address:
+            kwargs['source_address'] = (self.address, 0)
+        if self.interface:
+            # SO_BINDTODEVICE is Linux-only and needs CAP_NET_RAW.
+            kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_BINDTODEVICE, self.interface.encode())
+            ]
+        super().init_poolmanager(*args, **kwargs)
+
+def classify(addresses: list[str]) -> dict[str, Optional[str]]:
+    """
+    Sort the addresses a lookup API returned by IP version, whatever their order or count.
+
+    Args:
+        addresses (list[str]): Addresses as returned, e.g. `['2001:db8::1']` or `['203.0.113.7', '2001:db8::1']`.
+
+    Returns:
+        dict[str, Optional[str]]: The first IPv4 address under `Iv4` and the first IPv6 address under `Iv6`, None when absent.
+
+    Example Usage:
+    --------------
+    ```
+    classify(['2001:db8::1'])
+    # => {'Iv4': None, 'Iv6': '2001:db8::1'}
+    ```
+    """
+    found: dict[str, Optional[str]] = {"Iv4": None, "Iv6": None}
+    for address in filter(None, (address.strip() for address in addresses)):
+        key = "Iv4" if ip_address(address).version == 4 else "Iv6"
+        found[key] = found[key] or address
+    return found
+
+class AddressSource:
+    """
+    One way of discovering a public address: a lookup API, optionally bound to an uplink.
+
+    Each source keeps its own `requests.Session`, so repeated lookups reuse pooled connections,
+    and binding it to a local address or interface makes the lookup leave through that uplink.
+
+    Attributes:
+        integrate (str): Integration name for logging purposes.
+        name (str): The source name FQDN lists refer to, '' for the default source.
+        query_api (str): 'ipify', 'icanhazip' or 'ifconfig[?path]'.
+    """
+    integrate = 'AddressSource'
+
+    def __init__(self: Self, name: str, query_api: str, address: Optional[str] = None, interface: Optional[str] = None, dumps: Optional[RingStore] = None) -> None:
+        """
+        Initialize the source.
+
+        Args:
+            name (str): The source name, '' for the default source.
+            query_api (str): The lookup API, see `[General] queryAPI`.
+            address (str, optional): Local address to send lookups from.
+            interface (str, optional): Network interface to send lookups through.
+            dumps (RingStore, optional): Store receiving full `ifconfig` JSON responses.
+        """
+        self.name = name
+        self.query_api = query_api
+        self.dumps = dumps
+        self.session = requests.Session()
+        if address or interface:
+            adapter = _BoundAdapter(address, interface)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+
+    def prewarm(self: Self) -> None:
+        """Open a connection to the lookup API through this source's uplink ahead of the next cycle. Blocking."""
+        url = ENDPOINTS.get(self.query_api.split('?')[0])
+        if url:
+            prewarm(self.session, url)
+
+    def detect(self: Self) -> dict[str, Optional[str]]:
+        """
+        Look up the public addresses seen through this source. Blocking.
+
+        Returns:
+            dict[str, Optional[str]]: The addresses keyed `Iv4` and `Iv6`, None when not found.
+        """
+        query_api = self.query_api
+        if query_api == 'ipify':
+            ipify_response = ipify(64, self.session).get_address(format='text')
+            if isinstance(ipify_response, dict):
+                inet_address = [ipify_response.get('ipv4', ''), ipify_response.get('ipv6', '')]
+            elif isinstance(ipify_response, str):
+                inet_address = [ipify_response]
+            else:
+                raise ValueError("Unexpected response type from ipify API")
+
+        elif query_api == 'icanhazip':
+            inet_address = [icanhazip(self.session).get().replace('\n', '').strip()]
+        elif query_api.split('?')[0] == 'ifconfig':
+            ifinfo = ifconfig(query_api.split('?')[-1] if '?' in query_api else '/', self.session, self.dumps).get()
+            if isinstance(ifinfo, dict):
+                ip_addr = ifinfo.get('ip_addr', None)
+            else:
+                ip_addr = ifinfo
+            # Support both single IP and comma-separated list
+            if ip_addr is not None:
+                inet_address = [ip.strip() for ip in ip_addr.split(',')] if ',' in ip_addr else [ip_addr]
+            else:
+                inet_address = []
+        else:
+            raise ValueError(f"Unsupported address API {query_api!r}")
+
+        return classify(inet_address)
+
+async def detect_all(sources: list[AddressSource]) -> dict[str, dict[str, Optional[str]]]:
+    """
+    Run every source's lookup concurrently, off the event loop.
+
+    A named source that fails is logged and reported without addresses, so one dead uplink
+    does not hold back the others. A failing default source ('') raises, as before.
+
+    Args:
+        sources (list[AddressSource]): The sources to query.
+
+    Returns:
+        dict[str, dict[str, Optional[str]]]: Source name mapped to its `Iv4`/`Iv6` addresses.
+    """
+    results = await asyncio.gather(*(asyncio.to_thread(source.detect) for source in sources), return_exceptions=True)
+    detected: dict[str, dict[str, Optional[str]]] = {}
+    for source, result in zip(sources, results):
+        if isinstance(result, BaseException):
+            if not source.name:
+                raise result
+            logger.log(f"Address source '{source.name}' failed: {result}", 30)
+            result = {"Iv4": None, "Iv6": None}
+        detected[source.name] = result
+    return detected
+
+logger = Logger(AddressSource.integrate)
@@ -0,0 +1,64 @@
+import os
+import pickle
+import time
+from typing import Any
+from libs.logging import Logger
+
+# Bump whenever the layout of a component's state changes, so older snapshots are ignored.
+WARM_STATE_VERSION = 1
+
+def save(state: dict[str, Any], path: str = '.dumps/warm_state', quiet: bool = False) -> None:
+    """
+    Write every component's warm state as one consolidated snapshot.
+
+    The snapshot is written next to its final location and moved into place, so a crash
+    while saving leaves the previous snapshot intact.
+
+    Args:
+        state (dict[str, Any]): Component name mapped to the state it exported.
+        path (str): Snapshot location. Defaults to '.dumps/warm_state'.
+        quiet (bool): Log at debug level, for snapshots written on every cycle. Defaults to False.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f'{path}.tmp', 'wb') as f:
+        pickle.dump((WARM_STATE_VERSION, time.time(), state), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f'{path}.tmp', path)
+    (logger.verbose if quiet else logger.log)(f"Warm state saved for {', '.join(state) or 'no components'}.")
+
+def load(path: str = '.dumps/warm_state', quiet: bool = False) -> dict[str, Any]:
+    """
+    Read the snapshot written by `save` in a single read.
+
+    A missing, unreadable or outdated snapshot is not an error: startup simply begins cold.
+
+    Args:
+        path (str): Snapshot location. Defaults to '.dumps/warm_state'.
+        quiet (bool): Log a successful restore at debug level. Defaults to False.
+
+    Returns:
+        dict[str, Any]: Component name mapped to its state, empty when there is nothing to restore.
+
+    Example Usage:
+    --------------
+    ```
+    save({"applied": {...}})
+    print(load())
+    # => {"applied": {...}}
+    ```
+    """
+    try:
+        with open(path, 'rb') as f:
+            version, saved, state = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError) as e:
+        logger.log(f"Ignoring unreadable warm state: {e}", 30)
+        return {}
+
+    if version != WARM_STATE_VERSION or not isinstance(state, dict):
+        logger.log("Ignoring warm state written by another version.", 30)
+        return {}
+    (logger.verbose if quiet else logger.log)(f"Warm state from {time.ctime(saved)} restored for {', '.join(state) or 'no components'}.")
+    return state
+
+logger = Logger('WarmState')
@@ -1,19 +1,42 @@
-import configparser
 from datetime import date, datetime, timedelta
+import hashlib
 import math
 import os
+import pickle
 import sys
 import asyncio
+import random
 import re
-from typing import NoReturn, Optional, Self, Union, Any
+import signal
+import socket
+import time
+from typing import Awaitable, NoReturn, Optional, Self, Union, Any
 
+from libs import config as settings
+from libs import deadline
+from libs import warmstate
+from libs import prefix
 from libs.logging import Logger
-from libs.converter import unixConvert
+from libs.converter import parse_trigger, unixConvert
+from libs.scheduler import Scheduler
+from libs.scheduler.adaptive import AdaptiveInterval
+from libs.scheduler.jitter import jittered, next_slot, node_fraction
+from libs.debounce import Debounce
+from libs.failover import Failover
 
-from libs.api.FetchAPI import icanhazip, ipify, ifconfig
+from libs.sources import AddressSource, detect_all
+from libs.ringstore import RingStore
+from libs.history import History
+from libs.lease import Lease
+from libs.shard import ShardPool
+from libs.resolver import ResolverCache
+from libs.api import UpdateDeferred, UpdateSkipped
 from libs.api.cloudflare import CloudFlare
 from libs.api.noip import NoIP
 from libs.api.dyndns import DynDNS
+from libs.api.dyndns2 import DynDNS2
+from libs.server import UpdateServer
+from libs.dns.responder import DNSResponder
 
 import json
 from ipaddress import ip_address
@@ -21,157 +44,756 @@ import argparse
 
 logger = Logger("UDIP")
 
-def parse(val) -> Union[bool, int, float, str, Any]:
-    val = val.strip()
-    if val.lower() == 'true':
-        return True
-    if val.lower() == 'false':
-        return False
-    try:
-        if '.' in val:
-            return float(val)
-        return int(val)
-    except ValueError:
-        return val
-
-# Load configuration
-config = configparser.ConfigParser(allow_no_value=True, default_section='General')
-config.read('config.ini')
-queryAPI = config.get('General', 'queryAPI', fallback='ipify').strip('",')
-
-LearningBehaviors = {
-    option: [parse(v) for v in config.get('LearningBehavior', option, fallback='').strip('",[] ').replace(' ', '').split(',')]
-    for option in config.options('LearningBehavior')
-    if option != 'enabled' and config.get('LearningBehavior', option, fallback='').strip('",[] ').startswith('True')
-}
+# Load configuration (validated once, reused from the precompiled snapshot when unchanged)
+config = settings.load('config.ini')
+queryAPI = config.general.query_api
+
+LearningBehaviors = config.learning_behavior
+
+# TTL-respecting cache for API hostname lookups, installed when the updater starts (None when `[General] dnsCache` is off)
+Resolver: Optional[ResolverCache] = None
 
 def initialize_api() -> tuple[dict[str, Any], dict[str, dict[str, list[str]]]]:
     apis: dict[str, Any] = {}
     object_fqdn: dict[str, dict[str, list[str]]] = {}
 
-    section = [
-        _ for _ in config.sections()
-        if _ and config.getboolean(_, "enabled", fallback=False)
-    ]
-
-    for _ in section:
-        credentials = {
-            "email": config.get(_, "email", fallback="").strip('",'),
-            "password": config.get(_, "password", fallback="").strip('",')
-        }
-        cache = {
-            "cache_timeout": config.getint(_, "cacheTimeout", fallback=172800),
-            "cache_persistent": config.getboolean(_, "cachePersistent", fallback=False)
-        }
-
-        object_fqdn[_] = json.loads(config.get(_, "FQDN").strip("',"))
-        apis[_] = globals()[_](**credentials, **cache)
+    for _, provider in config.enabled_providers.items():
+        object_fqdn[_] = provider.fqdn
+        apis[_] = globals()[_](**provider.kwargs())
 
     return apis, object_fqdn
 
 # Initialize APIs
 APIs, ObjectFQDNs = initialize_api()
 
-async def call(instance: Any, fqdns: list[str], content: str) -> None:
-    """Update DNS records for a given API."""
+def fingerprint(object_name: str) -> str:
+    """Identity of a provider's configuration; warm state is only restored into an unchanged provider."""
+    return hashlib.sha256(repr(config.providers[object_name]).encode()).hexdigest()
+
+def restore_providers(state: dict[str, Any]) -> None:
+    """Restore each provider's exported state, skipping providers whose configuration has changed since."""
+    for _, saved in state.get('providers', {}).items():
+        if _ in APIs and saved.get('fingerprint') == fingerprint(_) and hasattr(APIs[_], 'restore_state'):
+            APIs[_].restore_state(saved['state'])
+
+# Warm state saved by the previous graceful shutdown, read once at startup
+WarmState = warmstate.load()
+restore_providers(WarmState)
+
+# Active/standby lease shared with the other replicas (None when [Leadership] is disabled)
+Leader = Lease(config.leadership.path, config.general.node_id or socket.gethostname(), config.leadership.duration) if config.leadership.enabled else None
+# Warm state the leader shares with the standbys, and the digest of the state it last wrote there
+SharedState = f'{config.leadership.path}.state'
+SharedDigest: Optional[bytes] = None
+
+# Provider updates currently running, drained on shutdown
+InFlight: set[asyncio.Task] = set()
+# Worker processes for sharded publishing, created on first use (see `shard_pool`)
+Shards: Optional[ShardPool] = None
+
+def shard_pool(object_name: str) -> Optional[ShardPool]:
+    """The shard pool when `[General] workers` > 1 and `object_name` updates record by record, else None."""
+    global Shards
+    if config.general.workers <= 1 or isinstance(APIs[object_name], DynDNS2):
+        return None
+    if Shards is None:
+        Shards = ShardPool(config.general.workers, [_ for _ in APIs if not isinstance(APIs[_], DynDNS2)], config.general.shard_concurrency, config.general.dns_cache)
+    return Shards
+
+# Fire-and-forget tasks, referenced here until they finish
+Background: set[asyncio.Task] = set()
+
+# Bounded store for full `ifconfig` responses (None when `[General] dumpCapacity` is 0)
+Dumps = RingStore('.dumps/ifconfig.ring', config.general.dump_capacity) if config.general.dump_capacity > 0 else None
+
+# Append-only log of detected addresses and record update outcomes (None when `[General] history` is off)
+AddressHistory = History('.dumps/history.log') if config.general.history else None
+
+# Record type mapped to its key in `inet_address_object`
+IP_VERSIONS = {'A': 'Iv4', 'AAAA': 'Iv6'}
+
+# Hostnames pointed at health-checked candidates by [Failover] rather than at the detected address
+FailoverNames = {fqdn.lower() for fqdn in config.failover.records}
+
+def read_found_address() -> Optional[dict[str, Any]]:
+    """The last detected public address persisted in `.dumps/found_address`."""
+    try:
+        with open('.dumps/found_address', 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def record_targets(object_name: str, record: str, address: Optional[str], hostnames: Optional[set[str]] = None, sources: Optional[dict[str, Any]] = None) -> dict[str, list[str]]:
+    """
+    Content mapped to the hostnames of `object_name` that should hold it, for one detected `address`.
+
+    Hostnames listed under a named source (e.g. "A@wan2") start from that source's address in
+    `sources` instead, and are left out while it is unknown. AAAA hostnames with a suffix get their
+    own address, combined from that prefix and `[General] prefixLength`; every other hostname gets
+    the address itself. Hostnames managed by `[Failover]` are left out, they follow their
+    healthiest candidate instead.
+
+    Args:
+        object_name (str): The provider section name.
+        record (str): 'A' or 'AAAA'.
+        address (str, optional): The detected (or pushed) address of the default source.
+        hostnames (set[str], optional): Lower-cased hostnames to restrict the result to.
+        sources (dict[str, Any], optional): Named sources mapped to their `Iv4`/`Iv6` addresses.
+
+    Returns:
+        dict[str, list[str]]: Content mapped to hostnames, ready for batched updates.
+    """
+    provider = config.providers[object_name]
+    suffixes = provider.suffixes if record == 'AAAA' else {}
+    bases: dict[str, list[str]] = {}
+    for fqdn in ObjectFQDNs[object_name].get(record, []):
+        if (hostnames is not None and fqdn.lower() not in hostnames) or fqdn.lower() in FailoverNames:
+            continue
+        source = provider.sources.get((fqdn, record))
+        base = ((sources or {}).get(source) or {}).get(IP_VERSIONS[record]) if source else address
+        if base:
+            bases.setdefault(base, []).append(fqdn)
+
+    targets: dict[str, list[str]] = {}
+    for base, fqdns in bases.items():
+        derived = prefix.expand(base, config.general.prefix_length, {fqdn: suffixes[fqdn] for fqdn in fqdns if fqdn in suffixes}) if suffixes else {}
+        derived.setdefault(base, []).extend(fqdn for fqdn in fqdns if fqdn not in suffixes)
+        for content, names in derived.items():
+            if names:
+                targets.setdefault(content, []).extend(names)
+    return targets
+
+async def call(instance: Any, fqdns: list[str], content: str, results: Optional[dict[tuple[str, str], Optional[Exception]]] = None) -> dict[tuple[str, str], Optional[Exception]]:
+    """
+    Update DNS records for a given API, off the event loop.
+
+    One outcome is recorded per `(fqdn, record type)` in `results` as soon as it is known, so a
+    caller cancelling this coroutine on a deadline still sees the records that were done.
+    None means the record holds `content`, an exception means it was not updated; `UpdateSkipped`
+    marks a record deliberately left alone, which is not retried.
+    """
     sync_logger = Logger(instance.__class__.__name__)
-    if not instance: return
-    
-    for fqdn in fqdns:
+    results = {} if results is None else results
+    if not instance: return results
+    record = 'A' if ip_address(content).version == 4 else 'AAAA'
+
+    # dyndns2 providers take every hostname of a credential in one batched request
+    if isinstance(instance, DynDNS2):
+        sync_logger.log(f"Updating records: {', '.join(fqdns)} -> {content}")
+        statuses: dict[str, str] = {}
+        error: Optional[Exception] = None
+        try:
+            statuses = await asyncio.to_thread(instance.update, fqdns, content)
+        except Exception as e:
+            error = e
+        for fqdn in fqdns:
+            # Blocked hostnames and the server's backoff are skipped, not failed: retrying at once would
+            # re-send the hostnames already updated, which is what the backoff is there to prevent
+            outcome = instance.outcome(fqdn, statuses.get(fqdn))
+            results[(fqdn, record)] = error if error and isinstance(outcome, ConnectionError) else outcome
+        return results
+
+    # Skip records the authoritative nameservers already answer with the desired content
+    pending = fqdns
+    if getattr(instance, 'verifier', None):
+        pending = await instance.unverified(fqdns, record, content)
+        results.update({(fqdn, record): None for fqdn in fqdns if fqdn not in pending})
+
+    for fqdn in pending:
         sync_logger.log(f"Updating record: {fqdn} -> {content}")
-        if ip_address(content).version.__eq__(4):
-            instance.A(fqdn, content)
-        elif ip_address(content).version.__eq__(6):
-            instance.AAAA(fqdn, content)
+        try:
+            await asyncio.to_thread(getattr(instance, record), fqdn, content)
+            results[(fqdn, record)] = None
+        except UpdateSkipped as e:
+            sync_logger.log(f"Skipped record '{fqdn}': {e}")
+            results[(fqdn, record)] = e
+        except Exception as e:
+            sync_logger.log(f"Failed to update record '{fqdn}': {e}", 40)
+            results[(fqdn, record)] = e
+    return results
+
+async def publish(object_name: str, addresses: dict[str, Optional[str]], hostnames: Optional[set[str]] = None, sources: Optional[dict[str, Any]] = None) -> dict[tuple[str, str], Optional[Exception]]:
+    """
+    Publish `addresses` ({'A': ..., 'AAAA': ...}) through one provider within its `deadline`.
+
+    Args:
+        object_name (str): The provider section name.
+        addresses (dict[str, Optional[str]]): Record type mapped to the default source's address.
+        hostnames (set[str], optional): Lower-cased hostnames to restrict the update to.
+        sources (dict[str, Any], optional): Named sources mapped to their `Iv4`/`Iv6` addresses.
+
+    Returns:
+        dict[tuple[str, str], Optional[Exception]]: One outcome per `(fqdn, record type)`, see `call`.
+    """
+    jobs = [
+        (record, content, fqdns)
+        for record, address in addresses.items()
+        for content, fqdns in record_targets(object_name, record, address, hostnames, sources).items()
+    ]
+    return await dispatch(object_name, jobs)
+
+async def dispatch(object_name: str, jobs: list[tuple[str, str, list[str]]], sharded: bool = True) -> dict[tuple[str, str], Optional[Exception]]:
+    """
+    Run `(record type, content, fqdns)` jobs through one provider within its `deadline`.
+
+    The deadline bounds every HTTP request the provider makes; when it passes, the provider's
+    work is cancelled and its unfinished records are reported as timed out.
+    With `[General] workers` > 1, per-record providers run on the zone-sharded worker pool,
+    unless `sharded` is False: audit repairs stay on the in-process provider, whose cache the
+    audit has just corrected.
+
+    Returns:
+        dict[tuple[str, str], Optional[Exception]]: One outcome per `(fqdn, record type)`, see `call`.
+    """
+    limit = config.providers[object_name].deadline or None
+    results: dict[tuple[str, str], Optional[Exception]] = {}
+
+    # Fencing: only the lease holder writes, and no write may outlive the lease
+    if Leader:
+        if not await asyncio.to_thread(Leader.fence):
+            for record, _, fqdns in jobs:
+                results.update({(fqdn, record): PermissionError(f"Record '{fqdn}' not updated, this replica does not hold the lease.") for fqdn in fqdns})
+            return results
+        limit = min(limit or math.inf, Leader.remaining())
+
+    task = asyncio.current_task()
+    InFlight.add(task)
+    shards = shard_pool(object_name) if sharded else None
+    with deadline.scope(limit):
+        try:
+            if shards:
+                work = shards.publish(object_name, APIs[object_name], config.providers[object_name].kwargs(), [job for job in jobs if job[2]], limit)
+                results.update(await asyncio.wait_for(work, limit))
+            else:
+                await asyncio.wait_for(asyncio.gather(*(
+                    call(APIs[object_name], fqdns, content, results) for _, content, fqdns in jobs if fqdns
+                )), limit)
+        except TimeoutError:
+            logger.log(f"{object_name} missed its {limit}s deadline, remaining records cancelled.", 30)
+        finally:
+            InFlight.discard(task)
+
+    for record, content, fqdns in jobs:
+        for fqdn in fqdns:
+            results.setdefault((fqdn, record), TimeoutError(f"Record '{fqdn}' not updated before the {limit}s deadline."))
+            if AddressHistory:
+                AddressHistory.outcome(fqdn, record, content, results[(fqdn, record)], object_name)
+    return results
+
+def build_responder() -> Optional[DNSResponder]:
+    options = config.dns_responder
+    if not options.enabled: return None
+
+    names: dict[str, list[str]] = {}
+    suffixes: dict[str, int] = {}
+    sources: dict[tuple[str, str], str] = {}
+    for _, fqdns in ObjectFQDNs.items():
+        for record, hostnames in fqdns.items():
+            names.setdefault(record, []).extend(hostnames)
+        suffixes.update(config.providers[_].suffixes)
+        sources.update(config.providers[_].sources)
+
+    responder = DNSResponder(
+        names, ttl=options.ttl, host=options.listen, port=options.port,
+        suffixes=suffixes, prefix_length=config.general.prefix_length, sources=sources
+    )
+    found_address = read_found_address()
+    if found_address:
+        responder.update(found_address)
+    return responder
+
+# Embedded DNS responder serving the FQDN lists from memory (None when disabled)
+Responder = build_responder()
+
+async def push(hostnames: list[str], content: str) -> dict[str, str]:
+    """Fan an address pushed by a router out to every provider managing the requested hostnames."""
+    record = 'A' if ip_address(content).version == 4 else 'AAAA'
+    results = {hostname: 'nohost' for hostname in hostnames}
+    if Responder:
+        Responder.update({**Responder.addresses_object(), "Iv4" if record == 'A' else "Iv6": content})
+
+    requested = set(results)
+    outcomes = await asyncio.gather(*(publish(object_name, {record: content}, requested) for object_name in APIs))
+    for outcome in outcomes:
+        for (fqdn, _), error in outcome.items():
+            if error is not None:
+                logger.log(f"Push for '{fqdn}' {'skipped' if isinstance(error, UpdateSkipped) else 'failed'}: {error}", 30 if isinstance(error, UpdateSkipped) else 40)
+            if results[fqdn.lower()] != '911':
+                # A blocked or known-missing name answers `nohost`, a backoff or a failure `911`
+                skipped = isinstance(error, UpdateSkipped) and not isinstance(error, UpdateDeferred)
+                results[fqdn.lower()] = f"good {content}" if error is None else 'nohost' if skipped else '911'
+    return results
+
+async def failover(changes: dict[str, str]) -> dict[str, bool]:
+    """Move failover records to their newly selected candidates through every provider listing them."""
+    outcome = {fqdn: True for fqdn in changes}
+    wanted = {fqdn.lower(): fqdn for fqdn in changes}
+    owners, tasks = [], []
+    for object_name in APIs:
+        groups: dict[tuple[str, str], list[str]] = {}
+        for record, fqdns in ObjectFQDNs[object_name].items():
+            for fqdn in fqdns:
+                name = wanted.get(fqdn.lower())
+                if name and (record == 'A') == (ip_address(changes[name]).version == 4):
+                    groups.setdefault((record, changes[name]), []).append(fqdn)
+        if groups:
+            owners.append(object_name)
+            tasks.append(dispatch(object_name, [(record, content, fqdns) for (record, content), fqdns in groups.items()]))
+
+    listed = set()
+    for object_name, results in zip(owners, await asyncio.gather(*tasks)):
+        for (fqdn, _), error in results.items():
+            listed.add(fqdn.lower())
+            if error is not None:
+                logger.log(f"Failover of '{fqdn}' through {object_name} failed: {error}", 40)
+                outcome[wanted[fqdn.lower()]] = False
+    for fqdn in changes:
+        if fqdn.lower() not in listed:
+            logger.log(f"Failover record '{fqdn}' is not listed in any provider's FQDN, nothing to update.", 30)
+
+    if Responder:
+        Responder.pin({fqdn: content for fqdn, content in changes.items() if outcome[fqdn]})
+    return outcome
+
+def update_server() -> UpdateServer:
+    options = config.update_server
+    return UpdateServer(push, options.username, options.password, host=options.listen, port=options.port)
+
+def expected_records(object_name: str, found_address: dict[str, Any]) -> dict[tuple[str, str], str]:
+    """The content every `(fqdn, record type)` of a provider should hold for `found_address`."""
+    return {
+        (fqdn, record): content
+        for record, ip_ver in IP_VERSIONS.items()
+        for content, fqdns in record_targets(object_name, record, found_address.get(ip_ver), sources=found_address.get('sources')).items()
+        for fqdn in fqdns
+    }
+
+async def audit(name: str, instance: Any, interval: int, repair: bool) -> NoReturn:
+    """
+    Slow-cadence drift audit of one provider against the last published address, on the lease holder only and within the provider's `deadline`.
+
+    With `repair`, drifted records are rewritten through `dispatch` like any other update, so every
+    write is fenced and bounded again and its outcome lands in the history.
+    """
+    audit_logger = Logger(f"{name}Audit")
+    while True:
+        await asyncio.sleep(interval)
+        found_address = read_found_address()
+        if not found_address: continue
+
+        # Only the lease holder audits: a standby repairing drift would overwrite the leader's writes
+        if Leader and not await asyncio.to_thread(Leader.fence):
+            continue
+        limit = config.providers[name].deadline or None
+        if Leader:
+            limit = min(limit or math.inf, Leader.remaining())
+
+        expected = expected_records(name, found_address)
+        try:
+            with deadline.scope(limit):
+                drift = await asyncio.to_thread(instance.audit, expected)
+            audit_logger.log(f"Audit completed, {len(drift)} of {len(expected)} records drifted.")
+        except Exception as e:
+            audit_logger.exception(e)
+            continue
+        if repair:
+            await repair_drift(name, drift)
+
+async def repair_drift(name: str, drift: list[dict[str, Any]]) -> dict[tuple[str, str], Optional[Exception]]:
+    """
+    Rewrite the drifted records an audit of provider `name` found, through `dispatch`.
+
+    Missing records are only reported by the audit: creating them is left to the user.
+
+    Returns:
+        dict[tuple[str, str], Optional[Exception]]: One outcome per repaired `(fqdn, record type)`, see `call`.
+    """
+    audit_logger = Logger(f"{name}Audit")
+    groups: dict[tuple[str, str], list[str]] = {}
+    for entry in drift:
+        if entry["found"] is not None:
+            groups.setdefault((entry["type"], entry["expected"]), []).append(entry["name"])
+    if not groups:
+        return {}
+    results = await dispatch(name, [(record, content, fqdns) for (record, content), fqdns in groups.items()], sharded=False)
+    for (fqdn, record), error in results.items():
+        if error is not None:
+            audit_logger.log(f"Audit: {record} record '{fqdn}' not repaired: {error}", 30)
+    audit_logger.log(f"Audit repaired {sum(error is None for error in results.values())} of {len(results)} drifted record(s).")
+    return results
+
+async def with_services(periodic: Optional[Awaitable[Any]] = None, owner: Optional['AsynchronousPeriodic'] = None) -> Any:
+    """
+    Run `periodic` while the enabled background services (update server, DNS responder, failover,
+    audits, leader election) run alongside it. `owner` is the `AsynchronousPeriodic` behind `periodic`.
+    """
+    services = []
+    if Leader:
+        services.append(asyncio.create_task(Leader.run(
+            lambda promoted: lead(owner, promoted), lambda: follow(owner)
+        )))
+    if config.update_server.enabled:
+        services.append(asyncio.create_task(update_server().serve()))
+    if Responder:
+        services.append(asyncio.create_task(Responder.serve()))
+    if config.failover.enabled:
+        options = config.failover
+        controller = Failover(dict(options.records), options.probe, options.interval, options.timeout, options.rise, options.fall)
+        services.append(asyncio.create_task(controller.run(failover)))
+    for _, provider in config.enabled_providers.items():
+        if provider.audit_interval > 0 and hasattr(APIs[_], 'audit'):
+            services.append(asyncio.create_task(audit(_, APIs[_], provider.audit_interval, provider.audit_repair)))
+
+    try:
+        return await (periodic if periodic is not None else asyncio.gather(*services))
+    finally:
+        for service in services:
+            service.cancel()
+
+async def lead(periodic: Optional['AsynchronousPeriodic'], promoted: bool) -> None:
+    """Leader round: share the warm state with the standbys, and catch up right away after a takeover."""
+    await asyncio.to_thread(share_warm_state, collect_warm_state(periodic), promoted)
+    if promoted and periodic:
+        logger.log("Leading now, syncing without waiting for the schedule.")
+        # Runs beside the lease loop, which has to keep renewing meanwhile
+        catch_up = asyncio.create_task(periodic.sync())
+        Background.add(catch_up)
+        catch_up.add_done_callback(Background.discard)
+
+async def follow(periodic: Optional['AsynchronousPeriodic']) -> None:
+    """Standby round: adopt the leader's shared warm state so a takeover starts with warm caches."""
+    state = await asyncio.to_thread(warmstate.load, SharedState, True)
+    restore_providers(state)
+    if periodic and 'applied' in state:
+        periodic.applied = {_: address for _, address in state['applied'].items() if _ in APIs}
+
+def collect_warm_state(periodic: Optional['AsynchronousPeriodic'] = None) -> dict[str, Any]:
+    """Every component's warm state, as one snapshot for `libs.warmstate`."""
+    state: dict[str, Any] = {
+        'providers': {
+            _: {'fingerprint': fingerprint(_), 'state': instance.export_state()}
+            for _, instance in APIs.items() if hasattr(instance, 'export_state')
+        }
+    }
+    if periodic:
+        state.update(periodic.export_state())
+    return state
+
+def share_warm_state(state: dict[str, Any], force: bool = False) -> bool:
+    """
+    Write `state` to the shared location for the standbys, unless it is what was written last. Blocking.
+
+    Lease rounds come every third of the lease duration while the state only changes with a cycle,
+    so comparing a digest saves rewriting the whole records cache to shared storage each round.
+
+    Returns:
+        bool: Whether the state was written.
+    """
+    global SharedDigest
+    digest = hashlib.sha256(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)).digest()
+    if digest == SharedDigest and not force:
+        return False
+    warmstate.save(state, SharedState, True)
+    SharedDigest = digest
+    return True
+
+def save_warm_state(periodic: Optional['AsynchronousPeriodic'] = None) -> None:
+    """Save every component's warm state for the next start, see `libs.warmstate`."""
+    state = collect_warm_state(periodic)
+    try:
+        warmstate.save(state)
+    except OSError as e:
+        logger.log(f"Failed to save warm state: {e}", 40)
+
+async def run_until_shutdown(work: Awaitable[Any], periodic: Optional['AsynchronousPeriodic'] = None) -> Any:
+    """
+    Run `work` until it returns or SIGTERM/SIGINT arrives. On a signal, provider updates already
+    in flight get `[General] shutdownGrace` seconds to finish before everything is cancelled.
+    Either way the warm state is saved last.
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Signal handlers are unavailable on Windows event loops, Ctrl+C still raises KeyboardInterrupt
+
+    main_task = asyncio.ensure_future(work)
+    stopped = asyncio.create_task(stop.wait())
+    try:
+        await asyncio.wait({main_task, stopped}, return_when=asyncio.FIRST_COMPLETED)
+        if main_task.done():
+            return main_task.result()
+
+        grace = config.general.shutdown_grace
+        draining = set(InFlight)
+        logger.log(f"Shutdown requested, draining {len(draining)} in-flight update(s) for up to {grace}s.")
+        if draining:
+            _, pending = await asyncio.wait(draining, timeout=grace)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.log(f"{len(pending)} update(s) still running after {grace}s, cancelled.", 30)
+    finally:
+        stopped.cancel()
+        if not main_task.done():
+            main_task.cancel()
+            await asyncio.gather(main_task, return_exceptions=True)
+        save_warm_state(periodic)
+        if Leader:
+            Leader.release()
+        if Shards:
+            Shards.shutdown()
+
+def since(moment: Optional[float]) -> str:
+    """`moment` as local time with how long ago (or ahead) it is, for the offline commands."""
+    if moment is None:
+        return '-'
+    delta = round(moment - time.time())
+    relative = f"in {timedelta(seconds=delta)}" if delta > 0 else f"{timedelta(seconds=-delta)} ago"
+    return f"{datetime.fromtimestamp(moment).isoformat(sep=' ', timespec='seconds')} ({relative})"
+
+def save_next_run(moment: float) -> None:
+    """Persist when the next cycle is due, for `main.py status`."""
+    try:
+        os.makedirs('.dumps', exist_ok=True)
+        with open('.dumps/next_run', 'w') as f:
+            json.dump({'at': moment}, f)
+    except OSError as e:
+        logger.log(f"Failed to save the next run time: {e}", 30)
+
+def next_run() -> Optional[float]:
+    """When the next cycle is due, as persisted by the running loop, or from the schedule for `unixEpoch`."""
+    try:
+        with open('.dumps/next_run', 'r') as f:
+            moment = json.load(f)['at']
+        if moment > time.time():
+            return moment
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    if config.general.mode in ['unixEpoch', 'unix']:
+        due = build_scheduler(config.general.sync_time).next_due()
+        return due.timestamp() if due else None
+    return None
+
+def latest_outcomes(expected: dict[str, dict[tuple[str, str], str]]) -> dict[tuple[str, str, str], Any]:
+    """The latest history entry of every expected record, keyed `(fqdn, record type, provider)`."""
+    if not AddressHistory:
+        return {}
+    return AddressHistory.latest({(fqdn.lower(), record, _) for _, records in expected.items() for fqdn, record in records})
+
+def status() -> None:
+    """Print addresses, per-record applied content, cache ages and the next run from persisted state, without any API call."""
+    found_address = read_found_address()
+    if not found_address:
+        print("Addresses: none detected yet.")
+    else:
+        print(f"Addresses, detected {since(os.path.getmtime('.dumps/found_address'))}:")
+        for name, found in {'': found_address, **found_address.get('sources', {})}.items():
+            print(f"  {name or 'default':<12} IPv4 {found.get('Iv4') or '-':<16} IPv6 {found.get('Iv6') or '-'}")
+    if Leader:
+        lease = Leader.peek()
+        print(f"Lease: held by '{lease.get('holder', '-')}' (token {lease.get('token', 0)}), expires {since(lease.get('expires'))}" if lease else "Lease: not taken yet")
+    print(f"Next run: {since(next_run())}")
+
+    expected = {_: expected_records(_, found_address) for _ in APIs} if found_address else {_: {} for _ in APIs}
+    latest = latest_outcomes(expected)
+    for object_name, instance in APIs.items():
+        print(f"{object_name}:")
+        for (fqdn, record), content in sorted(expected[object_name].items()):
+            entry = latest.get((fqdn.lower(), record, object_name))
+            applied = f"{entry.ipv4 or entry.ipv6} {entry.outcome} {since(entry.moment)}" if entry else 'no history'
+            if entry and entry.outcome == 'skipped' and hasattr(instance, 'plan'):
+                reason = instance.plan(record, fqdn, content)
+                applied += f" ({reason})" if reason else ''
+            age = instance.cache_age(fqdn, record) if hasattr(instance, 'cache_age') else None
+            cached = f", cached {timedelta(seconds=int(age))} ago" if age is not None else ''
+            print(f"  {fqdn:<32} {record:<4} want {content:<24} applied {applied}{cached}")
+
+def plan() -> int:
+    """
+    Print the writes the next cycle would make, from persisted state and caches alone.
+
+    Mirrors `AsynchronousPeriodic.sync`: a provider whose records all hold the last detected address is
+    skipped, otherwise each record goes to the provider, which may still skip it from its cache.
+
+    Returns:
+        int: Number of planned writes.
+    """
+    found_address = read_found_address()
+    if not found_address:
+        print("No address detected yet: the next cycle writes every record once one is found.")
+        return 0
+    print(f"Assuming the public address detected {since(os.path.getmtime('.dumps/found_address'))} is unchanged "
+          f"(IPv4 {found_address.get('Iv4') or '-'}, IPv6 {found_address.get('Iv6') or '-'}).")
+    if Leader:
+        lease = Leader.peek()
+        if lease.get('holder') != Leader.holder and lease.get('expires', 0) > time.time():
+            print(f"'{lease.get('holder')}' holds the lease: this replica would not write anything.")
+
+    expected = {_: expected_records(_, found_address) for _ in APIs}
+    latest = latest_outcomes(expected)
+    writes = 0
+    for object_name, instance in APIs.items():
+        records = expected[object_name]
+        entries = [latest.get((fqdn.lower(), record, object_name)) for fqdn, record in records]
+        if all(entries):
+            published = all(entry.outcome == 'updated' and (entry.ipv4 or entry.ipv6) == content for entry, content in zip(entries, records.values()))
+        else:
+            published = WarmState.get('applied', {}).get(object_name) == found_address
+        print(f"{object_name}:" + (" already published, skipped" if published else ""))
+        if published:
+            continue
+        if getattr(instance, 'verifier', None):
+            print("  (records the authoritative nameservers already answer correctly will be skipped too)")
+        for (fqdn, record), content in sorted(records.items()):
+            reason = instance.plan(record, fqdn, content) if hasattr(instance, 'plan') else None
+            entry = latest.get((fqdn.lower(), record, object_name))
+            if reason:
+                print(f"  skip   {fqdn:<32} {record:<4} {content} ({reason})")
+            else:
+                held = entry and entry.outcome == 'updated' and (entry.ipv4 or entry.ipv6) == content
+                print(f"  write  {fqdn:<32} {record:<4} {content}" + (" (history says it already holds this, the provider may find nothing to change)" if held else ""))
+                writes += 1
+    print(f"{writes} write(s) planned.")
+    return writes
+
+def build_scheduler(unix_time: float | int) -> Scheduler:
+    """
+    Triggers of the `unixEpoch` mode: `[General] schedule` (or the time of day `unix_time` when empty)
+    for every provider, plus each provider's own `schedule`, which replaces the general one.
+    """
+    scheduler = Scheduler(jitter=config.general.jitter)
+    own = {_: provider.schedule for _, provider in config.enabled_providers.items() if provider.schedule}
+    shared = tuple(_ for _ in APIs if _ not in own)
+
+    if shared or not own:
+        unixl = unixConvert(unix_time)
+        general = config.general.schedule or (f"{unixl[2]:02d}:{unixl[1]:02d}:{unixl[0]:02d}",)
+        for spec in general:
+            scheduler.add(parse_trigger(spec), shared or None)
+    for _, specs in own.items():
+        for spec in specs:
+            scheduler.add(parse_trigger(spec), (_,))
+    return scheduler
 
 class AsynchronousPeriodic:
     """Asynchronous loop for periodic tasks."""
     integrate = 'AsynchronousPeriodic'
     def __init__(self: Self) -> None:
         self.sync_logger = Logger(self.integrate)
+        # Address each provider last published successfully; seeded so a restart does not re-push.
+        found_address = read_found_address()
+        self.applied: dict[str, Any] = {_: found_address for _ in APIs} if found_address else {}
+        if 'applied' in WarmState:
+            self.applied = {_: address for _, address in WarmState['applied'].items() if _ in APIs}
 
-    async def sync(self: Self) -> int:
-        """Run the asynchronous loop with exponential backoff on error."""
+        adaptive = LearningBehaviors.adaptive_interval
+        self.adaptive: Optional[AdaptiveInterval] = AdaptiveInterval(*adaptive, initial=config.general.sync_time) if adaptive else None
+        if self.adaptive and 'adaptive' in WarmState:
+            self.adaptive.restore_state(WarmState['adaptive'])
+
+        # The default source from `[General] queryAPI`, plus one per named uplink; sessions are kept across cycles
+        self.sources = [AddressSource('', queryAPI, dumps=Dumps)] + [
+            AddressSource(_, source.query_api, source.address or None, source.interface or None, Dumps)
+            for _, source in config.general.sources.items()
+        ]
+
+        settle = LearningBehaviors.settle_window
+        self.settle: Optional[Debounce] = Debounce(*settle) if settle else None
+        self.cycle = asyncio.Lock()
+
+    async def sync(self: Self, providers: Optional[list[str]] = None) -> int:
+        """Run the asynchronous loop with exponential backoff on error, for `providers` (default all)."""
+        # One cycle at a time: the settle timer and a promotion catch-up call this beside the loop,
+        # and two cycles must not write the same providers and `found_address` at once.
+        async with self.cycle:
+            return await self.__sync__(providers)
+
+    async def __sync__(self: Self, providers: Optional[list[str]] = None) -> int:
         total_seconds: int = 0
-        timeshift = LearningBehaviors.get('timeshift')
+        timeshift = LearningBehaviors.time_shift
         
         while True:
             try:
-                # Retrieve public IP addresses using the configured API
-                if queryAPI == 'ipify':
-                    ipify_response = ipify(64).get_address(format='text')
-                    if isinstance(ipify_response, dict):
-                        inet_address = [ipify_response.get('ipv4', ''), ipify_response.get('ipv6', '')]
-                    elif isinstance(ipify_response, str):
-                        inet_address = [ipify_response]
-                    else:
-                        raise ValueError("Unexpected response type from ipify API")
-                    
-                elif queryAPI == 'icanhazip':
-                    inet_address = [icanhazip().get().replace('\n', '').strip()]
-                elif queryAPI.split('?')[0] == 'ifconfig':
-
-                    ifinfo = ifconfig(queryAPI.split('?')[-1] if '?' in queryAPI else '/').get()
-                    if isinstance(ifinfo, dict):
-                        ip_addr = ifinfo.get('ip_addr', None)
-                    else:
-                        ip_addr = ifinfo
-                    # Support both single IP and comma-separated list
-                    if ip_addr is not None:
-                        inet_address = [ip.strip() for ip in ip_addr.split(',')] if ',' in ip_addr else [ip_addr]
-                    else:
-                        inet_address = []
-                else:
-                    raise ValueError(f"Unsupported queryAPI: {queryAPI}. Supported APIs are 'ipify', 'icanzip' and 'ifconfig'.")
-                
-                inet_address_object: dict[str, Any] = {
-                    "Iv4": inet_address[0] if inet_address and ip_address(inet_address[0]).version == 4 else None,
-                    "Iv6": inet_address[1] if len(inet_address) > 1 and ip_address(inet_address[1]).version == 6 else None
-                }
-                
-                if not (inet_address_object["Iv4"] or inet_address_object["Iv6"]):
+                # Only the lease holder publishes; standbys follow its shared state
+                if Leader and not Leader.leading and not await asyncio.to_thread(Leader.acquire):
+                    self.sync_logger.log("Standing by, another replica holds the lease.")
+                    return total_seconds or 0
+
+                # Retrieve public IP addresses from every address source at once
+                detected = await detect_all(self.sources)
+                inet_address_object: dict[str, Any] = detected.pop('')
+                if detected:
+                    inet_address_object["sources"] = detected
+
+                if not any(found["Iv4"] or found["Iv6"] for found in (inet_address_object, *detected.values())):
                     self.sync_logger.log("Public IPv4 and IPv6 not retrieved, skipping update", 30)
                     return total_seconds or 0
                 
                 os.makedirs('.dumps', exist_ok=True)
-                try:
-                    with open('.dumps/found_address', 'r') as f:
-                        found_address: dict[str, Any] = json.load(f)
-                        if found_address == inet_address_object:
-                            self.sync_logger.log("Public address is same as before, skipping update")
-                            return total_seconds or 0
-                        f.close()
-                        raise TimeoutError("Public address timed out")
-                except Exception as e:
-
-                    if isinstance(e, (FileNotFoundError, TimeoutError)):
-                        with open('.dumps/found_address', 'w') as f:
-                            json.dump(inet_address_object, f, indent=4)
-                            f.close()
-                    else: raise e
-
-                tasks = []
-                for object_name in APIs:
-                    record_types = {
-                        'A': ('A', 'Iv4'),
-                        'AAAA': ('AAAA', 'Iv6')
-                    }
-                    
-                    for dns_type, (record, ip_ver) in record_types.items():
-                        if dns_type in ObjectFQDNs[object_name] and inet_address_object[ip_ver]:
-                            tasks.append(call(
-                                APIs[object_name],
-                                ObjectFQDNs[object_name][record],
-                                inet_address_object[ip_ver]
-                            ))
-
-                if tasks:
-                    await asyncio.gather(*tasks)
+                found_address = read_found_address()
+
+                # Hold a changed address back until it survives the settle window
+                if self.settle and found_address is not None:
+                    if found_address == inet_address_object:
+                        self.settle.reset()
+                    elif not self.settle.observe(inet_address_object):
+                        self.sync_logger.log(f"Address changed to {inet_address_object}, waiting for it to settle before updating.")
+                        self.settle.arm(self.sync)
+                        return total_seconds or 0
+
+                if Responder:
+                    Responder.update(inet_address_object)
+
+                if found_address != inet_address_object:
+                    with open('.dumps/found_address', 'w') as f:
+                        json.dump(inet_address_object, f, indent=4)
+                    if AddressHistory:
+                        for name, found in {'': inet_address_object, **detected}.items():
+                            AddressHistory.address(name, found["Iv4"], found["Iv6"])
+                    self.applied.clear()
+                if self.adaptive:
+                    self.adaptive.observe(found_address is not None and found_address != inet_address_object)
+
+                # Providers still publishing an older address (all of them after a change)
+                targets = [_ for _ in (providers or APIs) if _ in APIs and self.applied.get(_) != inet_address_object]
+                if not targets:
+                    self.sync_logger.log("Public address is same as before, skipping update")
+                    return total_seconds or 0
+
+                # Every provider runs as its own task under its own deadline, so a slow one holds up no other
+                addresses = {'A': inet_address_object["Iv4"], 'AAAA': inet_address_object["Iv6"]}
+                tasks = {
+                    object_name: asyncio.create_task(publish(object_name, addresses, sources=detected), name=object_name)
+                    for object_name in targets
+                }
+                await asyncio.wait(tasks.values())
+
+                failed = []
+                for object_name, task in tasks.items():
+                    outcomes = task.result().items()
+                    errors = [f"{fqdn} ({record}): {error}" for (fqdn, record), error in outcomes if error is not None and not isinstance(error, UpdateSkipped)]
+                    skipped = [f"{fqdn} ({record}): {error}" for (fqdn, record), error in outcomes if isinstance(error, UpdateSkipped)]
+                    if skipped:
+                        self.sync_logger.log(f"{object_name} skipped {len(skipped)} record(s): {'; '.join(skipped)}")
+                    if errors:
+                        failed.append(object_name)
+                        self.sync_logger.log(f"{object_name} left {len(errors)} record(s) outdated: {'; '.join(errors)}", 30)
+                    elif any(isinstance(error, UpdateDeferred) for _, error in outcomes):
+                        # Not retried now, but targeted again on the next cycle
+                        self.sync_logger.log(f"{object_name} held records back, trying again next cycle.")
+                    else:
+                        self.applied[object_name] = inet_address_object
+                if failed:
+                    # Retried below; providers that succeeded are not targeted again
+                    raise ConnectionError(f"Providers not fully updated: {', '.join(failed)}")
                 return total_seconds
             except Exception as e:
                 self.sync_logger.exception(e)
                 if timeshift:
-                    total_seconds += int(timeshift[1])
+                    total_seconds += timeshift
                     self.sync_logger.log(f"Retrying in {total_seconds} seconds.")
                     await asyncio.sleep(total_seconds)
                     continue
@@ -179,61 +801,166 @@ class AsynchronousPeriodic:
                     break
         return total_seconds
 
+    async def prewarm(self: Self, providers: Optional[list[str]] = None) -> None:
+        """Open the connections of the address sources and of `providers` (default all) ahead of a cycle, off the event loop."""
+        targets = [APIs[_] for _ in (providers or APIs) if _ in APIs and shard_pool(_) is None]
+        warmers = [asyncio.to_thread(_.prewarm) for _ in (*self.sources, *targets)]
+        if Shards:
+            warmers.append(Shards.prewarm())
+        started = time.monotonic()
+        failures = [result for result in await asyncio.gather(*warmers, return_exceptions=True) if isinstance(result, BaseException)]
+        for failure in failures:
+            self.sync_logger.verbose(f"Prewarming a connection failed: {failure!r}")
+        self.sync_logger.verbose(f"Prewarmed {len(warmers) - len(failures)} of {len(warmers)} connection pool(s) in {time.monotonic() - started:.2f}s.")
+
+    def export_state(self: Self) -> dict[str, Any]:
+        """Warm state for `libs.warmstate`: what each provider last published, and the adaptive interval."""
+        state: dict[str, Any] = {'applied': dict(self.applied)}
+        if self.adaptive:
+            state['adaptive'] = self.adaptive.export_state()
+        return state
+
+    async def startup_delay(self: Self) -> None:
+        """Wait a random part of `[General] startupDelay` so a fleet rebooting together does not poll at once."""
+        if config.general.startup_delay > 0:
+            delay = random.uniform(0, config.general.startup_delay)
+            self.sync_logger.log(f"Delaying first cycle by {delay:.2f}s.")
+            await asyncio.sleep(delay)
+
     async def interval(self: Self, sync_time: Union[float, int]) -> NoReturn:
         self.sync_logger.log(f"Starting periodic DNS updates every {sync_time} seconds ({sync_time//60}m).")
         
+        if self.adaptive:
+            self.sync_logger.log(f"Adaptive interval enabled, polling between {self.adaptive.minimum}s and {self.adaptive.maximum}s.")
+
+        general = config.general
+        fraction = node_fraction(general.node_id or None) if general.phase_spread else None
+        if fraction is not None:
+            self.sync_logger.log(f"Phase spreading enabled, this node polls at {fraction:.1%} of every interval.")
+        await self.startup_delay()
+        
         while True:
             start_time = asyncio.get_event_loop().time()
             await self.sync()
             elapsed_time = asyncio.get_event_loop().time() - start_time
-            sync_time = max(0, sync_time - elapsed_time)
+            period = self.adaptive.next_interval() if self.adaptive else sync_time
+            # Align to this node's slot on the period grid, or simply subtract the cycle time
+            sleep_time = next_slot(period, fraction) if fraction is not None else max(0, period - elapsed_time)
+            sleep_time = jittered(sleep_time, general.jitter)
 
-            self.sync_logger.log(f"Cycle completed in {elapsed_time:.2f}s. Sleeping for {sync_time:.2f}s.")
-            await asyncio.sleep(sync_time)
+            self.sync_logger.log(f"Cycle completed in {elapsed_time:.2f}s. Sleeping for {sleep_time:.2f}s.")
+            save_next_run(time.time() + sleep_time)
+            # Wake `[General] prewarm` seconds early to open connections, so the next cycle starts warm
+            if 0 < general.prewarm < sleep_time:
+                woke = time.monotonic() + sleep_time - general.prewarm
+                await asyncio.sleep(sleep_time - general.prewarm)
+                await self.prewarm()
+                sleep_time = max(0.0, general.prewarm - (time.monotonic() - woke))
+            await asyncio.sleep(sleep_time)
 
     async def unix(self: Self, unix_time: float | int) -> NoReturn:
-        unixl = unixConvert(unix_time)
-        self.sync_logger.log(f"Starting periodic DNS updates at {unixl[2]:02d}:{unixl[1]:02d}:{unixl[0]:02d}. each 24 hours.")
-        
-        while True:
-            now = datetime.now()
-            target_time = now.replace(hour=unixl[2], minute=unixl[1], second=unixl[0], microsecond=0)
-            
-            if now >= target_time: target_time += timedelta(days=1)
-            time_to_wait = (target_time - now).total_seconds()
-            self.sync_logger.log(f"Waiting {time_to_wait} seconds until {target_time.ctime()}...")
-            await asyncio.sleep(time_to_wait)
-            target_time += timedelta(seconds=await self.sync())
-            self.sync_logger.log("Cycle completed. Sleeping until next scheduled time.")
+        """
+        Sync on a schedule: `[General] schedule` (or the time of day `unix_time` when empty)
+        for every provider, plus each provider's own `schedule`, which replaces the general one.
+        """
+        scheduler = build_scheduler(unix_time)
+
+        async def cycle(providers: Optional[list[str]]) -> int:
+            # Fired triggers have already moved on, so this is the run after the current one
+            save_next_run(scheduler.next_due().timestamp())
+            return await self.sync(providers)
+
+        async def before() -> None:
+            due = scheduler.next_due()
+            providers = sorted({_ for entry in scheduler.entries if entry.due == due for _ in (entry.providers or APIs)})
+            await self.prewarm(providers)
+
+        save_next_run(scheduler.next_due().timestamp())
+        await scheduler.run(cycle, before if config.general.prewarm else None, config.general.prewarm)
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="UDIP Dynamic Updater")
-    parser.add_argument("-m", "--mode", type=str, choices=["unix", "interval", "prefer"], help="The mode of operation for the updater. 'unix' for Unix epoch time, 'interval' for periodic updates, 'prefer' for one-time sync.")
+    parser.add_argument("-m", "--mode", type=str, choices=["unix", "interval", "prefer", "push"], help="The mode of operation for the updater. 'unix' for Unix epoch time, 'interval' for periodic updates, 'prefer' for one-time sync, 'push' for only accepting router pushes.")
     parser.add_argument("-t", "--synctime", type=int, help="The sync time specifies the time between each loop check and update.")
+    commands = parser.add_subparsers(dest="command", metavar="command", help="Inspect stored state instead of running the updater.")
+    dumps_parser = commands.add_parser("dumps", help="Print the most recent ifconfig responses kept in the dump store.")
+    dumps_parser.add_argument("-n", "--limit", type=int, default=10, help="How many entries to print, newest first.")
+    history_parser = commands.add_parser("history", help="Query the address and update history.")
+    history_parser.add_argument("--at", type=datetime.fromisoformat, help="Print the public address current at this time (ISO format).")
+    history_parser.add_argument("--source", type=str, default="", help="Address source for --at, default source when omitted.")
+    history_parser.add_argument("--host", type=str, help="Print when this hostname was last updated, newest first.")
+    history_parser.add_argument("--since", type=datetime.fromisoformat, help="Print every entry from this time on (ISO format).")
+    history_parser.add_argument("--until", type=datetime.fromisoformat, help="Print every entry up to this time (ISO format).")
+    history_parser.add_argument("-n", "--limit", type=int, default=10, help="How many entries to print for --host or without a query, newest first.")
+    commands.add_parser("status", help="Print known addresses, applied records, cache ages and the next run, without any API call.")
+    commands.add_parser("plan", help="Print the writes the next cycle would make, from persisted state and caches alone.")
     args = parser.parse_args()
+
+    if args.command == "status":
+        status()
+        sys.exit(0)
+    if args.command == "plan":
+        plan()
+        sys.exit(0)
+
+    if args.command == "dumps":
+        store = Dumps or RingStore('.dumps/ifconfig.ring')
+        for moment, entry in store.read(args.limit):
+            print(f"{datetime.fromtimestamp(moment).isoformat(sep=' ', timespec='seconds')} {json.dumps(entry)}")
+        sys.exit(0)
+
+    if args.command == "history":
+        log = AddressHistory or History('.dumps/history.log')
+        if args.at:
+            found = log.at(args.at.timestamp(), args.source)
+            entries = [found] if found else []
+        elif args.host:
+            entries = log.changes(args.host, args.limit)
+        elif args.since or args.until:
+            entries = list(log.range(args.since.timestamp() if args.since else 0.0, args.until.timestamp() if args.until else math.inf))
+        else:
+            entries = log.tail(args.limit)
+        for entry in entries:
+            when = datetime.fromtimestamp(entry.moment).isoformat(sep=' ', timespec='seconds')
+            if entry.kind == 'address':
+                print(f"{when} address {entry.source or '-'} {entry.ipv4 or '-'} {entry.ipv6 or '-'}")
+            else:
+                print(f"{when} {entry.kind:<4} {entry.host} -> {entry.ipv4 or entry.ipv6} via {entry.source}: {entry.outcome}")
+        sys.exit(0 if entries else 1)
     
     # Conditional validation
     if args.mode in ["unix", "interval"] and args.synctime is None:
         parser.error(f"--synctime (-t) is required when --mode (-m) is '{args.mode}'")
-    if args.mode == 'prefer' and args.synctime is not None:
-        parser.error("--synctime (-t) is not allowed when --mode (-m) is 'prefer'")
+    if args.mode in ['prefer', 'push'] and args.synctime is not None:
+        parser.error(f"--synctime (-t) is not allowed when --mode (-m) is '{args.mode}'")
 
-    mode = args.mode or config.get("General", "mode").strip('",')
+    mode = args.mode or config.general.mode
     
-    syncTime = math.nan if args.mode in ['prefer'] else args.synctime if args.synctime else config.getint("General", "syncTime", fallback=36000)
+    syncTime = math.nan if args.mode in ['prefer'] else args.synctime if args.synctime else config.general.sync_time
+
+    # Only the running updater resolves API hosts through the cache, the inspection commands above do not
+    if config.general.dns_cache:
+        Resolver = ResolverCache().install()
 
     try:    
         logger.log(f">>====<< {re.sub(r'(?<!^)(?=[A-Z])', ' ', mode).title()} execute >>====<<")
         if mode in ["intervalTime", "interval"]:
-            asyncio.run(AsynchronousPeriodic().interval(syncTime))
+            periodic = AsynchronousPeriodic()
+            asyncio.run(run_until_shutdown(with_services(periodic.interval(syncTime), periodic), periodic))
         elif mode in ["unixEpoch", "unix"]:
             rtime = unixConvert(syncTime)
-            asyncio.run(AsynchronousPeriodic().unix(syncTime))
+            periodic = AsynchronousPeriodic()
+            asyncio.run(run_until_shutdown(with_services(periodic.unix(syncTime), periodic), periodic))
         elif args.mode in ['prefer']:
-            asyncio.run(AsynchronousPeriodic().sync())
+            periodic = AsynchronousPeriodic()
+            asyncio.run(run_until_shutdown(periodic.sync(), periodic))
             logger.log("Preferred one-time sync completed.")
+        elif mode in ["push"]:
+            if not config.update_server.enabled:
+                raise ValueError("mode 'push' requires [UpdateServer] to be enabled in config.ini.")
+            asyncio.run(run_until_shutdown(with_services()))
 
-        else: raise ValueError("mode must be either 'intervalTime' or 'unixEpoch'.")
+        else: raise ValueError("mode must be either 'intervalTime', 'unixEpoch' or 'push'.")
 
         logger.log(">>====<< Execution completed >>====<<", level=10)
     except KeyboardInterrupt as e:
@@ -0,0 +1,12 @@
+import os
+import shutil
+import sys
+import tempfile
+
+# The library modules read config.ini from the working directory on import (through
+# libs.logging), so the suite runs from a scratch directory holding the template.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix='flexidns-tests-')
+shutil.copy(os.path.join(ROOT, 'templates', 'config.ini'), os.path.join(WORKDIR, 'config.ini'))
+os.chdir(WORKDIR)
+sys.path.insert(0, ROOT)
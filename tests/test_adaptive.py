@@ -0,0 +1,56 @@
+import json
+import time
+from datetime import datetime
+
+from libs.scheduler.adaptive import AdaptiveInterval
+
+def interval(tmp_path, **options):
+    return AdaptiveInterval(60, 3600, history_path=str(tmp_path / 'changes.json'), **options)
+
+def test_interval_grows_while_stable_and_drops_on_change(tmp_path):
+    adaptive = interval(tmp_path, initial=300)
+    moment = datetime(2026, 1, 1, 12).timestamp()
+    adaptive.observe(False)
+    assert adaptive.next_interval(moment) == 600
+    for _ in range(5):
+        adaptive.observe(False)
+    assert adaptive.next_interval(moment) == 3600
+    adaptive.observe(True, moment)
+    assert adaptive.next_interval(moment) == 60
+
+def test_initial_is_clamped(tmp_path):
+    assert interval(tmp_path, initial=5).current == 60
+    assert interval(tmp_path, initial=10 ** 6).current == 3600
+    assert interval(tmp_path).current == 3600
+
+def test_changes_persist_across_restarts(tmp_path):
+    adaptive = interval(tmp_path)
+    adaptive.observe(True, 1000.0)
+    adaptive.observe(True, 2000.0)
+    assert json.loads((tmp_path / 'changes.json').read_text()) == [1000.0, 2000.0]
+    assert interval(tmp_path).changes == [1000.0, 2000.0]
+
+def test_hot_hour_is_polled_at_minimum_and_anticipated(tmp_path):
+    adaptive = interval(tmp_path)
+    now = datetime(2026, 3, 10, 1, 0).timestamp()
+    # The ISP reassigns around 03:00 every night
+    adaptive.changes = [datetime(2026, 3, day, 3, 10).timestamp() for day in range(1, 8)]
+    adaptive.current = 3600 * 6
+    assert adaptive.hot_hours(now) == {3}
+    # Two hours ahead the maximum still lands first; closer in, the poll is moved to the hour's start
+    assert adaptive.next_interval(now) == 3600
+    assert adaptive.next_interval(datetime(2026, 3, 10, 2, 30).timestamp()) == 1800
+    assert adaptive.next_interval(datetime(2026, 3, 10, 3, 20).timestamp()) == 60
+
+def test_old_changes_are_ignored(tmp_path):
+    adaptive = interval(tmp_path)
+    now = time.time()
+    adaptive.changes = [now - adaptive.window - 3600 * day for day in range(1, 5)]
+    assert adaptive.hot_hours(now) == set()
+
+def test_state_round_trip_is_clamped(tmp_path):
+    adaptive = interval(tmp_path, initial=60)
+    adaptive.restore_state({'current': 900})
+    assert adaptive.export_state() == {'current': 900}
+    adaptive.restore_state({'current': 10 ** 9})
+    assert adaptive.current == 3600
@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+from libs.api import UpdateSkipped
+from libs.api.cloudflare import CloudFlare
+
+class Response:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = json.dumps(data)
+
+    def json(self):
+        return self.data
+
+class API:
+    """In-memory stand-in for the zones and dns_records endpoints, recording every request."""
+    def __init__(self, zones, records):
+        self.zones = zones
+        self.records = records
+        self.requests = []
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        params = dict(params or {})
+        self.requests.append(('GET', url, params))
+        if url.endswith('/zones'):
+            return Response({'success': True, 'result': [
+                {'id': zone_id, 'name': name, 'name_servers': []} for name, zone_id in self.zones.items() if name == params.get('name')
+            ]})
+        zone_id = url.split('/')[-2]
+        found = [
+            record for record in self.records
+            if record['zone'] == zone_id and params.get('name', record['name']) == record['name'] and params.get('type', record['type']) == record['type']
+        ]
+        if 'page' not in params:
+            return Response({'success': True, 'result': found})
+        per_page, page = params['per_page'], params['page']
+        return Response({
+            'success': True, 'result': found[(page - 1) * per_page:page * per_page],
+            'result_info': {'page': page, 'total_pages': max(1, -(-len(found) // per_page))}
+        })
+
+    def put(self, url, headers=None, json=None, timeout=None):
+        self.requests.append(('PUT', url, json))
+        record = next(record for record in self.records if record['id'] == url.split('/')[-1])
+        record['content'] = json['content']
+        return Response({'success': True, 'errors': [], 'result': record})
+
+    def writes(self):
+        return [request for request in self.requests if request[0] == 'PUT']
+
+def record(record_id, name, record_type, content, zone='z1'):
+    return {'id': record_id, 'zone': zone, 'name': name, 'type': record_type, 'content': content, 'ttl': 1, 'proxied': False}
+
+@pytest.fixture
+def api():
+    return API({'example.com': 'z1'}, [
+        record('r1', 'example.com', 'A', '203.0.113.1'),
+        record('r2', 'www.example.com', 'A', '203.0.113.1'),
+        record('r3', 'www.example.com', 'AAAA', '2001:db8::1'),
+    ])
+
+def cloudflare(api, **options):
+    instance = CloudFlare('admin@example.com', 'token', **options)
+    instance.session = api
+    instance.flight.freshness = 0
+    return instance
+
+def test_missing_record_is_skipped_without_requests_until_it_expires(api):
+    instance = cloudflare(api)
+    with pytest.raises(UpdateSkipped, match='missing.example.com'):
+        instance.A('missing.example.com', '203.0.113.7')
+    count = len(api.requests)
+    with pytest.raises(UpdateSkipped):
+        instance.A('missing.example.com', '203.0.113.7')
+    assert len(api.requests) == count and not api.writes()
+
+    instance.cache.cache_data['negative:A:missing.example.com']['expiry_time'] = 0
+    with pytest.raises(UpdateSkipped):
+        instance.A('missing.example.com', '203.0.113.7')
+    assert len(api.requests) > count
+
+def test_missing_zone_is_skipped(api):
+    instance = cloudflare(api)
+    with pytest.raises(UpdateSkipped, match="Zone 'example.org'"):
+        instance.A('www.example.org', '203.0.113.7')
+    assert instance.cache.is_negative('negative:zone:example.org')
+
+def test_negative_cache_timeout_zero_reports_every_miss(api):
+    instance = cloudflare(api, negative_cache_timeout=0)
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            instance.A('missing.example.com', '203.0.113.7')
+    assert not instance.cache.is_exist('negative:A:missing.example.com')
+
+def test_dual_stack_name_updates_each_record_and_then_trusts_the_cache(api):
+    instance = cloudflare(api)
+    instance.A('www.example.com', '203.0.113.7')
+    instance.AAAA('www.example.com', '2001:db8::7')
+    assert [url.rsplit('/', 1)[-1] for _, url, _ in api.writes()] == ['r2', 'r3']
+    assert instance.cache.select(zone_id='z1') == {'A:www.example.com', 'AAAA:www.example.com'}
+
+    count = len(api.requests)
+    instance.A('www.example.com', '203.0.113.7')
+    instance.AAAA('www.example.com', '2001:db8::7')
+    assert len(api.requests) == count
+
+def test_audit_reports_drift_and_stops_trusting_the_cache(api):
+    instance = cloudflare(api)
+    instance.A('example.com', '203.0.113.7')
+    api.records[0]['content'] = '198.51.100.9'
+    expected = {('example.com', 'A'): '203.0.113.7', ('gone.example.com', 'A'): '203.0.113.7'}
+
+    drift = instance.audit(expected)
+    assert {(entry['name'], entry['found']) for entry in drift} == {('example.com', '198.51.100.9'), ('gone.example.com', None)}
+    # The audit only reports; the next update reaches the API instead of the fast path
+    assert len(api.writes()) == 1
+    instance.A('example.com', '203.0.113.7')
+    assert len(api.writes()) == 2 and api.records[0]['content'] == '203.0.113.7'
+
+def test_listing_is_fetched_page_by_page_as_it_is_consumed():
+    api = API({'example.com': 'z1'}, [record(f'r{_}', f'host{_}.example.com', 'A', f'203.0.113.{_}') for _ in range(5)])
+    listing = cloudflare(api).iter_dns_records('z1', per_page=2)
+    first = next(listing)
+    assert len(api.requests) == 1
+    rest = list(listing)
+    assert [_.id for _ in (first, *rest)] == [f'r{_}' for _ in range(5)]
+    assert [request[2]['page'] for request in api.requests] == [1, 2, 3]
+
+def test_filtered_listing_spans_pages():
+    api = API({'example.com': 'z1'}, [record(f'r{_}', 'example.com', 'A' if _ % 2 else 'AAAA', f'2001:db8::{_}') for _ in range(6)])
+    records = cloudflare(api).get_dns_records('z1', {'type': 'AAAA'})
+    assert [_.id for _ in records] == ['r0', 'r2', 'r4']
+    assert all(request[2]['type'] == 'AAAA' for request in api.requests)
+
+def test_listed_records_keep_only_the_fields_read():
+    api = API({'example.com': 'z1'}, [{**record('r1', 'example.com', 'A', '203.0.113.1'), 'meta': {'auto_added': False}, 'comment': None}])
+    [listed] = cloudflare(api).get_dns_records('z1')
+    assert (listed.id, listed.name, listed.type, listed.content, listed.ttl, listed.proxied, listed.comment) == ('r1', 'example.com', 'A', '203.0.113.1', 1, False, '')
+    assert not hasattr(listed, '__dict__')
+    with pytest.raises(AttributeError):
+        listed.meta = {}
+
+def test_failed_page_raises():
+    class Failing(API):
+        def get(self, url, headers=None, params=None, timeout=None):
+            if (params or {}).get('page') == 2:
+                return Response({'success': False}, 500)
+            return super().get(url, headers, params, timeout)
+    api = Failing({'example.com': 'z1'}, [record(f'r{_}', f'host{_}.example.com', 'A', '203.0.113.1') for _ in range(3)])
+    listing = cloudflare(api).iter_dns_records('z1', per_page=2)
+    assert [_.id for _ in (next(listing), next(listing))] == ['r0', 'r1']
+    with pytest.raises(ConnectionError, match='500'):
+        next(listing)
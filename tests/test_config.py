@@ -0,0 +1,84 @@
+import os
+import pickle
+
+import pytest
+
+from libs import config as settings
+
+def write(tmp_path, text):
+    path = tmp_path / 'config.ini'
+    path.write_text(text)
+    return str(path)
+
+GENERAL = """
+[General]
+    queryAPI = "ipify"
+    mode = "unixEpoch"
+    syncTime = 600
+    schedule = ["07:30"]
+"""
+
+PROVIDER = """
+[CloudFlare]
+    enabled = True
+    email = "admin@example.com"
+    password = "token"
+    FQDN = '{"A": ["example.com"], "AAAA": ["www.example.com"]}'
+"""
+
+def test_options_are_parsed_and_defaulted(tmp_path):
+    config = settings.load(write(tmp_path, GENERAL + PROVIDER), use_snapshot=False)
+    assert config.general.mode == 'unixEpoch' and config.general.sync_time == 600
+    assert config.general.schedule == ('07:30',)
+    assert config.logging == settings.Logging()
+    provider = config.providers['CloudFlare']
+    assert provider.fqdn == {'A': ['example.com'], 'AAAA': ['www.example.com']}
+    assert provider.credentials == {'email': 'admin@example.com', 'password': 'token'}
+    assert provider.request_timeout == 10 and provider.cache_timeout == 172800
+    assert list(config.enabled_providers) == ['CloudFlare']
+
+def test_provider_without_schedule_does_not_copy_general(tmp_path):
+    config = settings.load(write(tmp_path, GENERAL + PROVIDER), use_snapshot=False)
+    assert config.providers['CloudFlare'].schedule == ()
+    config = settings.load(write(tmp_path, GENERAL + PROVIDER + '    schedule = ["@every 900"]\n'), use_snapshot=False)
+    assert config.providers['CloudFlare'].schedule == ('@every 900',)
+
+@pytest.mark.parametrize('text, message', [
+    (GENERAL.replace('"unixEpoch"', '"hourly"'), "[General] mode"),
+    (GENERAL + PROVIDER.replace('password = "token"', ''), "[CloudFlare] password"),
+    (GENERAL + PROVIDER.replace('"A":', '"MX":'), "[CloudFlare] FQDN"),
+    (GENERAL + '[Nope]\n', "Unknown section"),
+])
+def test_invalid_values_name_their_option(tmp_path, text, message):
+    with pytest.raises(settings.ConfigError, match=message.replace('[', r'\[').replace(']', r'\]')):
+        settings.load(write(tmp_path, text), use_snapshot=False)
+
+def test_snapshot_is_reused_until_the_file_changes(tmp_path):
+    path = write(tmp_path, GENERAL)
+    first = settings.load(path)
+    snapshot = settings.snapshot_path(path)
+    assert os.stat(snapshot).st_mode & 0o777 == 0o600
+    assert settings.load(path) == first
+
+    with open(snapshot, 'rb') as f:
+        key, config = pickle.load(f)
+    with open(snapshot, 'wb') as f:
+        pickle.dump((key, settings.Config(path=path)), f)
+    os.chmod(snapshot, 0o600)
+    assert settings.load(path).general.mode == 'intervalTime'
+
+    write(tmp_path, GENERAL.replace('600', '900'))
+    assert settings.load(path).general.sync_time == 900
+
+def test_snapshot_readable_by_others_is_ignored(tmp_path):
+    path = write(tmp_path, GENERAL)
+    settings.load(path)
+    snapshot = settings.snapshot_path(path)
+    with open(snapshot, 'rb') as f:
+        key, _ = pickle.load(f)
+    with open(snapshot, 'wb') as f:
+        pickle.dump((key, settings.Config(path=path)), f)
+    os.chmod(snapshot, 0o664)
+
+    assert settings.load(path).general.mode == 'unixEpoch'
+    assert os.stat(snapshot).st_mode & 0o777 == 0o600
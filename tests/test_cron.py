@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pytest
+
+from libs.converter import CronExpression, Every, TimeOfDay, parse_trigger
+
+def test_step_minutes():
+    cron = CronExpression('*/15 * * * *')
+    assert cron.next_after(datetime(2025, 1, 1, 10, 7, 30)) == datetime(2025, 1, 1, 10, 15)
+    assert cron.next_after(datetime(2025, 1, 1, 10, 45)) == datetime(2025, 1, 1, 11, 0)
+
+def test_next_is_strictly_after():
+    assert CronExpression('30 4 * * *').next_after(datetime(2025, 1, 1, 4, 30)) == datetime(2025, 1, 2, 4, 30)
+
+def test_ranges_lists_and_month_rollover():
+    cron = CronExpression('0 9-17/4 * 2,3 *')
+    assert cron.next_after(datetime(2025, 1, 15)) == datetime(2025, 2, 1, 9, 0)
+    assert cron.next_after(datetime(2025, 2, 1, 9, 0)) == datetime(2025, 2, 1, 13, 0)
+    assert cron.next_after(datetime(2025, 3, 31, 17, 0)) == datetime(2026, 2, 1, 9, 0)
+
+def test_weekday_zero_and_seven_are_sunday():
+    # 2025-01-05 was a Sunday
+    for expression in ('0 0 * * 0', '0 0 * * 7', '@weekly'):
+        assert CronExpression(expression).next_after(datetime(2025, 1, 1)) == datetime(2025, 1, 5)
+
+def test_restricted_day_fields_match_either():
+    # The 10th of the month or any Monday (2025-01-06), whichever comes first
+    assert CronExpression('0 0 10 * 1').next_after(datetime(2025, 1, 1)) == datetime(2025, 1, 6)
+    assert CronExpression('0 0 10 * 1').next_after(datetime(2025, 1, 7)) == datetime(2025, 1, 10)
+
+def test_impossible_date_never_fires():
+    with pytest.raises(ValueError):
+        CronExpression('0 0 31 2 *').next_after(datetime(2025, 1, 1))
+
+@pytest.mark.parametrize('expression', ['* * * *', '60 * * * *', '* 24 * * *', 'a * * * *', '*/0 * * * *'])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+def test_parse_trigger_forms():
+    assert isinstance(parse_trigger('07:30'), TimeOfDay)
+    assert parse_trigger('07:30:15').next_after(datetime(2025, 1, 1, 8)) == datetime(2025, 1, 2, 7, 30, 15)
+    assert isinstance(parse_trigger('@every 90'), Every)
+    assert parse_trigger('@every 90').next_after(datetime(2025, 1, 1)) == datetime(2025, 1, 1, 0, 1, 30)
+    assert isinstance(parse_trigger('@daily'), CronExpression)
+    for spec in ('@every', '25:00', '@every soon'):
+        with pytest.raises(ValueError):
+            parse_trigger(spec)
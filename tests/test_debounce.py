@@ -0,0 +1,60 @@
+import asyncio
+
+from libs.debounce import Debounce
+
+def test_value_is_confirmed_after_enough_observations():
+    debounce = Debounce(observations=3)
+    assert not debounce.observe('1.1.1.1', 0)
+    assert not debounce.observe('1.1.1.1', 1)
+    assert debounce.observe('1.1.1.1', 2)
+    assert debounce.candidate is None
+
+def test_value_is_confirmed_after_settle_window():
+    debounce = Debounce(seconds=60)
+    assert not debounce.observe('1.1.1.1', 100)
+    assert debounce.remaining(130) == 30
+    assert not debounce.observe('1.1.1.1', 159)
+    assert debounce.observe('1.1.1.1', 160)
+
+def test_flapping_value_restarts_the_window():
+    debounce = Debounce(seconds=60, observations=3)
+    assert not debounce.observe('1.1.1.1', 0)
+    assert not debounce.observe('1.1.1.1', 10)
+    assert not debounce.observe('2.2.2.2', 50)
+    assert not debounce.observe('1.1.1.1', 70)
+    assert debounce.candidate == '1.1.1.1' and debounce.count == 1
+    assert debounce.remaining(70) == 60
+
+def test_disabled_debounce_confirms_immediately():
+    assert Debounce().observe('1.1.1.1', 0)
+
+def test_armed_timer_fires_once_the_window_elapses():
+    fired = []
+
+    async def scenario():
+        debounce = Debounce(seconds=0.05)
+        debounce.observe('1.1.1.1')
+
+        async def recheck():
+            fired.append(debounce.observe('1.1.1.1'))
+        debounce.arm(recheck)
+        debounce.arm(recheck)  # Already armed, ignored
+        await asyncio.sleep(0.2)
+    asyncio.run(scenario())
+    assert fired == [True]
+
+def test_superseded_value_cancels_the_timer():
+    fired = []
+
+    async def scenario():
+        debounce = Debounce(seconds=0.05)
+        debounce.observe('1.1.1.1')
+
+        async def recheck():
+            fired.append(True)
+        debounce.arm(recheck)
+        await asyncio.sleep(0)
+        debounce.observe('2.2.2.2')
+        await asyncio.sleep(0.2)
+    asyncio.run(scenario())
+    assert fired == []
@@ -0,0 +1,60 @@
+import struct
+from ipaddress import ip_address
+
+import pytest
+
+from libs.dns import AA, CLASS_IN, EDNS_PAYLOAD, QR, RD, TYPES, Record, build_query, decode_name, encode_name, parse_message
+
+def test_encode_name_adds_length_prefixes_and_root():
+    assert encode_name('www.Example.com.') == b'\x03www\x07Example\x03com\x00'
+    assert encode_name('') == b'\x00'
+
+@pytest.mark.parametrize('name', ['a..b', 'x' * 64 + '.com'])
+def test_encode_name_rejects_bad_labels(name):
+    with pytest.raises(ValueError):
+        encode_name(name)
+
+def test_decode_name_follows_compression_pointers():
+    data = b'\x00' * 12 + b'\x07example\x03com\x00' + b'\x03www\xc0\x0c'
+    assert decode_name(data, 12) == ('example.com', 25)
+    assert decode_name(data, 25) == ('www.example.com', 31)
+
+def test_decode_name_rejects_pointer_loops_and_truncation():
+    with pytest.raises(ValueError):
+        decode_name(b'\x00' * 12 + b'\xc0\x0c', 12)
+    with pytest.raises(ValueError):
+        decode_name(b'\x00' * 12 + b'\x05ab', 12)
+
+def test_query_round_trip():
+    query = build_query(0x1234, 'Host.Example.com', TYPES['AAAA'], recursion=True)
+    message = parse_message(query)
+    assert message.id == 0x1234
+    assert message.flags & RD
+    assert message.questions == [('host.example.com', TYPES['AAAA'], CLASS_IN)]
+    assert message.answers == []
+    # The EDNS OPT record advertises the payload size in its class field
+    assert query[-11:] == b'\x00' + struct.pack('!HHIH', TYPES['OPT'], EDNS_PAYLOAD, 0, 0)
+
+def test_query_without_recursion_or_edns():
+    query = build_query(1, 'example.com', TYPES['A'], edns=False)
+    assert struct.unpack_from('!HHHHHH', query) == (1, 0, 1, 0, 0, 0)
+
+def test_response_answers_and_addresses():
+    question = encode_name('example.com') + struct.pack('!HH', TYPES['A'], CLASS_IN)
+    a = b'\xc0\x0c' + struct.pack('!HHIH', TYPES['A'], CLASS_IN, 300, 4) + bytes((203, 0, 113, 7))
+    aaaa = b'\xc0\x0c' + struct.pack('!HHIH', TYPES['AAAA'], CLASS_IN, 60, 16) + ip_address('2001:db8::1').packed
+    ns = b'\xc0\x0c' + struct.pack('!HHIH', TYPES['NS'], CLASS_IN, 60, 2) + b'\xc0\x0c'
+    data = struct.pack('!HHHHHH', 7, QR | AA, 1, 3, 0, 0) + question + a + aaaa + ns
+    message = parse_message(data)
+    assert message.rcode == 0 and message.flags & AA
+    assert [record.ttl for record in message.answers] == [300, 60, 60]
+    assert [record.address for record in message.answers] == [ip_address('203.0.113.7'), ip_address('2001:db8::1'), None]
+    assert message.answers[0] == Record('example.com', TYPES['A'], 300, bytes((203, 0, 113, 7)))
+
+@pytest.mark.parametrize('cut', [5, 20, -2])
+def test_truncated_messages_are_rejected(cut):
+    question = encode_name('example.com') + struct.pack('!HH', TYPES['A'], CLASS_IN)
+    answer = b'\xc0\x0c' + struct.pack('!HHIH', TYPES['A'], CLASS_IN, 300, 4) + bytes(4)
+    data = struct.pack('!HHHHHH', 7, QR, 1, 1, 0, 0) + question + answer
+    with pytest.raises(ValueError):
+        parse_message(data[:cut])
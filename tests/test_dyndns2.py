@@ -0,0 +1,79 @@
+from libs.api import UpdateDeferred, UpdateSkipped
+from libs.api.dyndns2 import DynDNS2
+
+class Response:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+class Session:
+    """Answers each request with the next scripted body and records the hostnames sent."""
+    def __init__(self, *bodies):
+        self.bodies = list(bodies)
+        self.sent = []
+
+    def get(self, url, params=None, timeout=None):
+        self.sent.append(params['hostname'].split(','))
+        return Response(self.bodies.pop(0))
+
+class Provider(DynDNS2):
+    update_url = 'https://dyndns.example/nic/update'
+
+def provider(*bodies):
+    instance = Provider('user', 'secret')
+    instance.session = Session(*bodies)
+    return instance
+
+def test_hostnames_are_batched_and_paired_with_their_status():
+    instance = provider('good 203.0.113.7\nnochg 203.0.113.7', 'good 203.0.113.7')
+    instance.max_hostnames = 2
+    statuses = instance.update(['a.example.com', 'b.example.com', 'c.example.com'], '203.0.113.7')
+    assert instance.session.sent == [['a.example.com', 'b.example.com'], ['c.example.com']]
+    assert statuses == {'a.example.com': 'good 203.0.113.7', 'b.example.com': 'nochg 203.0.113.7', 'c.example.com': 'good 203.0.113.7'}
+    assert all(instance.outcome(host, status) is None for host, status in statuses.items())
+
+def test_host_errors_block_only_that_host():
+    instance = provider('good 203.0.113.7\nnohost', 'good 203.0.113.8')
+    instance.update(['a.example.com', 'b.example.com'], '203.0.113.7')
+    assert instance.blocked == {'b.example.com': 'nohost'}
+    assert instance.update(['a.example.com', 'b.example.com'], '203.0.113.8') == {'a.example.com': 'good 203.0.113.8'}
+    assert instance.session.sent[-1] == ['a.example.com']
+
+def test_server_error_backs_off():
+    instance = provider('911')
+    statuses = instance.update(['a.example.com'], '203.0.113.7')
+    assert instance.backoff_until > 0
+    assert isinstance(instance.outcome('a.example.com', statuses['a.example.com']), UpdateDeferred)
+    assert instance.update(['a.example.com'], '203.0.113.7') == {}
+    assert len(instance.session.sent) == 1
+
+def test_dnserr_backs_off_like_911():
+    instance = provider('dnserr')
+    instance.max_hostnames = 1
+    statuses = instance.update(['a.example.com', 'b.example.com'], '203.0.113.7')
+    assert statuses == {'a.example.com': 'dnserr'}
+    assert instance.backoff_until > 0
+    assert isinstance(instance.outcome('b.example.com', None), UpdateDeferred)
+
+def test_rejected_credential_keeps_earlier_results_and_latches():
+    instance = provider('good 203.0.113.7', 'badauth', 'good 203.0.113.7')
+    instance.max_hostnames = 1
+    statuses = instance.update(['a.example.com', 'b.example.com', 'c.example.com'], '203.0.113.7')
+    assert statuses == {'a.example.com': 'good 203.0.113.7', 'b.example.com': 'badauth'}
+    assert instance.rejected == 'badauth'
+    assert instance.outcome('a.example.com', statuses['a.example.com']) is None
+    assert isinstance(instance.outcome('b.example.com', 'badauth'), UpdateSkipped)
+
+    # Nothing is sent again until restart, and every later outcome is skipped
+    assert instance.update(['c.example.com'], '203.0.113.8') == {}
+    assert len(instance.session.sent) == 2
+    assert isinstance(instance.outcome('c.example.com', None), UpdateSkipped)
+    assert 'rejected' not in instance.export_state()
+
+def test_backoff_survives_restart_but_blocks_do_not():
+    instance = provider('911')
+    instance.update(['a.example.com'], '203.0.113.7')
+    restarted = provider()
+    restarted.restore_state(instance.export_state())
+    assert restarted.backoff_until == instance.backoff_until
+    assert restarted.blocked == {} and restarted.rejected is None
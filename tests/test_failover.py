@@ -0,0 +1,57 @@
+import asyncio
+
+from libs.failover import Failover
+
+PREFERRED, BACKUP = '203.0.113.1', '198.51.100.7'
+
+def controller(rise=2, fall=3):
+    failover = Failover({'www.example.com': (PREFERRED, BACKUP)}, rise=rise, fall=fall)
+    failover.results = {PREFERRED: True, BACKUP: True}
+    async def probe(address):
+        return failover.results[address]
+    failover.__probe__ = probe
+    return failover
+
+def probe_round(failover, **results):
+    failover.results.update({PREFERRED: results.get('preferred', failover.results[PREFERRED]), BACKUP: results.get('backup', failover.results[BACKUP])})
+    changes = asyncio.run(failover.check())
+    failover.selected.update(changes)
+    return changes
+
+def test_candidates_need_rise_successes_at_startup():
+    failover = controller(rise=2)
+    assert probe_round(failover) == {}
+    assert probe_round(failover) == {'www.example.com': PREFERRED}
+    assert probe_round(failover) == {}
+
+def test_one_lucky_probe_does_not_move_the_record():
+    failover = controller(rise=2)
+    assert probe_round(failover, preferred=False) == {}
+    assert probe_round(failover) == {'www.example.com': BACKUP}
+    # The preferred origin answered once, that is not enough
+    assert probe_round(failover, preferred=True) == {}
+    assert probe_round(failover, preferred=True) == {'www.example.com': PREFERRED}
+
+def test_fall_failures_move_to_the_next_candidate():
+    failover = controller(rise=1, fall=3)
+    assert probe_round(failover) == {'www.example.com': PREFERRED}
+    assert probe_round(failover, preferred=False) == {}
+    assert probe_round(failover, preferred=False) == {}
+    assert probe_round(failover, preferred=False) == {'www.example.com': BACKUP}
+
+def test_flapping_candidate_does_not_flip():
+    failover = controller(rise=2, fall=2)
+    probe_round(failover)
+    probe_round(failover)
+    for ok in (False, True, False, True, False, True):
+        assert probe_round(failover, preferred=ok) == {}
+    assert failover.selected['www.example.com'] == PREFERRED
+
+def test_no_healthy_candidate_keeps_the_record():
+    failover = controller(rise=1, fall=1)
+    assert probe_round(failover, preferred=False, backup=False) == {}
+    assert failover.choose('www.example.com') is None
+
+    assert probe_round(failover, backup=True) == {'www.example.com': BACKUP}
+    assert probe_round(failover, backup=False) == {}
+    assert failover.choose('www.example.com') == BACKUP
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+
+from libs.api import UpdateDeferred, UpdateSkipped
+from libs.history import RECORD, History
+
+def test_entries_pack_and_unpack(tmp_path):
+    history = History(str(tmp_path / 'history.log'))
+    history.address('ipify', '203.0.113.7', '2001:db8::7', moment=100.0)
+    history.outcome('WWW.example.com', 'AAAA', '2001:db8::7', None, 'cloudflare', moment=101.0)
+    assert history.flush(5)
+    assert os.path.getsize(history.path) == 2 * RECORD.size
+
+    reopened = History(history.path)
+    address, update = reopened.tail(2)[::-1]
+    assert address == (100.0, 'address', 'ipify', None, '203.0.113.7', '2001:db8::7', None)
+    assert update == (101.0, 'AAAA', 'cloudflare', 'www.example.com', None, '2001:db8::7', 'updated')
+
+def test_outcomes_are_classified(tmp_path):
+    history = History(str(tmp_path / 'history.log'))
+    errors = [None, ConnectionError('refused'), TimeoutError(), UpdateSkipped('blocked'), UpdateDeferred('911')]
+    for i, error in enumerate(errors):
+        history.outcome('example.com', 'A', '203.0.113.7', error, moment=float(i))
+    assert [entry.outcome for entry in history.range()] == ['updated', 'failed', 'timeout', 'skipped', 'skipped']
+
+def test_torn_record_is_dropped(tmp_path):
+    history = History(str(tmp_path / 'history.log'))
+    history.address('', '203.0.113.7', None, moment=1.0)
+    assert history.flush(5)
+    with open(history.path, 'ab') as f:
+        f.write(b'\x00' * (RECORD.size // 2))
+    reopened = History(history.path)
+    assert reopened.count == 1
+    assert os.path.getsize(history.path) == RECORD.size
+
+def test_range_and_at_across_index_blocks(tmp_path):
+    history = History(str(tmp_path / 'history.log'))
+    history.stride = 8
+    for i in range(100):
+        history.address('', f'203.0.113.{i}', None, moment=float(i))
+    assert history.flush(5)
+    assert len(history.index) == 13
+    assert [entry.moment for entry in history.range(40.0, 43.0)] == [40.0, 41.0, 42.0, 43.0]
+    assert history.at(57.5).ipv4 == '203.0.113.57'
+    assert history.at(-1.0) is None
+    assert history.at(1e9).ipv4 == '203.0.113.99'
+
+def test_moments_never_go_backwards(tmp_path):
+    history = History(str(tmp_path / 'history.log'))
+    history.address('', '203.0.113.1', None, moment=50.0)
+    history.address('', '203.0.113.2', None, moment=10.0)
+    assert [entry.moment for entry in history.range()] == [50.0, 50.0]
+
+def test_latest_and_changes(tmp_path):
+    history = History(str(tmp_path / 'history.log'))
+    history.outcome('a.example.com', 'A', '203.0.113.1', None, 'cloudflare', moment=1.0)
+    history.outcome('a.example.com', 'A', '203.0.113.2', ConnectionError(), 'cloudflare', moment=2.0)
+    history.outcome('a.example.com', 'A', '203.0.113.3', None, 'cloudflare', moment=3.0)
+    history.outcome('a.example.com', 'A', '203.0.113.4', UpdateSkipped('blocked'), 'dyndns2', moment=4.0)
+
+    latest = history.latest({('a.example.com', 'A', 'cloudflare'), ('a.example.com', 'A', 'dyndns2'), ('b.example.com', 'A', 'cloudflare')})
+    assert latest[('a.example.com', 'A', 'cloudflare')].ipv4 == '203.0.113.3'
+    assert latest[('a.example.com', 'A', 'dyndns2')].outcome == 'skipped'
+    assert ('b.example.com', 'A', 'cloudflare') not in latest
+    assert [entry.ipv4 for entry in history.changes('A.example.com', 5)] == ['203.0.113.3', '203.0.113.1']
+    assert history.changes('b.example.com') == []
+
+def test_events_are_queued_and_written_in_batches(tmp_path, monkeypatch):
+    history = History(str(tmp_path / 'history.log'))
+    release = threading.Event()
+    batches = []
+    write = history.__write__
+    def blocked(batch):
+        release.wait(5)
+        batches.append(len(batch))
+        write(batch)
+    monkeypatch.setattr(history, '__write__', blocked)
+
+    history.address('', '203.0.113.1', None, moment=1.0)
+    # Queuing does not wait for the stuck writer
+    started = time.monotonic()
+    for i in range(50):
+        history.outcome(f'host{i}.example.com', 'A', '203.0.113.1', None, 'cloudflare', moment=2.0)
+    assert time.monotonic() - started < 1
+    assert history.count == 0 and not history.flush(0.1)
+
+    release.set()
+    assert history.flush(5)
+    assert history.count == 51 and sum(batches) == 51 and len(batches) <= 2
+    assert len(History(history.path).tail(100)) == 51
+
+def test_invalid_event_is_dropped_alone(tmp_path):
+    history = History(str(tmp_path / 'history.log'))
+    history.address('', 'not-an-address', None, moment=1.0)
+    history.address('', '203.0.113.7', None, moment=2.0)
+    assert [entry.ipv4 for entry in history.tail()] == ['203.0.113.7']
@@ -0,0 +1,30 @@
+import random
+
+from libs.scheduler.jitter import jittered, next_slot, node_fraction
+
+def test_node_fraction_is_stable_per_node():
+    assert node_fraction('node-a') == node_fraction('node-a')
+    assert node_fraction('node-a') != node_fraction('node-b')
+    assert all(0 <= node_fraction(f'node-{_}') < 1 for _ in range(100))
+
+def test_node_fractions_spread_across_the_period():
+    fractions = [node_fraction(f'node-{_}') for _ in range(400)]
+    quarters = [sum(1 for _ in fractions if q / 4 <= _ < (q + 1) / 4) for q in range(4)]
+    assert min(quarters) > 60
+
+def test_next_slot_lands_on_the_node_grid():
+    for moment in (0.0, 1000.0, 1234.5, 1799.9):
+        wait = next_slot(600, 0.25, moment)
+        assert 0 < wait <= 600
+        assert (moment + wait - 150) % 600 == 0
+
+def test_next_slot_on_the_slot_waits_a_full_period():
+    assert next_slot(600, 0.25, 750.0) == 600
+
+def test_jittered_stays_within_bounds():
+    random.seed(1)
+    values = [jittered(10, 3) for _ in range(1000)]
+    assert all(7 <= _ <= 13 for _ in values)
+    assert min(values) < 8 and max(values) > 12
+    assert all(_ >= 0 for _ in (jittered(1, 5) for _ in range(100)))
+    assert jittered(10, 0) == 10
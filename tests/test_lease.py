@@ -0,0 +1,48 @@
+import json
+import time
+
+from libs.lease import Lease
+
+def test_first_holder_takes_free_lease(tmp_path):
+    lease = Lease(str(tmp_path / 'lease'), 'a', duration=30)
+    assert lease.acquire() is True
+    assert lease.leading and lease.token == 1
+    assert lease.peek()['holder'] == 'a'
+
+def test_second_holder_stands_by_while_lease_is_held(tmp_path):
+    a = Lease(str(tmp_path / 'lease'), 'a', duration=30)
+    b = Lease(str(tmp_path / 'lease'), 'b', duration=30)
+    assert a.acquire() is True
+    assert b.acquire() is False
+    assert not b.leading and b.remaining() == 0.0
+    # Renewing keeps the same fencing token
+    assert a.acquire() is True and a.token == 1
+
+def test_takeover_after_expiry_fences_former_leader(tmp_path):
+    path = str(tmp_path / 'lease')
+    a = Lease(path, 'a', duration=30)
+    b = Lease(path, 'b', duration=30)
+    assert a.acquire()
+    # Let the recorded lease run out without `a` noticing
+    with open(path, 'r') as f:
+        lease = json.load(f)
+    with open(path, 'w') as f:
+        json.dump({**lease, 'expires': time.time() - 1}, f)
+
+    assert b.acquire() is True and b.token == 2
+    # `a` still trusts its lease locally, but the fence check against the file refuses it
+    assert a.leading
+    assert a.fence() is False
+    assert not a.leading
+    assert b.fence() is True
+
+def test_release_lets_standby_take_over_at_once(tmp_path):
+    a = Lease(str(tmp_path / 'lease'), 'a', duration=30)
+    b = Lease(str(tmp_path / 'lease'), 'b', duration=30)
+    assert a.acquire()
+    a.release()
+    assert a.token == 0
+    assert b.acquire() is True and b.token == 2
+
+def test_fence_without_lease_is_refused(tmp_path):
+    assert Lease(str(tmp_path / 'lease'), 'a').fence() is False
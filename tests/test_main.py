@@ -0,0 +1,109 @@
+import asyncio
+import os
+
+import pytest
+
+import main
+from libs.history import History
+from test_cloudflare import API, cloudflare, record
+
+@pytest.fixture
+def provider(monkeypatch, tmp_path):
+    api = API({'example.com': 'z1'}, [record('r1', 'example.com', 'A', '203.0.113.1'), record('r2', 'www.example.com', 'A', '203.0.113.1')])
+    monkeypatch.setattr(main, 'APIs', {'CloudFlare': cloudflare(api)})
+    monkeypatch.setattr(main, 'AddressHistory', History(str(tmp_path / 'history.log')))
+    monkeypatch.setattr(main, 'Leader', None)
+    return api
+
+def test_audit_repairs_go_through_dispatch(provider):
+    instance = main.APIs['CloudFlare']
+    instance.A('example.com', '203.0.113.7')
+    provider.records[0]['content'] = '198.51.100.9'
+    drift = instance.audit({('example.com', 'A'): '203.0.113.7', ('gone.example.com', 'A'): '203.0.113.7'})
+
+    results = asyncio.run(main.repair_drift('CloudFlare', drift))
+    assert results == {('example.com', 'A'): None}
+    assert provider.records[0]['content'] == '203.0.113.7'
+    [entry] = main.AddressHistory.changes('example.com')
+    assert (entry.kind, entry.ipv4, entry.source, entry.outcome) == ('A', '203.0.113.7', 'CloudFlare', 'updated')
+
+def test_audit_repairs_are_fenced(provider, monkeypatch):
+    class Standby:
+        def fence(self):
+            return False
+    monkeypatch.setattr(main, 'Leader', Standby())
+    drift = [{'name': 'example.com', 'type': 'A', 'expected': '203.0.113.7', 'found': '198.51.100.9'}]
+    results = asyncio.run(main.repair_drift('CloudFlare', drift))
+    assert isinstance(results[('example.com', 'A')], PermissionError)
+    assert not provider.writes()
+
+def test_shared_warm_state_is_only_rewritten_when_it_changed(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'SharedState', str(tmp_path / 'lease.state'))
+    monkeypatch.setattr(main, 'SharedDigest', None)
+    state = {'applied': {'CloudFlare': {'Iv4': '203.0.113.7', 'Iv6': None}}}
+    assert main.share_warm_state(state) is True
+    (tmp_path / 'lease.state').unlink()
+    assert main.share_warm_state(dict(state)) is False
+    assert not (tmp_path / 'lease.state').exists()
+
+    assert main.share_warm_state(state, force=True) is True
+    assert main.share_warm_state({'applied': {}}) is True
+    assert main.warmstate.load(main.SharedState, True) == {'applied': {}}
+
+def test_provider_warm_state_is_restored_only_into_an_unchanged_provider(provider, monkeypatch):
+    monkeypatch.setattr(main, 'fingerprint', lambda _: 'current')
+    instance = main.APIs['CloudFlare']
+    instance.A('example.com', '203.0.113.7')
+    state = main.collect_warm_state()
+    assert state['providers']['CloudFlare']['fingerprint'] == 'current'
+    assert state['providers']['CloudFlare']['state']['cache']
+
+    restored = cloudflare(API({}, []))
+    monkeypatch.setattr(main, 'APIs', {'CloudFlare': restored})
+    main.restore_providers({'providers': {'CloudFlare': {**state['providers']['CloudFlare'], 'fingerprint': 'stale'}}})
+    assert restored.export_state() == {'cache': {}, 'zone_nameservers': {}}
+    main.restore_providers(state)
+    assert restored.export_state() == state['providers']['CloudFlare']['state']
+
+@pytest.fixture
+def detected(provider, monkeypatch):
+    monkeypatch.setattr(main, 'ObjectFQDNs', {'CloudFlare': {'A': ['example.com', 'www.example.com']}})
+    monkeypatch.setattr(main, 'WarmState', {})
+    os.makedirs('.dumps', exist_ok=True)
+    with open('.dumps/found_address', 'w') as f:
+        f.write('{"Iv4": "203.0.113.7", "Iv6": null}')
+    yield provider
+    os.remove('.dumps/found_address')
+
+def test_plan_without_a_detected_address(provider, capsys):
+    assert main.plan() == 0
+    assert 'No address detected yet' in capsys.readouterr().out
+
+def test_plan_lists_writes_and_cached_skips(detected, capsys):
+    assert main.plan() == 2
+    main.APIs['CloudFlare'].A('example.com', '203.0.113.7')
+    main.AddressHistory.outcome('example.com', 'A', '203.0.113.7', None, 'CloudFlare')
+    capsys.readouterr()
+
+    assert main.plan() == 1
+    out = capsys.readouterr().out
+    assert 'skip   example.com' in out and '(cached content is already up-to-date)' in out
+    assert 'write  www.example.com' in out
+    assert out.rstrip().endswith('1 write(s) planned.')
+
+def test_plan_skips_a_provider_that_already_published(detected, capsys):
+    for fqdn in ('example.com', 'www.example.com'):
+        main.AddressHistory.outcome(fqdn, 'A', '203.0.113.7', None, 'CloudFlare')
+    assert main.plan() == 0
+    assert 'CloudFlare: already published, skipped' in capsys.readouterr().out
+
+def test_status_shows_applied_outcomes_and_cache_ages(detected, capsys):
+    main.APIs['CloudFlare'].A('example.com', '203.0.113.7')
+    main.AddressHistory.outcome('example.com', 'A', '203.0.113.7', None, 'CloudFlare')
+    main.status()
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].split() == ['default', 'IPv4', '203.0.113.7', 'IPv6', '-']
+    [applied] = [_ for _ in lines if _.strip().startswith('example.com')]
+    assert 'want 203.0.113.7' in applied and 'applied 203.0.113.7 updated' in applied and 'cached 0:00:00 ago' in applied
+    [pending] = [_ for _ in lines if _.strip().startswith('www.example.com')]
+    assert pending.rstrip().endswith('applied no history')
@@ -0,0 +1,98 @@
+import json
+
+from libs.RecordsCache import RecordsCache
+
+def record(zone_id, domain_type, record_id):
+    return {'zone_id': zone_id, 'domain_type': domain_type, 'record_id': record_id}
+
+def test_dual_stack_name_keeps_both_records(tmp_path):
+    cache = RecordsCache().build(cache_directory=str(tmp_path))
+    cache.append(RecordsCache.key('WWW.example.com', 'A'), record('z1', 'A', 'r4'))
+    cache.append(RecordsCache.key('www.example.com', 'AAAA'), record('z1', 'AAAA', 'r6'))
+    assert cache.get('A:www.example.com')['record_id'] == 'r4'
+    assert cache.get('AAAA:www.example.com')['record_id'] == 'r6'
+
+def test_select_and_invalidate_follow_the_indexes(tmp_path):
+    cache = RecordsCache().build(cache_directory=str(tmp_path))
+    cache.append('A:a.example.com', record('z1', 'A', '1'))
+    cache.append('AAAA:a.example.com', record('z1', 'AAAA', '2'))
+    cache.append('A:b.example.org', record('z2', 'A', '3'))
+    assert cache.select(zone_id='z1') == {'A:a.example.com', 'AAAA:a.example.com'}
+    assert cache.select(domain_type='A') == {'A:a.example.com', 'A:b.example.org'}
+    assert cache.select(zone_id='z1', domain_type='AAAA') == {'AAAA:a.example.com'}
+    assert cache.select(zone_id='missing') == set()
+
+    assert cache.invalidate(zone_id='z1') == 2
+    assert set(cache.get()) == {'A:b.example.org'}
+    assert cache.select(domain_type='AAAA') == set()
+    assert cache.invalidate() == 0
+
+def test_delete_and_replace_unlink_old_index_entries(tmp_path):
+    cache = RecordsCache().build(cache_directory=str(tmp_path))
+    cache.append('A:a.example.com', record('z1', 'A', '1'))
+    cache.negate('A:a.example.com', 'gone')
+    assert cache.select(zone_id='z1') == set()
+    cache.delete('A:a.example.com')
+    assert cache.by_zone == {} and cache.by_type == {}
+
+def test_bare_fqdn_keys_are_migrated_on_pull(tmp_path):
+    with open(tmp_path / 'records.cache', 'w') as f:
+        json.dump({'www.example.com': record('z1', 'AAAA', 'r6') | {'expiry_time': 1e12}}, f)
+    cache = RecordsCache().build(cache_directory=str(tmp_path))
+    cache.pull()
+    assert set(cache.get()) == {'AAAA:www.example.com'}
+    assert cache.select(zone_id='z1', domain_type='AAAA') == {'AAAA:www.example.com'}
+
+def test_commit_and_pull_round_trip(tmp_path):
+    cache = RecordsCache().build(cache_directory=str(tmp_path))
+    cache.append('A:a.example.com', record('z1', 'A', '1'))
+    cache.commit()
+    assert not (tmp_path / 'records.cache.tmp').exists()
+    restored = RecordsCache().build(cache_directory=str(tmp_path))
+    restored.pull()
+    assert restored.get() == cache.get()
+    assert restored.select(zone_id='z1') == {'A:a.example.com'}
+
+def test_negative_entry_expires(tmp_path, monkeypatch):
+    cache = RecordsCache().build(cache_directory=str(tmp_path), negative_timeout=60)
+    now = 1000.0
+    monkeypatch.setattr('libs.RecordsCache.time.time', lambda: now)
+    cache.negate('A:missing.example.com', 'No DNS record found')
+    assert cache.is_negative('A:missing.example.com')
+    assert cache.get('A:missing.example.com')['reason'] == 'No DNS record found'
+    now += 61
+    assert not cache.is_negative('A:missing.example.com')
+    cache.poke()
+    assert not cache.is_exist('A:missing.example.com')
+
+def test_negative_timeout_zero_stores_nothing(tmp_path):
+    cache = RecordsCache().build(cache_directory=str(tmp_path), negative_timeout=0)
+    cache.append('A:a.example.com', record('z1', 'A', '1'))
+    cache.negate('A:a.example.com')
+    cache.negate('A:missing.example.com')
+    assert not cache.is_negative('A:missing.example.com')
+    assert not cache.is_exist('A:missing.example.com')
+    assert cache.get('A:a.example.com')['record_id'] == '1'
+
+def test_negative_timeout_minus_one_never_expires(tmp_path):
+    cache = RecordsCache().build(cache_directory=str(tmp_path), negative_timeout=-1)
+    cache.negate('A:missing.example.com')
+    assert cache.get('A:missing.example.com')['expiry_time'] == float('inf')
+    cache.poke()
+    assert cache.is_negative('A:missing.example.com')
+
+def test_negative_entries_survive_commit(tmp_path):
+    cache = RecordsCache().build(cache_directory=str(tmp_path))
+    cache.negate('A:missing.example.com', 'gone')
+    cache.commit()
+    restored = RecordsCache().build(cache_directory=str(tmp_path))
+    restored.pull()
+    assert restored.is_negative('A:missing.example.com')
+
+def test_dropping_a_key_twice_is_harmless(tmp_path):
+    cache = RecordsCache().build(cache_directory=str(tmp_path))
+    cache.append('A:a.example.com', record('z1', 'A', '1'))
+    # Two record threads may expire the same entry
+    cache.__drop__('A:a.example.com')
+    cache.__drop__('A:a.example.com')
+    assert cache.is_empty() and cache.by_zone == {}
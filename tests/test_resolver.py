@@ -0,0 +1,100 @@
+import http.server
+import socket
+import socketserver
+import threading
+
+import pytest
+
+from libs.resolver import ResolverCache, prewarm
+
+ANSWER = [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('203.0.113.7', 443))]
+
+@pytest.fixture
+def resolver():
+    cache = ResolverCache(resolv_conf='/nonexistent')
+    calls: list[str] = []
+    def lookup(host, *args):
+        calls.append(host)
+        if cache.failing:
+            raise socket.gaierror('resolver down')
+        return ANSWER
+    cache.failing = False
+    cache.original = lookup
+    cache.calls = calls
+    return cache
+
+def test_answers_are_cached_for_the_ttl(resolver):
+    resolver.ttl = lambda host: 300
+    assert resolver.getaddrinfo('API.example.com.', 443) == ANSWER
+    assert resolver.getaddrinfo('api.example.com', 443) == ANSWER
+    assert resolver.calls == ['API.example.com.']
+
+def test_expired_answer_is_looked_up_again(resolver):
+    resolver.ttl = lambda host: 0
+    resolver.getaddrinfo('api.example.com', 443)
+    resolver.getaddrinfo('api.example.com', 443)
+    assert len(resolver.calls) == 2
+
+def test_expired_answer_is_reused_when_lookup_fails(resolver):
+    resolver.ttl = lambda host: 0
+    resolver.getaddrinfo('api.example.com', 443)
+    resolver.failing = True
+    assert resolver.getaddrinfo('api.example.com', 443) == ANSWER
+
+def test_failure_without_earlier_answer_raises(resolver):
+    resolver.failing = True
+    with pytest.raises(socket.gaierror):
+        resolver.getaddrinfo('api.example.com', 443)
+
+def test_address_literals_bypass_the_cache(resolver):
+    resolver.getaddrinfo('127.0.0.1', 80)
+    resolver.getaddrinfo('127.0.0.1', 80)
+    assert resolver.calls == ['127.0.0.1', '127.0.0.1'] and not resolver.entries
+
+def test_unknown_ttl_uses_fallback():
+    assert ResolverCache(fallback=42, resolv_conf='/nonexistent').ttl('api.example.com') == 42
+
+def test_install_and_uninstall():
+    cache = ResolverCache(resolv_conf='/nonexistent')
+    original = socket.getaddrinfo
+    cache.install()
+    try:
+        assert socket.getaddrinfo == cache.getaddrinfo
+    finally:
+        cache.uninstall()
+    assert socket.getaddrinfo is original
+
+def test_prewarm_leaves_a_reusable_connection():
+    requests = pytest.importorskip('requests')
+    connections: list[int] = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        def setup(self):
+            connections.append(1)
+            super().setup()
+        def do_HEAD(self):
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+        def log_message(self, *args):
+            pass
+
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        session = requests.Session()
+        session.trust_env = False
+        base = f'http://127.0.0.1:{server.server_address[1]}'
+        prewarm(session, f'{base}/', timeout=3)
+        assert session.get(f'{base}/api', timeout=3).text == 'ok'
+        assert len(connections) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
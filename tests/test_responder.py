@@ -0,0 +1,58 @@
+import struct
+
+from libs.dns import AA, QR, RCODE_FORMERR, RCODE_NOERROR, RCODE_NOTIMP, RCODE_REFUSED, RD, TYPES, build_query, parse_message
+from libs.dns.responder import DNSResponder
+
+def responder(**options):
+    served = DNSResponder({'A': ['example.com', 'www.example.com'], 'AAAA': ['www.example.com']}, ttl=120, **options)
+    served.update({'Iv4': '203.0.113.7', 'Iv6': '2001:db8::7'})
+    return served
+
+def ask(served, name, qtype, **options):
+    return parse_message(served.answer(build_query(0x4242, name, TYPES.get(qtype, qtype), edns=False, **options)))
+
+def test_published_addresses_are_answered_authoritatively():
+    served = responder()
+    message = ask(served, 'WWW.Example.com', 'AAAA', recursion=True)
+    assert message.id == 0x4242 and message.flags & QR and message.flags & AA and message.flags & RD
+    assert message.rcode == RCODE_NOERROR
+    assert [(answer.name, str(answer.address), answer.ttl) for answer in message.answers] == [('www.example.com', '2001:db8::7', 120)]
+    assert str(ask(served, 'example.com', 'A').answers[0].address) == '203.0.113.7'
+
+def test_known_name_without_that_type_is_nodata():
+    served = responder()
+    # example.com is only listed for A
+    for qtype in ('AAAA', 15, 16):  # MX and TXT too
+        message = ask(served, 'example.com', qtype)
+        assert message.rcode == RCODE_NOERROR and message.answers == []
+        assert message.questions[0][0] == 'example.com'
+
+def test_names_outside_the_lists_are_refused():
+    message = ask(responder(), 'other.example.com', 'A')
+    assert message.rcode == RCODE_REFUSED and message.answers == []
+    assert ask(responder(), 'other.example.com', 15).rcode == RCODE_REFUSED
+
+def test_malformed_and_unsupported_queries():
+    served = responder()
+    query = bytearray(build_query(7, 'example.com', TYPES['A'], edns=False))
+    two_questions = bytes(query[:4]) + struct.pack('!H', 2) + bytes(query[6:])
+    assert parse_message(served.answer(two_questions)).rcode == RCODE_FORMERR
+
+    status = bytes(query[:2]) + struct.pack('!H', 2 << 11) + bytes(query[4:])
+    assert parse_message(served.answer(status)).rcode == RCODE_NOTIMP
+
+    truncated = bytes(query[:-3])
+    assert struct.unpack_from('!H', served.answer(truncated), 2)[0] & 0xF == RCODE_FORMERR
+    assert served.answer(bytes(query[:2]) + struct.pack('!H', QR) + bytes(query[4:])) is None
+    assert served.answer(b'\x00' * 5) is None
+
+def test_update_recompiles_only_on_change_and_pins_win():
+    served = responder()
+    assert served.update({'Iv4': '203.0.113.7', 'Iv6': '2001:db8::7'}) is False
+    assert served.update({'Iv4': '203.0.113.8', 'Iv6': None}) is True
+    assert str(ask(served, 'example.com', 'A').answers[0].address) == '203.0.113.8'
+    assert ask(served, 'www.example.com', 'AAAA').answers == []
+
+    served.pin({'www.example.com': '198.51.100.1'})
+    assert str(ask(served, 'www.example.com', 'A').answers[0].address) == '198.51.100.1'
+    assert str(ask(served, 'example.com', 'A').answers[0].address) == '203.0.113.8'
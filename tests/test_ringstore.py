@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+
+from libs.ringstore import RingStore
+
+def test_entries_read_back_newest_first(tmp_path):
+    store = RingStore(str(tmp_path / 'dumps.ring'))
+    for i in range(5):
+        store.write({'n': i}, moment=float(i))
+    assert [entry['n'] for _, entry in store.read()] == [4, 3, 2, 1, 0]
+    assert [moment for moment, _ in store.read(2)] == [4.0, 3.0]
+
+def test_rotation_keeps_size_bounded_and_newest_entries(tmp_path):
+    path = str(tmp_path / 'dumps.ring')
+    store = RingStore(path, capacity=2048)
+    for i in range(200):
+        store.write({'n': i, 'pad': 'x' * 40})
+    assert os.path.getsize(path) + os.path.getsize(f'{path}.1') <= 2048
+    entries = store.read()
+    assert entries[0][1]['n'] == 199
+    assert [entry['n'] for _, entry in entries] == list(range(199, 199 - len(entries), -1))
+
+def test_oversized_entry_is_dropped(tmp_path):
+    store = RingStore(str(tmp_path / 'dumps.ring'), capacity=256)
+    store.write({'pad': os.urandom(512).hex()})
+    assert store.read() == []
+
+def test_lowered_capacity_trims_existing_segments(tmp_path):
+    path = str(tmp_path / 'dumps.ring')
+    store = RingStore(path, capacity=1 << 20)
+    for i in range(100):
+        store.write({'n': i, 'pad': 'x' * 40})
+    store = RingStore(path, capacity=1024)
+    assert os.path.getsize(path) <= 512
+    assert store.read()[0][1]['n'] == 99
+
+def test_torn_tail_is_ignored(tmp_path):
+    path = str(tmp_path / 'dumps.ring')
+    store = RingStore(path)
+    store.write({'n': 1})
+    with open(path, 'ab') as f:
+        f.write(b'\x00' * 7)
+    assert [entry['n'] for _, entry in RingStore(path).read()] == [1]
+
+def test_read_returns_stale_view_after_timeout(tmp_path, monkeypatch):
+    store = RingStore(str(tmp_path / 'dumps.ring'))
+    store.write({'n': 1})
+    release = threading.Event()
+    original = store.write
+    monkeypatch.setattr(store, 'write', lambda record, moment=None: (release.wait(5), original(record, moment)))
+    store.append({'n': 2})
+    try:
+        assert [entry['n'] for _, entry in store.read(timeout=0.1)] == [1]
+    finally:
+        release.set()
+    assert [entry['n'] for _, entry in store.read(timeout=None)] == [2, 1]
+
+def test_exit_flush_gives_up_on_a_stuck_writer(tmp_path, monkeypatch):
+    store = RingStore(str(tmp_path / 'dumps.ring'))
+    stuck = threading.Event()
+    monkeypatch.setattr(store, 'write', lambda record, moment=None: stuck.wait(5))
+    monkeypatch.setattr(store, 'exit_timeout', 0.2)
+    store.append({'n': 1})
+    started = time.monotonic()
+    store.__close__()
+    assert time.monotonic() - started < 1
+    stuck.set()
+    assert store.flush(5)
@@ -0,0 +1,57 @@
+import asyncio
+import base64
+
+from libs.server import UpdateServer
+
+AUTH = 'Basic ' + base64.b64encode(b'router:secret').decode()
+
+async def push(target, authorization=AUTH, handler=None):
+    calls = []
+    async def record(hostnames, address):
+        calls.append((hostnames, address))
+        return {hostname: f'good {address}' for hostname in hostnames if hostname.endswith('example.com')}
+    server = UpdateServer(handler or record, 'router', 'secret', host='127.0.0.1', port=0)
+    listener = await server.start()
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', listener.sockets[0].getsockname()[1])
+        headers = f'Authorization: {authorization}\r\n' if authorization else ''
+        writer.write(f'GET {target} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n'.encode())
+        response = (await reader.read()).decode()
+        writer.close()
+    finally:
+        listener.close()
+    head, _, body = response.partition('\r\n\r\n')
+    return head.split(' ', 2)[1], body, calls
+
+def run(target, **options):
+    return asyncio.run(push(target, **options))
+
+def test_each_hostname_gets_its_status_line():
+    status, body, calls = run('/nic/update?hostname=A.example.com,other.net&myip=203.0.113.7')
+    assert status == '200'
+    assert body.splitlines() == ['good 203.0.113.7', 'nohost']
+    assert calls == [(['a.example.com', 'other.net'], '203.0.113.7')]
+
+def test_missing_or_wrong_credentials_are_refused():
+    for authorization in ('', 'Basic ' + base64.b64encode(b'router:wrong').decode(), 'Bearer secret'):
+        status, body, calls = run('/nic/update?hostname=a.example.com&myip=203.0.113.7', authorization=authorization)
+        assert (status, body, calls) == ('401', 'badauth', [])
+
+def test_unknown_path_is_not_found():
+    status, body, calls = run('/update?hostname=a.example.com')
+    assert (status, body, calls) == ('404', 'badagent', [])
+
+def test_missing_hostname_and_bad_address():
+    assert run('/nic/update?myip=203.0.113.7')[:2] == ('200', 'notfqdn')
+    status, body, calls = run('/v3/update?hostname=a.example.com,b.example.com&myip=not-an-ip')
+    assert body.splitlines() == ['dnserr', 'dnserr'] and calls == []
+
+def test_caller_address_is_used_without_myip():
+    _, body, calls = run('/nic/update?hostname=a.example.com')
+    assert calls == [(['a.example.com'], '127.0.0.1')] and body == 'good 127.0.0.1'
+
+def test_handler_failure_answers_911():
+    async def broken(hostnames, address):
+        raise RuntimeError('provider exploded')
+    status, body, _ = run('/nic/update?hostname=a.example.com&myip=203.0.113.7', handler=broken)
+    assert (status, body) == ('500', '911')
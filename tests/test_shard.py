@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+import zlib
+
+from libs.shard import ShardPool
+
+NAMES = ['example.com', 'www.example.com', 'api.example.org', 'home.example.net', 'a.b.example.io']
+
+def test_names_of_one_zone_share_a_worker():
+    pool = ShardPool(4, [])
+    owner = pool.shard('example.com')
+    for fqdn in ('www.example.com', 'WWW.Example.COM.', 'a.b.c.example.com', 'A:www.example.com', 'negative:AAAA:api.example.com'):
+        assert pool.shard(fqdn) == owner
+    assert owner == zlib.crc32(b'example.com') % 4
+
+def test_every_worker_index_is_in_range():
+    pool = ShardPool(3, [])
+    assert {pool.shard(f'host{i}.zone{i}.test') for i in range(200)} == {0, 1, 2}
+
+def test_assignment_is_stable_across_processes():
+    script = f'from libs.shard import ShardPool; print(*(ShardPool(7, []).shard(n) for n in {NAMES!r}))'
+    outputs = set()
+    for seed in ('1', '2', '3'):
+        result = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, check=True, timeout=60,
+            env={**os.environ, 'PYTHONHASHSEED': seed, 'PYTHONPATH': os.pathsep.join(sys.path)}
+        )
+        outputs.add(tuple(int(_) for _ in result.stdout.split()[-len(NAMES):]))
+    pool = ShardPool(7, [])
+    assert outputs == {tuple(pool.shard(n) for n in NAMES)}
@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from libs.singleflight import SingleFlight
+
+def concurrently(flight, key, fn, callers=5):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=call) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+def blocking(flight, outcome, calls, waiters=4):
+    def fn():
+        calls.append(1)
+        # Hold the request until every other caller has joined it
+        while flight.shared < waiters:
+            threading.Event().wait(0.01)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return fn
+
+def test_concurrent_callers_share_one_request():
+    flight, calls = SingleFlight(freshness=0), []
+    fn = blocking(flight, {'id': 1}, calls)
+    results, errors = concurrently(flight, 'zones', fn)
+    assert calls == [1]
+    assert results == [{'id': 1}] * 5 and not errors
+    assert flight.shared == 4
+
+def test_error_reaches_every_waiter_and_is_not_kept():
+    flight, calls = SingleFlight(freshness=60), []
+    fn = blocking(flight, ConnectionError('down'), calls)
+    results, errors = concurrently(flight, 'zones', fn)
+    assert calls == [1] and not results
+    assert len(errors) == 5 and all(isinstance(_, ConnectionError) for _ in errors)
+    assert flight.do('zones', lambda: 'recovered') == 'recovered'
+
+def test_fresh_result_is_reused_then_expires(monkeypatch):
+    flight, now = SingleFlight(freshness=5), [100.0]
+    monkeypatch.setattr('libs.singleflight.time.monotonic', lambda: now[0])
+    assert flight.do('zones', lambda: 1) == 1
+    assert flight.do('zones', lambda: 2) == 1
+    now[0] += 6
+    assert flight.do('zones', lambda: 3) == 3
+
+def test_without_freshness_only_in_flight_calls_are_shared():
+    flight = SingleFlight(freshness=0)
+    assert flight.do('zones', lambda: 1) == 1
+    assert flight.do('zones', lambda: 2) == 2
+    assert not flight.calls
+
+def test_forget_drops_matching_results_only():
+    flight = SingleFlight(freshness=60)
+    flight.do(('zones', 'a'), lambda: 1)
+    flight.do(('records', 'a'), lambda: 2)
+    flight.forget(lambda key: key[0] == 'records')
+    assert flight.do(('zones', 'a'), lambda: 3) == 1
+    assert flight.do(('records', 'a'), lambda: 4) == 4
+
+def test_leader_error_is_raised_to_the_leader():
+    with pytest.raises(ValueError):
+        SingleFlight().do('zones', lambda: (_ for _ in ()).throw(ValueError('bad')))
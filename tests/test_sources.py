@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip('requests')
+
+from libs.sources import AddressSource, classify
+
+def test_single_ipv6_answer_fills_iv6():
+    assert classify(['2001:db8::1']) == {'Iv4': None, 'Iv6': '2001:db8::1'}
+
+def test_single_ipv4_answer_fills_iv4():
+    assert classify(['203.0.113.7']) == {'Iv4': '203.0.113.7', 'Iv6': None}
+
+def test_pair_is_classified_whatever_the_order():
+    assert classify(['2001:db8::1', '203.0.113.7']) == {'Iv4': '203.0.113.7', 'Iv6': '2001:db8::1'}
+
+def test_empty_entries_are_ignored():
+    assert classify(['', '2001:db8::1']) == {'Iv4': None, 'Iv6': '2001:db8::1'}
+
+class _Response:
+    ok = True
+    status_code = 200
+    reason = 'OK'
+    def __init__(self, text: str) -> None:
+        self.text = text
+    def raise_for_status(self) -> None:
+        pass
+
+@pytest.mark.parametrize('query_api', ['ipify', 'icanhazip'])
+def test_source_with_plain_ipv6_answer(monkeypatch, query_api):
+    source = AddressSource('v6', query_api)
+    monkeypatch.setattr(source.session, 'get', lambda url, timeout: _Response('2001:db8::1\n'))
+    assert source.detect() == {'Iv4': None, 'Iv6': '2001:db8::1'}
@@ -0,0 +1,113 @@
+import asyncio
+import socket
+import struct
+import threading
+from typing import Callable, Optional
+
+import pytest
+
+from libs.dns import AA, QR, RCODE_NOERROR, RCODE_REFUSED, TYPES, decode_name
+from libs.dns.verifier import AuthoritativeVerifier
+
+Answer = Callable[[str, int], Optional[tuple[int, int, Optional[str], bytes]]]
+
+def respond(flags: int, rcode: int = RCODE_NOERROR, qname: Optional[str] = None, rdata: bytes = bytes((203, 0, 113, 7))) -> Answer:
+    """Stub behaviour: answer every A question with `rdata`, the given header bits and, optionally, a different question."""
+    return lambda name, qtype: (flags, rcode, qname, rdata)
+
+class StubServer:
+    """A UDP nameserver on a loopback address, answering from `answer(name, qtype)` (None to stay silent)."""
+
+    def __init__(self, host: str, port: int, answer: Answer) -> None:
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.port = self.sock.getsockname()[1]
+        self.answer = answer
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self) -> None:
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(4096)
+            except OSError:
+                return
+            qid = struct.unpack_from('!H', data)[0]
+            name, offset = decode_name(data, 12)
+            qtype = struct.unpack_from('!H', data, offset)[0]
+            reply = self.answer(name, qtype)
+            if reply is None:
+                continue
+            flags, rcode, qname, rdata = reply
+            question = data[12:offset + 4]
+            if qname is not None:
+                question = b''.join(bytes((len(label),)) + label.encode() for label in qname.split('.')) + b'\x00' + data[offset:offset + 4]
+            record = b'\xc0\x0c' + struct.pack('!HHIH', TYPES['A'], 1, 300, len(rdata)) + rdata
+            header = struct.pack('!HHHHHH', qid, QR | flags | rcode, 1, 1 if rcode == RCODE_NOERROR else 0, 0, 0)
+            self.sock.sendto(header + question + (record if rcode == RCODE_NOERROR else b''), addr)
+
+    def close(self) -> None:
+        self.sock.close()
+
+@pytest.fixture
+def servers():
+    started: list[StubServer] = []
+    def start(*answers: Answer) -> int:
+        # Every stub shares one port on its own loopback address, as the verifier uses a single port.
+        port = 0
+        for i, answer in enumerate(answers):
+            server = StubServer(f'127.0.0.{i + 1}', port, answer)
+            port = server.port
+            started.append(server)
+        return port
+    yield start
+    for server in started:
+        server.close()
+
+def verify(port: int, nameservers: list[str], content: str = '203.0.113.7', timeout: float = 1.0) -> bool:
+    verifier = AuthoritativeVerifier(timeout=timeout, port=port)
+    return asyncio.run(verifier.verify('host.example.com', 'A', content, nameservers))
+
+def test_authoritative_matching_answer_verifies(servers):
+    port = servers(respond(AA))
+    assert verify(port, ['127.0.0.1']) is True
+
+def test_authoritative_different_address_does_not_verify(servers):
+    port = servers(respond(AA))
+    assert verify(port, ['127.0.0.1'], content='198.51.100.1') is False
+
+def test_answer_without_aa_is_ignored(servers):
+    port = servers(respond(0))
+    assert verify(port, ['127.0.0.1']) is False
+
+def test_refused_is_ignored(servers):
+    port = servers(respond(AA, RCODE_REFUSED))
+    assert verify(port, ['127.0.0.1']) is False
+
+def test_mismatched_question_is_ignored(servers):
+    port = servers(respond(AA, qname='other.example.com'))
+    assert verify(port, ['127.0.0.1']) is False
+
+def test_unusable_first_answer_waits_for_other_server(servers):
+    # The first server refuses at once; the second answers authoritatively a little later.
+    def late(name: str, qtype: int):
+        threading.Event().wait(0.1)
+        return AA, RCODE_NOERROR, None, bytes((203, 0, 113, 7))
+    port = servers(respond(AA, RCODE_REFUSED), late)
+    assert verify(port, ['127.0.0.1', '127.0.0.2']) is True
+
+def test_all_servers_unusable_returns_before_timeout(servers):
+    port = servers(respond(0), respond(AA, RCODE_REFUSED))
+    loop = asyncio.new_event_loop()
+    try:
+        verifier = AuthoritativeVerifier(timeout=5.0, port=port)
+        started = loop.time()
+        result = loop.run_until_complete(verifier.verify('host.example.com', 'A', '203.0.113.7', ['127.0.0.1', '127.0.0.2']))
+        assert result is False
+        assert loop.time() - started < 2.0
+    finally:
+        loop.close()
+
+def test_silent_server_times_out(servers):
+    port = servers(lambda name, qtype: None)
+    assert verify(port, ['127.0.0.1'], timeout=0.2) is False
@@ -0,0 +1,27 @@
+import pickle
+
+from libs import warmstate
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'state' / 'warm_state')
+    state = {'applied': {'CloudFlare': {'Iv4': '203.0.113.7', 'Iv6': None}}, 'adaptive': {'current': 900.0}}
+    warmstate.save(state, path)
+    assert warmstate.load(path) == state
+    assert not (tmp_path / 'state' / 'warm_state.tmp').exists()
+
+def test_missing_snapshot_starts_cold(tmp_path):
+    assert warmstate.load(str(tmp_path / 'warm_state')) == {}
+
+def test_unreadable_snapshot_starts_cold(tmp_path):
+    path = tmp_path / 'warm_state'
+    path.write_bytes(b'not a pickle')
+    assert warmstate.load(str(path)) == {}
+    path.write_bytes(pickle.dumps((warmstate.WARM_STATE_VERSION, 0.0)))
+    assert warmstate.load(str(path)) == {}
+
+def test_snapshot_of_another_version_is_ignored(tmp_path):
+    path = tmp_path / 'warm_state'
+    path.write_bytes(pickle.dumps((warmstate.WARM_STATE_VERSION + 1, 0.0, {'applied': {}})))
+    assert warmstate.load(str(path)) == {}
+    path.write_bytes(pickle.dumps((warmstate.WARM_STATE_VERSION, 0.0, ['applied'])))
+    assert warmstate.load(str(path)) == {}